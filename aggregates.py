@@ -0,0 +1,278 @@
+# aggregates.py - Сифат назорати учун материаллашган агрегат жадваллар
+# Ҳар бир сақланган скрининг билан бир транзакцияда янгиланади (ой, ҳафта бўйича
+# ҳисоблагичлар ва MoM квантил скетчлари), шунинг учун дашборд тарих ҳажмидан
+# қатъи назар чекланган миқдордаги қаторларни ўқийди
+#
+# Квантил скетчи: лог-масштабли бакетлар (нисбий хатолик SKETCH_ACCURACY),
+# бирлаштириладиган - ой/ҳафта скетчлари оддий қўшиш билан йиғилади. Хом аналит
+# қийматлари ҳам (аналит, гестация куни) бўйича скетчга йиғилади - улардан
+# лабораториянинг ўз медианалари олинади (lab_medians.py)
+
+import json
+import math
+from collections import Counter
+
+from reference_tables import DAYS_PER_WEEK
+from scoring import RISK_CATEGORY_BOUNDS, SYNDROMES, get_risk_category
+
+# Агрегат жадваллар тузилиши ўзгарса оширилади - эски базаларда бир марта қайта қурилади
+AGGREGATES_VERSION = 2
+AGGREGATE_TABLES = ('agg_risk_categories', 'agg_mom', 'agg_mom_sketch', 'agg_raw_sketch')
+
+# Скрининг тури бўйича аналитлар (MoM параметр номлари)
+ANALYTES = {
+    'first': ('nt', 'papp_a', 'free_beta_hcg'),
+    'second': ('afp', 'total_hcg', 'ue3'),
+}
+
+# Хавф категориялари: юқоридан пастга (RISK_CATEGORY_BOUNDS тартиби)
+RISK_CATEGORIES = tuple(RISK_CATEGORY_BOUNDS)
+
+# Генетик машварат тавсия қилинадиган чегара (app.py тавсиялари: хавф > 1:100)
+DEFAULT_POSITIVE_CATEGORY = "ЎРТАЧА-ЮҚОРИ"
+
+SKETCH_ACCURACY = 0.01
+_SKETCH_GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+_SKETCH_LOG_GAMMA = math.log(_SKETCH_GAMMA)
+SKETCH_MIN_VALUE = 1e-3
+
+SCHEMA = """
+-- Синдромлар хавф категориялари ҳисоблагичлари (скрин-позитив улуши учун)
+CREATE TABLE IF NOT EXISTS agg_risk_categories (
+    month TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    screening_type TEXT NOT NULL,
+    syndrome TEXT NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, week, screening_type, syndrome, category)
+) WITHOUT ROWID;
+
+-- Аналитлар бўйича log(MoM) йиғиндилари (геометрик ўрта ва SD учун)
+CREATE TABLE IF NOT EXISTS agg_mom (
+    month TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    analyte TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    sum_log REAL NOT NULL DEFAULT 0,
+    sum_log_sq REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, week, analyte)
+) WITHOUT ROWID;
+
+-- MoM квантил скетчи: лог-масштабли бакетлар ҳисоблагичлари (медиана MoM учун)
+CREATE TABLE IF NOT EXISTS agg_mom_sketch (
+    month TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    analyte TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, week, analyte, bucket)
+) WITHOUT ROWID;
+
+-- Хом аналит қийматлари скетчи гестация куни бўйича (лаборатория медианалари учун)
+CREATE TABLE IF NOT EXISTS agg_raw_sketch (
+    month TEXT NOT NULL,
+    screening_type TEXT NOT NULL,
+    analyte TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, screening_type, analyte, day, bucket)
+) WITHOUT ROWID;
+"""
+
+# ==================== КВАНТИЛ СКЕТЧИ ====================
+
+def sketch_bucket(value):
+    """Қиймат учун лог-масштабли бакет рақами"""
+    return math.ceil(math.log(max(value, SKETCH_MIN_VALUE)) / _SKETCH_LOG_GAMMA)
+
+def sketch_value(bucket):
+    """Бакетнинг вакил қиймати (бакет чегараларидан нисбий хатолик <= SKETCH_ACCURACY)"""
+    return 2 * _SKETCH_GAMMA ** bucket / (_SKETCH_GAMMA + 1)
+
+def sketch_quantile(buckets, q):
+    """Бакет ҳисоблагичларидан квантил: buckets - {бакет: сон} ёки (бакет, сон) жуфтликлари"""
+    items = sorted(buckets.items() if isinstance(buckets, dict) else buckets)
+    total = sum(count for _, count in items)
+    if total == 0:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for bucket, count in items:
+        seen += count
+        if seen > rank:
+            return sketch_value(bucket)
+    return sketch_value(items[-1][0])
+
+# ==================== ЯНГИЛАШ ====================
+
+def _month(record):
+    return record['timestamp'][:7]
+
+def _week(value):
+    return int(math.floor(float(value))) if value is not None else -1
+
+def _day(value):
+    return int(round(float(value) * DAYS_PER_WEEK)) if value is not None else None
+
+def _record_raw_values(record):
+    """Ёзувнинг ўз скрининг туридаги хом аналит қийматлари: (аналит, кун, қиймат)
+
+    Интеграл ёзувдаги биринчи скрининг қийматлари олинмайди - улар биринчи
+    скрининг ёзувида аллақачон ҳисобга олинган.
+    """
+    day = _day(record.get('gestational_age'))
+    if day is None:
+        return
+    parameters = record.get('parameters', {})
+    for analyte in ANALYTES[record['screening_type']]:
+        value = parameters.get(analyte)
+        if value is not None and float(value) > 0:
+            yield analyte, day, float(value)
+
+def _record_moms(record):
+    """Ёзувдаги (аналит, ҳафта, MoM) учликлари
+
+    Базадаги биринчи скринингга боғланган ёзувда (first_seq) биринчи скрининг
+    MoM'лари олинмайди - улар шу скрининг ёзувида аллақачон ҳисобга олинган.
+    """
+    parameters = record.get('parameters', {})
+    week = _week(record.get('gestational_age'))
+    first_week = week if record['screening_type'] == 'first' else _week(parameters.get('first_gestational_age'))
+    analytes = ANALYTES['second'] if record.get('first_seq') is not None else ANALYTES['first'] + ANALYTES['second']
+    for analyte in analytes:
+        mom = parameters.get(f'{analyte}_mom')
+        if mom is None or not mom > 0:
+            continue
+        yield analyte, first_week if analyte in ANALYTES['first'] else week, float(mom)
+
+def update(conn, records):
+    """Ёзувларни агрегатларга қўшиш (чақирувчи транзакцияси ичида)"""
+    categories = Counter()
+    moms = {}
+    sketch = Counter()
+    raw_sketch = Counter()
+    for record in records:
+        month, week = _month(record), _week(record.get('gestational_age'))
+        risks = record.get('risks', {})
+        for syndrome in SYNDROMES:
+            if syndrome in risks:
+                category = get_risk_category(risks[syndrome])[0]
+                categories[(month, week, record['screening_type'], syndrome, category)] += 1
+        for analyte, analyte_week, mom in _record_moms(record):
+            key = (month, analyte_week, analyte)
+            log_mom = math.log(mom)
+            count, sum_log, sum_log_sq = moms.get(key, (0, 0.0, 0.0))
+            moms[key] = (count + 1, sum_log + log_mom, sum_log_sq + log_mom * log_mom)
+            sketch[key + (sketch_bucket(mom),)] += 1
+        for analyte, day, value in _record_raw_values(record):
+            raw_sketch[(month, record['screening_type'], analyte, day, sketch_bucket(value))] += 1
+
+    conn.executemany(
+        "INSERT INTO agg_risk_categories (month, week, screening_type, syndrome, category, count) "
+        "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (month, week, screening_type, syndrome, category) "
+        "DO UPDATE SET count = count + excluded.count",
+        [key + (count,) for key, count in categories.items()]
+    )
+    conn.executemany(
+        "INSERT INTO agg_mom (month, week, analyte, count, sum_log, sum_log_sq) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (month, week, analyte) DO UPDATE SET count = count + excluded.count, "
+        "sum_log = sum_log + excluded.sum_log, sum_log_sq = sum_log_sq + excluded.sum_log_sq",
+        [key + values for key, values in moms.items()]
+    )
+    conn.executemany(
+        "INSERT INTO agg_mom_sketch (month, week, analyte, bucket, count) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (month, week, analyte, bucket) DO UPDATE SET count = count + excluded.count",
+        [key + (count,) for key, count in sketch.items()]
+    )
+    conn.executemany(
+        "INSERT INTO agg_raw_sketch (month, screening_type, analyte, day, bucket, count) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (month, screening_type, analyte, day, bucket) DO UPDATE SET count = count + excluded.count",
+        [key + (count,) for key, count in raw_sketch.items()]
+    )
+
+def rebuild(conn, chunk_size=5000):
+    """Агрегатларни барча скрининглардан қайтадан қуриш (эски базалар учун бир марта)"""
+    with conn:
+        for table in AGGREGATE_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        after_seq = 0
+        while True:
+            rows = conn.execute(
+                "SELECT seq, record FROM screenings WHERE seq > ? ORDER BY seq LIMIT ?", (after_seq, chunk_size)
+            ).fetchall()
+            if not rows:
+                break
+            update(conn, [json.loads(record) for _, record in rows])
+            after_seq = rows[-1][0]
+
+# ==================== ЎҚИШ ====================
+
+GROUP_BY = ('month', 'week')
+
+def _filters(month_from=None, month_to=None, screening_type=None):
+    conditions, params = [], []
+    if month_from:
+        conditions.append("month >= ?")
+        params.append(month_from)
+    if month_to:
+        conditions.append("month <= ?")
+        params.append(month_to)
+    if screening_type:
+        conditions.append("screening_type = ?")
+        params.append(screening_type)
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+
+def list_months(conn):
+    """Агрегатларда мавжуд ойлар (ЙЙЙЙ-ОО)"""
+    return [row[0] for row in conn.execute("SELECT DISTINCT month FROM agg_risk_categories ORDER BY month")]
+
+def screen_positive_rates(conn, by='month', positive_category=DEFAULT_POSITIVE_CATEGORY,
+                          month_from=None, month_to=None, screening_type=None):
+    """Синдромлар бўйича скрин-позитив улуши: [{by, syndrome, total, positive, rate}]
+
+    by - 'month' ёки 'week'; positive_category ва ундан юқори категориялар позитив.
+    """
+    if by not in GROUP_BY:
+        raise ValueError(f"by: {by}")
+    positive = RISK_CATEGORIES[:RISK_CATEGORIES.index(positive_category) + 1]
+    where, params = _filters(month_from, month_to, screening_type)
+    rows = conn.execute(
+        f"SELECT {by}, syndrome, SUM(count), "
+        f"SUM(CASE WHEN category IN ({', '.join('?' * len(positive))}) THEN count ELSE 0 END) "
+        f"FROM agg_risk_categories {where} GROUP BY {by}, syndrome ORDER BY {by}, syndrome",
+        list(positive) + params
+    )
+    return [{by: key, 'syndrome': syndrome, 'total': total, 'positive': hits, 'rate': hits / total if total else 0.0}
+            for key, syndrome, total, hits in rows]
+
+def mom_medians(conn, by='month', month_from=None, month_to=None):
+    """Аналитлар бўйича медиана ва геометрик ўрта MoM: [{by, analyte, count, median, geo_mean, log_sd}]"""
+    if by not in GROUP_BY:
+        raise ValueError(f"by: {by}")
+    where, params = _filters(month_from, month_to)
+    sketches = {}
+    for key, analyte, bucket, count in conn.execute(
+        f"SELECT {by}, analyte, bucket, SUM(count) FROM agg_mom_sketch {where} GROUP BY {by}, analyte, bucket",
+        params
+    ):
+        sketches.setdefault((key, analyte), {})[bucket] = count
+
+    result = []
+    for key, analyte, count, sum_log, sum_log_sq in conn.execute(
+        f"SELECT {by}, analyte, SUM(count), SUM(sum_log), SUM(sum_log_sq) FROM agg_mom {where} "
+        f"GROUP BY {by}, analyte ORDER BY {by}, analyte",
+        params
+    ):
+        mean_log = sum_log / count
+        variance = max(sum_log_sq / count - mean_log * mean_log, 0.0)
+        result.append({
+            by: key,
+            'analyte': analyte,
+            'count': count,
+            'median': sketch_quantile(sketches.get((key, analyte), {}), 0.5),
+            'geo_mean': math.exp(mean_log),
+            'log_sd': math.sqrt(variance),
+        })
+    return result
@@ -0,0 +1,426 @@
+# api.py - LIS ва анализатор middleware учун HTTP скоринг сервиси (браузерсиз)
+# Бир вақтда келган битта намунали сўровлар микро-батчга йиғилиб, битта векторли
+# ҳисобда баҳоланади; натижалар битта ёзувчи уланиш орқали гуруҳлаб сақланади
+#
+#   POST /score        - битта намуна
+#   POST /score/batch  - намуналар рўйхати ({"samples": [...]} ёки [...])
+#   GET  /metrics      - кечикиш гистограммалари (Prometheus матн формати)
+#   GET  /health
+#
+# Фойдаланиш:
+#   pip install -r requirements-api.txt
+#   uvicorn api:app --host 0.0.0.0 --port 8000
+#
+# Созламалар (муҳит ўзгарувчилари): SCREENING_DB, BATCH_MAX_SIZE, BATCH_WINDOW_MS
+# Хавф модели намунада танланади: "engine": "rules" (асли) ёки "lr"
+
+import asyncio
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+import ids
+import median_sets
+import patient_db
+from reference_tables import median_set_label
+from scoring import (
+    DEFAULT_RISK_ENGINE,
+    RISK_ENGINES,
+    SYNDROMES,
+    calculate_bmi,
+    calculate_mom_delfia_batch,
+    get_risk_category,
+    get_risk_engine,
+)
+
+DB_PATH = os.environ.get('SCREENING_DB', patient_db.DEFAULT_DB_PATH)
+
+# Микро-батч: биринчи сўровдан кейин шунча кутилади ёки батч тўлгунча йиғилади
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', '256'))
+BATCH_WINDOW = float(os.environ.get('BATCH_WINDOW_MS', '2')) / 1000
+
+# Битта транзакцияда сақланадиган энг кўп ёзувлар
+WRITE_MAX_BATCH = 500
+
+# /score/batch сўровидаги энг кўп намуналар
+MAX_REQUEST_SAMPLES = 10_000
+
+# Скрининг тури бўйича аналитлар: (майдон номи, DELFIA параметри)
+ANALYTES = {
+    'first': (('nt', 'NT'), ('papp_a', 'PAPP_A'), ('free_beta_hcg', 'FREE_BETA_HCG')),
+    'second': (('afp', 'AFP'), ('total_hcg', 'TOTAL_HCG'), ('ue3', 'UE3')),
+}
+OPTIONAL_FIELDS = ('weight', 'height', 'first_gestational_age')
+
+# ==================== НАМУНАНИ ТЕКШИРИШ ====================
+
+def _number(data, field):
+    try:
+        value = float(data[field])
+    except (TypeError, ValueError):
+        raise ValueError(f"'{field}' сон бўлиши керак")
+    if not math.isfinite(value):
+        raise ValueError(f"'{field}' чекли сон бўлиши керак")
+    return value
+
+def _text(data, field, default=None):
+    value = data.get(field, default)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"'{field}' матн бўлиши керак")
+    return value
+
+def parse_sample(data):
+    """JSON намунани текшириш ва бир хил кўринишга келтириш (хатода ValueError)
+
+    Иккиламчи скринингда биринчи скрининг аналитлари ва first_gestational_age
+    ихтиёрий - берилса интеграл ҳисоб қилинади. 'id' берилмаса янги ID ажратилади (ids.py).
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Намуна JSON объект бўлиши керак")
+    screening_type = _text(data, 'screening_type', 'first')
+    if screening_type not in ANALYTES:
+        raise ValueError("'screening_type' first ёки second бўлиши керак")
+
+    required = ('age', 'gestational_age') + tuple(field for field, _ in ANALYTES[screening_type])
+    missing = [field for field in required if data.get(field) is None]
+    if missing:
+        raise ValueError(f"Майдонлар етишмайди: {', '.join(missing)}")
+
+    median_set_name = _text(data, 'median_set')
+    try:
+        median_set = median_sets.find_median_set(median_set_name) if median_set_name \
+            else median_sets.get_active_median_set()
+    except KeyError:
+        raise ValueError(f"Медиана тўплами топилмади: {median_set_name}")
+    engine = _text(data, 'engine', DEFAULT_RISK_ENGINE)
+    if engine not in RISK_ENGINES:
+        raise ValueError(f"'engine' {' ёки '.join(RISK_ENGINES)} бўлиши керак")
+    save = data.get('save', True)
+    if not isinstance(save, bool):
+        raise ValueError("'save' true ёки false бўлиши керак")
+
+    sample = {
+        'id': str(data['id']) if data.get('id') not in (None, '') else ids.new_id(),
+        'name': _text(data, 'name'),
+        'screening_type': screening_type,
+        'median_set': median_set,
+        'engine': engine,
+        'save': save,
+    }
+    numeric = required + OPTIONAL_FIELDS
+    if screening_type == 'second':
+        numeric += tuple(field for field, _ in ANALYTES['first'])
+    for field in numeric:
+        if data.get(field) is not None:
+            sample[field] = _number(data, field)
+    return sample
+
+# ==================== ВЕКТОРЛИ ҲИСОБ ====================
+
+def _column(samples, field):
+    return np.array([sample.get(field, np.nan) for sample in samples], dtype=float)
+
+def _score_group(samples, screening_type, median_set, engine):
+    """Бир хил скрининг тури, медиана тўплами ва хавф моделидаги намуналар учун MoM ва хавфлар"""
+    score = get_risk_engine(engine)[0]
+    weight = _column(samples, 'weight')
+    moms = {
+        field: calculate_mom_delfia_batch(
+            _column(samples, field), parameter, _column(samples, 'gestational_age'), weight,
+            screening_type, median_set
+        )
+        for field, parameter in ANALYTES[screening_type]
+    }
+
+    if screening_type == 'first':
+        risks = score(_column(samples, 'age'), moms['nt'], moms['papp_a'], moms['free_beta_hcg'])
+    else:
+        # Биринчи скрининг маълумоти йўқ намуналарда NaN - UI'даги каби "маълумот йўқ"
+        first_week = _column(samples, 'first_gestational_age')
+        for field, parameter in ANALYTES['first']:
+            mom = calculate_mom_delfia_batch(_column(samples, field), parameter, first_week, weight,
+                                             'first', median_set)
+            mom[np.isnan(first_week)] = np.nan
+            moms[field] = mom
+        risks = score(
+            _column(samples, 'age'), moms['nt'], moms['papp_a'], moms['free_beta_hcg'],
+            moms['afp'], moms['total_hcg'], moms['ue3']
+        )
+    return moms, risks
+
+def _result(sample, i, moms, risks, timestamp):
+    """Битта намуна натижаси ва базага ёзиладиган ёзув (app.py ёзуви билан бир хил)"""
+    sample_risks = {syndrome: float(risks[syndrome][i]) for syndrome in SYNDROMES}
+    sample_risks['age_risk'] = {syndrome: float(values[i]) for syndrome, values in risks['age_risk'].items()}
+
+    parameters = {}
+    for field, values in moms.items():
+        if not np.isnan(values[i]):
+            parameters[field] = sample[field]
+            parameters[f'{field}_mom'] = float(values[i])
+    if sample['screening_type'] == 'second' and 'nt_mom' in parameters:
+        parameters['first_gestational_age'] = sample['first_gestational_age']
+
+    record = {
+        'id': sample['id'],
+        'name': sample['name'],
+        'age': sample['age'],
+        'screening_type': sample['screening_type'],
+        'gestational_age': sample['gestational_age'],
+        'bmi': calculate_bmi(sample['weight'], sample['height']) if 'weight' in sample and 'height' in sample
+        else None,
+        'parameters': parameters,
+        'risks': sample_risks,
+        'median_set': median_set_label(sample['median_set']),
+        'risk_model': get_risk_engine(sample['engine'])[1],
+        'timestamp': timestamp,
+    }
+    for field in ('weight', 'height'):
+        if field in sample:
+            record[field] = sample[field]
+
+    max_risk = patient_db.max_risk(sample_risks)
+    return {
+        'id': sample['id'],
+        'screening_type': sample['screening_type'],
+        'median_set': record['median_set'],
+        'risk_model': record['risk_model'],
+        'moms': {field: value for field, value in parameters.items() if field.endswith('_mom')},
+        'risks': sample_risks,
+        'max_risk': max_risk,
+        'risk_category': get_risk_category(max_risk)[0],
+        'record': record,
+    }
+
+def score_samples(samples):
+    """Намуналар рўйхатини (скрининг тури, медиана тўплами, хавф модели) гуруҳлари бўйича векторли баҳолаш"""
+    timestamp = datetime.now().isoformat()
+    groups = {}
+    for i, sample in enumerate(samples):
+        key = (sample['screening_type'], median_set_label(sample['median_set']), sample['engine'])
+        groups.setdefault(key, []).append(i)
+
+    results = [None] * len(samples)
+    for (screening_type, _, engine), indices in groups.items():
+        group = [samples[i] for i in indices]
+        moms, risks = _score_group(group, screening_type, group[0]['median_set'], engine)
+        for j, i in enumerate(indices):
+            results[i] = _result(samples[i], j, moms, risks, timestamp)
+    return results
+
+# ==================== КЕЧИКИШ ГИСТОГРАММАЛАРИ ====================
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_latency = {}   # endpoint -> {'buckets': [...], 'count': n, 'sum': сония}
+_counters = {'microbatches': 0, 'microbatch_samples': 0}
+
+def observe_latency(endpoint, seconds):
+    """Гистограммага битта ўлчовни қўшиш"""
+    histogram = _latency.setdefault(endpoint, {'buckets': [0] * len(LATENCY_BUCKETS), 'count': 0, 'sum': 0.0})
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            histogram['buckets'][i] += 1
+    histogram['count'] += 1
+    histogram['sum'] += seconds
+
+def metrics_text():
+    """Гистограммалар Prometheus матн форматида"""
+    lines = [
+        "# HELP screening_api_latency_seconds Request latency by endpoint",
+        "# TYPE screening_api_latency_seconds histogram",
+    ]
+    for endpoint, histogram in sorted(_latency.items()):
+        for bound, count in zip(LATENCY_BUCKETS, histogram['buckets']):
+            lines.append(f'screening_api_latency_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+        lines.append(f'screening_api_latency_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {histogram["count"]}')
+        lines.append(f'screening_api_latency_seconds_count{{endpoint="{endpoint}"}} {histogram["count"]}')
+        lines.append(f'screening_api_latency_seconds_sum{{endpoint="{endpoint}"}} {histogram["sum"]:.6f}')
+    for name, value in _counters.items():
+        lines.append(f"# TYPE screening_api_{name}_total counter")
+        lines.append(f"screening_api_{name}_total {value}")
+    return "\n".join(lines) + "\n"
+
+def timed(endpoint):
+    """Handler кечикишини гистограммага ёзувчи декоратор"""
+    def decorator(handler):
+        async def wrapper(request):
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                observe_latency(endpoint, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+# ==================== МИКРО-БАТЧ ВА ЁЗУВЧИ ====================
+
+_state = {}   # lifespan давомида: навбатлар, фон вазифалари, ёзувчи оқим
+
+async def _batch_worker(queue):
+    """Навбатдаги битта намунали сўровларни йиғиб, битта векторли ҳисобда баҳолаш"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        if BATCH_WINDOW > 0:
+            await asyncio.sleep(BATCH_WINDOW)
+        while len(batch) < BATCH_MAX_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+
+        try:
+            results = await loop.run_in_executor(None, score_samples, [sample for sample, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            _counters['microbatches'] += 1
+            _counters['microbatch_samples'] += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        for _ in batch:
+            queue.task_done()
+
+async def _db_writer(queue, executor, conn):
+    """Сақлаш навбатидаги ёзувларни гуруҳлаб, битта транзакцияда ёзиш"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < WRITE_MAX_BATCH and not queue.empty():
+            batch.append(queue.get_nowait())
+
+        try:
+            seqs = await loop.run_in_executor(
+                executor, patient_db.save_screenings, conn, [record for record, _ in batch]
+            )
+        except Exception:
+            # Гуруҳ транзакцияси бекор бўлди - ёзувлар биттадан қайта ёзилади,
+            # шунда фақат хато ёзувли сўров хато олади
+            for record, future in batch:
+                try:
+                    seq = await loop.run_in_executor(executor, patient_db.save_screening, conn, record)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(seq)
+        else:
+            for (_, future), seq in zip(batch, seqs):
+                if not future.done():
+                    future.set_result(seq)
+        for _ in batch:
+            queue.task_done()
+
+async def _save(records):
+    """Ёзувларни ёзувчи навбатига қўйиб, сақланишини кутиш (қатор рақамлари)"""
+    loop = asyncio.get_running_loop()
+    futures = []
+    for record in records:
+        future = loop.create_future()
+        await _state['write_queue'].put((record, future))
+        futures.append(future)
+    return await asyncio.gather(*futures)
+
+@asynccontextmanager
+async def lifespan(app):
+    loop = asyncio.get_running_loop()
+    # SQLite'да бир вақтда битта ёзувчи: уланиш ўз оқимида очилади ва фақат шу оқимда ишлатилади
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='screening-db')
+    conn = await loop.run_in_executor(executor, patient_db.connect, DB_PATH)
+
+    _state['score_queue'] = asyncio.Queue()
+    _state['write_queue'] = asyncio.Queue()
+    tasks = [
+        asyncio.create_task(_batch_worker(_state['score_queue'])),
+        asyncio.create_task(_db_writer(_state['write_queue'], executor, conn)),
+    ]
+    try:
+        yield
+    finally:
+        await _state['score_queue'].join()
+        await _state['write_queue'].join()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await loop.run_in_executor(executor, conn.close)
+        executor.shutdown()
+        _state.clear()
+
+# ==================== ENDPOINT'ЛАР ====================
+
+def _error(message, status_code=422):
+    return JSONResponse({'error': message}, status_code=status_code)
+
+def _response(result, seq=None):
+    response = {key: value for key, value in result.items() if key != 'record'}
+    if seq is not None:
+        response['seq'] = seq
+    return response
+
+@timed('score')
+async def score(request):
+    try:
+        sample = parse_sample(await request.json())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return _error("Сўров танаси JSON эмас", 400)
+    except ValueError as e:
+        return _error(str(e))
+
+    future = asyncio.get_running_loop().create_future()
+    await _state['score_queue'].put((sample, future))
+    result = await future
+
+    seq = (await _save([result['record']]))[0] if sample['save'] else None
+    return JSONResponse(_response(result, seq))
+
+@timed('score_batch')
+async def score_batch(request):
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return _error("Сўров танаси JSON эмас", 400)
+    items = body.get('samples') if isinstance(body, dict) else body
+    if not isinstance(items, list) or not items:
+        return _error("'samples' бўш бўлмаган рўйхат бўлиши керак")
+    if len(items) > MAX_REQUEST_SAMPLES:
+        return _error(f"Битта сўровда кўпи билан {MAX_REQUEST_SAMPLES} намуна", 413)
+
+    samples = []
+    for i, item in enumerate(items):
+        try:
+            samples.append(parse_sample(item))
+        except ValueError as e:
+            return _error(f"samples[{i}]: {e}")
+
+    results = await asyncio.get_running_loop().run_in_executor(None, score_samples, samples)
+
+    to_save = [i for i, sample in enumerate(samples) if sample['save']]
+    seqs = dict(zip(to_save, await _save([results[i]['record'] for i in to_save])))
+    return JSONResponse({'results': [_response(result, seqs.get(i)) for i, result in enumerate(results)]})
+
+async def metrics(request):
+    return PlainTextResponse(metrics_text())
+
+async def health(request):
+    return JSONResponse({'status': 'ok', 'median_set': median_set_label(median_sets.get_active_median_set())})
+
+app = Starlette(
+    routes=[
+        Route('/score', score, methods=['POST']),
+        Route('/score/batch', score_batch, methods=['POST']),
+        Route('/metrics', metrics),
+        Route('/health', health),
+    ],
+    lifespan=lifespan,
+)
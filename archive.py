@@ -0,0 +1,338 @@
+# archive.py - Тарихий скринингларнинг устунли архиви (Arrow IPC)
+# Ҳар бир ой алоҳида файл: ARCHIVE_DIR/screenings_ЙЙЙЙ-ОО.arrow. Файллар сиқилмаган,
+# шунинг учун ўқишда memory-map қилинади - JSON таҳлил қилинмайди ва бутун тарих
+# хотирага юкланмайди. MoM ва хом қийматлар float32, категориялар (скрининг тури,
+# хавф категорияси, медиана тўплами, модел) dictionary кодланган.
+# Маълумот йўқ сонли қийматлар - NaN (ҳисоблаш ядроси каби), null эмас.
+#
+# Фойдаланиш:
+#   python archive.py export [--db genetic_patients.db] [--dir archive] [--from 2024-01] [--to 2024-12] [--overwrite]
+#   python archive.py list [--dir archive]
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+import numpy as np
+import pyarrow as pa
+
+import patient_db
+from aggregates import ANALYTES
+from scoring import (
+    AGE_SYNDROMES,
+    DEFAULT_RISK_ENGINE,
+    RISK_CATEGORY_BOUNDS,
+    SYNDROMES,
+    get_risk_category,
+    get_risk_engine,
+)
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_VERSION = 1
+
+FILE_PREFIX = "screenings_"
+FILE_SUFFIX = ".arrow"
+
+# SQL дан битта сўровда ўқиладиган ёзувлар сони
+CHUNK_SIZE = 5000
+
+MEASUREMENTS = ('age', 'gestational_age', 'bmi', 'weight', 'height')
+ARCHIVE_ANALYTES = ANALYTES['first'] + ANALYTES['second']
+CATEGORICAL_COLUMNS = ('screening_type', 'risk_category', 'median_set', 'risk_model')
+
+# Хавф моделига бериладиган устунлар (calculate_syndrome_risks_batch аргументлари тартибида)
+RISK_INPUT_COLUMNS = ('age', 'nt_mom', 'papp_a_mom', 'free_beta_hcg_mom', 'afp_mom', 'total_hcg_mom', 'ue3_mom')
+
+SCHEMA = pa.schema(
+    [
+        ('seq', pa.int64()),
+        ('id', pa.string()),
+        ('name', pa.string()),
+        ('timestamp', pa.timestamp('us')),
+        ('screening_type', pa.dictionary(pa.int8(), pa.string())),
+    ]
+    + [(column, pa.float32()) for column in MEASUREMENTS]
+    + [('first_gestational_age', pa.float32())]
+    + [(analyte, pa.float32()) for analyte in ARCHIVE_ANALYTES]
+    + [(f'{analyte}_mom', pa.float32()) for analyte in ARCHIVE_ANALYTES]
+    + [(syndrome, pa.float64()) for syndrome in SYNDROMES]
+    + [(f'age_risk_{syndrome}', pa.float64()) for syndrome in AGE_SYNDROMES]
+    + [
+        ('max_risk', pa.float64()),
+        ('risk_category', pa.dictionary(pa.int8(), pa.string())),
+        ('median_set', pa.dictionary(pa.int16(), pa.string())),
+        ('risk_model', pa.dictionary(pa.int8(), pa.string())),
+    ]
+)
+
+# ==================== ЁЗИШ ====================
+
+def month_path(directory, month):
+    return os.path.join(directory, f"{FILE_PREFIX}{month}{FILE_SUFFIX}")
+
+def _next_month(month):
+    year, number = int(month[:4]), int(month[5:7])
+    return f"{year + number // 12:04d}-{number % 12 + 1:02d}"
+
+def _record_row(seq, record):
+    """Ёзув -> устунлар қийматлари (SCHEMA тартибида)"""
+    parameters = record.get('parameters', {})
+    risks = record.get('risks', {})
+    age_risk = risks.get('age_risk', {})
+    highest = patient_db.max_risk(risks)
+    return (
+        [seq, record['id'], record.get('name'), record['timestamp'], record['screening_type']]
+        + [record.get(column) for column in MEASUREMENTS]
+        + [parameters.get('first_gestational_age')]
+        + [parameters.get(analyte) for analyte in ARCHIVE_ANALYTES]
+        + [parameters.get(f'{analyte}_mom') for analyte in ARCHIVE_ANALYTES]
+        + [risks.get(syndrome) for syndrome in SYNDROMES]
+        + [age_risk.get(syndrome) for syndrome in AGE_SYNDROMES]
+        + [highest, get_risk_category(highest)[0], record.get('median_set'), record.get('risk_model')]
+    )
+
+def _column_array(field, values):
+    if pa.types.is_dictionary(field.type):
+        return pa.array(values, pa.string()).dictionary_encode().cast(field.type)
+    if pa.types.is_floating(field.type):
+        # None -> NaN: ўқишда устунлар нусха олмасдан NumPy массивига айланади
+        return pa.array(np.array(values, dtype=field.type.to_pandas_dtype()))
+    if pa.types.is_timestamp(field.type):
+        return pa.array(np.array(values, dtype='datetime64[us]'), field.type)
+    return pa.array(values, field.type)
+
+def _month_rows(conn, month, chunk_size=CHUNK_SIZE):
+    """Ойдаги ёзувлар (timestamp, seq тартибида), индекс бўйича бўлакма-бўлак"""
+    cursor = ("", 0)
+    while True:
+        rows = conn.execute(
+            "SELECT timestamp, seq, record FROM screenings "
+            "WHERE timestamp >= ? AND timestamp < ? AND (timestamp > ? OR (timestamp = ? AND seq > ?)) "
+            "ORDER BY timestamp, seq LIMIT ?",
+            (month, _next_month(month), cursor[0], cursor[0], cursor[1], chunk_size)
+        ).fetchall()
+        if not rows:
+            return
+        for _, seq, record_json in rows:
+            yield _record_row(seq, json.loads(record_json))
+        cursor = rows[-1][:2]
+
+def write_month(conn, month, directory=ARCHIVE_DIR, progress=None):
+    """Бир ойлик скринингларни архив файлига ёзиш (файл атомар алмаштирилади)
+
+    progress(rows) - ҳар бир бўлакдан кейин. Ёзилган қаторлар сонини қайтаради.
+    """
+    columns = [[] for _ in SCHEMA]
+    for count, row in enumerate(_month_rows(conn, month), 1):
+        for values, value in zip(columns, row):
+            values.append(value)
+        if progress and count % CHUNK_SIZE == 0:
+            progress(count)
+    rows = len(columns[0])
+
+    table = pa.Table.from_arrays(
+        [_column_array(field, values) for field, values in zip(SCHEMA, columns)],
+        schema=SCHEMA.with_metadata({
+            'archive_version': str(ARCHIVE_VERSION),
+            'month': month,
+            'rows': str(rows),
+            'max_seq': str(max(columns[0], default=0)),
+        })
+    )
+    os.makedirs(directory, exist_ok=True)
+    path = month_path(directory, month)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+    if progress:
+        progress(rows)
+    return rows
+
+def month_counts(conn, month_from=None, month_to=None):
+    """Базадаги ойлар ва ёзувлар сони: {ЙЙЙЙ-ОО: (сони, энг катта seq)}"""
+    conditions, params = [], []
+    if month_from:
+        conditions.append("timestamp >= ?")
+        params.append(month_from)
+    if month_to:
+        conditions.append("timestamp < ?")
+        params.append(_next_month(month_to))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = conn.execute(
+        f"SELECT substr(timestamp, 1, 7), COUNT(*), MAX(seq) FROM screenings {where} GROUP BY 1 ORDER BY 1",
+        params
+    )
+    return {month: (count, max_seq) for month, count, max_seq in rows}
+
+def export_archive(conn, directory=ARCHIVE_DIR, month_from=None, month_to=None, overwrite=False, progress=None):
+    """Ойлар бўйича архивни янгилаш
+
+    Жадвал фақат қўшиладиган (append-only), шунинг учун ёзувлар сони ва энг
+    катта seq архивдагидек бўлган ой ўзгармаган ҳисобланади ва қайта ёзилмайди
+    (overwrite=True - барчаси қайта ёзилади). progress(rows_done, rows_total).
+    Қайтарилади: {'months': ёзилган ойлар, 'skipped': ўтказилганлар, 'rows': қаторлар}.
+    """
+    archived = {info['month']: info for info in list_archive(directory)}
+    pending = {}
+    skipped = []
+    for month, (count, max_seq) in month_counts(conn, month_from, month_to).items():
+        info = archived.get(month)
+        if not overwrite and info and (info['rows'], info['max_seq']) == (count, max_seq):
+            skipped.append(month)
+        else:
+            pending[month] = count
+
+    total = sum(pending.values())
+    done = 0
+    for month in pending:
+        rows = write_month(conn, month, directory,
+                           progress=(lambda rows: progress(done + rows, total)) if progress else None)
+        done += rows
+    return {'months': list(pending), 'skipped': skipped, 'rows': done, 'directory': directory}
+
+# ==================== ЎҚИШ ====================
+
+def open_month(path, columns=None):
+    """Архив файлини memory-map орқали очиш (устунлар нусха олинмайди)"""
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return table.select(columns) if columns else table
+
+def list_archive(directory=ARCHIVE_DIR):
+    """Архивдаги ойлар: [{'month', 'path', 'rows', 'max_seq', 'bytes'}] (фақат файл метамаълумоти ўқилади)"""
+    files = []
+    for path in sorted(glob.glob(os.path.join(directory, f"{FILE_PREFIX}*{FILE_SUFFIX}"))):
+        with pa.memory_map(path, 'r') as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        if metadata.get(b'archive_version') != str(ARCHIVE_VERSION).encode():
+            continue
+        files.append({
+            'month': metadata[b'month'].decode(),
+            'path': path,
+            'rows': int(metadata[b'rows']),
+            'max_seq': int(metadata[b'max_seq']),
+            'bytes': os.path.getsize(path),
+        })
+    return files
+
+def read_archive(directory=ARCHIVE_DIR, month_from=None, month_to=None, columns=None):
+    """Ойлар оралиғидаги архив битта жадвал сифатида (ҳар бир ой - алоҳида memory-map бўлак)"""
+    tables = [
+        open_month(info['path'], columns) for info in list_archive(directory)
+        if (not month_from or info['month'] >= month_from) and (not month_to or info['month'] <= month_to)
+    ]
+    if not tables:
+        schema = pa.schema([SCHEMA.field(column) for column in columns]) if columns else SCHEMA
+        return schema.empty_table()
+    return pa.concat_tables(tables)
+
+# ==================== NumPy КЎРИНИШЛАРИ ====================
+
+def column_view(column):
+    """Arrow устуни -> нусха олинмаган NumPy кўриниши (memory-map устида)
+
+    Сонли устун - ndarray; dictionary устун - (кодлар, белгилар), белгиси йўқ
+    қаторларда код -1. Ой файли битта бўлак, бир нечта бўлак бўлса улар бирлаштирилади (нусха).
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    if pa.types.is_dictionary(column.type):
+        indices = column.indices.fill_null(-1) if column.null_count else column.indices
+        return indices.to_numpy(zero_copy_only=True), column.dictionary.to_pylist()
+    return column.to_numpy(zero_copy_only=True)
+
+def iter_views(directory=ARCHIVE_DIR, columns=RISK_INPUT_COLUMNS, month_from=None, month_to=None):
+    """Ойлар бўйича (ой, {устун: кўриниш}) - ҳар бир қатор учун Python объекти яратилмайди"""
+    for info in list_archive(directory):
+        if (month_from and info['month'] < month_from) or (month_to and info['month'] > month_to):
+            continue
+        table = open_month(info['path'], list(columns))
+        yield info['month'], {column: column_view(table.column(column)) for column in columns}
+
+def category_mask(view, value):
+    """Dictionary устун кўриниши бўйича фильтр: value белгили қаторлар маскаси"""
+    codes, labels = view
+    if value not in labels:
+        return np.zeros(len(codes), dtype=bool)
+    return codes == labels.index(value)
+
+def risk_category_counts(risks):
+    """Хавфлар массиви -> {категория: сони} (get_risk_category чегаралари, векторли)"""
+    counts = {}
+    for category, (low, high) in RISK_CATEGORY_BOUNDS.items():
+        mask = np.ones(len(risks), dtype=bool)
+        if low is not None:
+            mask &= risks > low
+        if high is not None:
+            mask &= risks <= high
+        counts[category] = int(np.count_nonzero(mask))
+    return counts
+
+def iter_risks(directory=ARCHIVE_DIR, engine=DEFAULT_RISK_ENGINE, month_from=None, month_to=None,
+               screening_type=None):
+    """Архивдаги MoM'лар бўйича хавфлар: ойлар бўйича (ой, хавфлар луғати)
+
+    MoM кўринишлари тўғридан-тўғри батч хавф моделига берилади; NaN - маркер йўқ
+    (rescore.record_moms билан бир хил маъно).
+    """
+    score = get_risk_engine(engine)[0]
+    columns = RISK_INPUT_COLUMNS + (('screening_type',) if screening_type else ())
+    for month, views in iter_views(directory, columns, month_from, month_to):
+        inputs = [views[column] for column in RISK_INPUT_COLUMNS]
+        if screening_type:
+            mask = category_mask(views['screening_type'], screening_type)
+            inputs = [values[mask] for values in inputs]
+        if len(inputs[0]):
+            yield month, score(*inputs)
+
+def compare_risk_categories(directory=ARCHIVE_DIR, engine=DEFAULT_RISK_ENGINE, month_from=None, month_to=None,
+                            screening_type=None):
+    """Сақланган хавфлар ва танланган модел бўйича синдромлар категориялари сони
+
+    Қайтарилади: [{syndrome, category, stored, rescored}] - ойлар бўйича йиғилган.
+    """
+    stored = {syndrome: dict.fromkeys(RISK_CATEGORY_BOUNDS, 0) for syndrome in SYNDROMES}
+    rescored = {syndrome: dict.fromkeys(RISK_CATEGORY_BOUNDS, 0) for syndrome in SYNDROMES}
+    columns = SYNDROMES + (('screening_type',) if screening_type else ())
+    for _, views in iter_views(directory, columns, month_from, month_to):
+        mask = category_mask(views['screening_type'], screening_type) if screening_type else slice(None)
+        for syndrome in SYNDROMES:
+            for category, count in risk_category_counts(views[syndrome][mask]).items():
+                stored[syndrome][category] += count
+    for _, risks in iter_risks(directory, engine, month_from, month_to, screening_type):
+        for syndrome in SYNDROMES:
+            for category, count in risk_category_counts(risks[syndrome]).items():
+                rescored[syndrome][category] += count
+    return [
+        {'syndrome': syndrome, 'category': category,
+         'stored': stored[syndrome][category], 'rescored': rescored[syndrome][category]}
+        for syndrome in SYNDROMES for category in RISK_CATEGORY_BOUNDS
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Скринингларнинг устунли архиви (Arrow IPC)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export = subparsers.add_parser('export', help="Базадан ойлар бўйича архивга ёзиш")
+    export.add_argument('--db', default=patient_db.DEFAULT_DB_PATH)
+    export.add_argument('--dir', default=ARCHIVE_DIR)
+    export.add_argument('--from', dest='month_from', help="Биринчи ой (ЙЙЙЙ-ОО)")
+    export.add_argument('--to', dest='month_to', help="Охирги ой (ЙЙЙЙ-ОО)")
+    export.add_argument('--overwrite', action='store_true', help="Ўзгармаган ойларни ҳам қайта ёзиш")
+    listing = subparsers.add_parser('list', help="Архивдаги ойлар")
+    listing.add_argument('--dir', default=ARCHIVE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        with patient_db.database(args.db) as conn:
+            result = export_archive(conn, args.dir, args.month_from, args.month_to, args.overwrite)
+        print(f"{result['rows']} ёзув, {len(result['months'])} ой ёзилди "
+              f"({len(result['skipped'])} ой ўзгармаган) -> {args.dir}")
+    elif args.command == 'list':
+        for info in list_archive(args.dir):
+            print(f"{info['month']}  {info['rows']:>9} ёзув  {info['bytes'] / 1e6:8.1f} MB  {info['path']}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
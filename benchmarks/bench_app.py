@@ -0,0 +1,29 @@
+# Streamlit скриптининг совуқ ишга тушиш вақти: ҳар сафар янги Python жараёни
+# (импортлар ҳам ўлчанади), скрипт AppTest орқали браузерсиз бажарилади
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+pytest.importorskip('streamlit.testing.v1')
+
+COLD_RUN_SCRIPT = """
+import sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+sys.exit(1 if at.exception else 0)
+"""
+
+def bench_app_cold_run(benchmark, tmp_path):
+    """Бўш каталогда (база ва медиана тўпламлари йўқ) app.py'нинг биринчи ишга тушиши"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+
+    def run():
+        subprocess.run([sys.executable, '-c', COLD_RUN_SCRIPT, os.path.join(ROOT, 'app.py')],
+                       cwd=tmp_path, env=env, check=True, capture_output=True)
+
+    benchmark.pedantic(run, rounds=3, warmup_rounds=1)
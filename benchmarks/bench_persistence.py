@@ -0,0 +1,83 @@
+# Сақлаш: эски JSON тарих (ҳар сақлашда бутун файл қайта ёзилади) ва SQLite база
+# Тарих ҳажми: 1k/10k/100k ёзув (BENCH_HISTORY_SIZES билан ўзгартириш мумкин)
+
+import json
+import os
+
+import pytest
+
+import ids
+import patient_db
+from synthetic import screening_records
+
+HISTORY_SIZES = [int(n) for n in os.environ.get('BENCH_HISTORY_SIZES', '1000,10000,100000').split(',')]
+
+@pytest.fixture(scope='module', params=HISTORY_SIZES, ids=lambda n: f'{n}')
+def history(request, tmp_path_factory):
+    """Берилган ҳажмдаги тарих: JSON файл ва SQLite база"""
+    size = request.param
+    directory = tmp_path_factory.mktemp(f'history{size}')
+    records = screening_records(size)
+
+    json_path = directory / 'genetic_patients_data.json'
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+    db_path = str(directory / 'genetic_patients.db')
+    with patient_db.database(db_path) as conn:
+        with conn:
+            for record in records:
+                patient_db.save_screening(conn, record)
+
+    new_record = screening_records(1, seed=1)[0]
+    return {'size': size, 'records': records, 'json_path': json_path, 'db_path': db_path, 'new': new_record}
+
+def _rounds(size):
+    return 3 if size >= 100_000 else 10
+
+def bench_save_json(benchmark, history):
+    """Эски save_to_local_storage: бутун рўйхат ҳар сафар қайта ёзилади"""
+    records = history['records'] + [history['new']]
+
+    def save():
+        with open(history['json_path'], 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+
+    benchmark.pedantic(save, rounds=_rounds(history['size']))
+
+def bench_save_db(benchmark, history):
+    """patient_db.save_screening: битта қатор қўшилади"""
+    with patient_db.database(history['db_path']) as conn:
+        benchmark(patient_db.save_screening, conn, history['new'])
+
+def bench_load_json(benchmark, history):
+    """Эски load_from_local_storage: бутун тарих хотирага ўқилади"""
+    def load():
+        with open(history['json_path'], 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    benchmark.pedantic(load, rounds=_rounds(history['size']))
+
+def bench_history_page_db(benchmark, history):
+    """Тарих саҳифаси: базадан keyset пагинация билан 20 та ёзув"""
+    with patient_db.database(history['db_path']) as conn:
+        benchmark(patient_db.fetch_screenings_page, conn, 20, risk_category='ЎРТАЧА')
+
+def bench_archive_risks(benchmark, history, tmp_path):
+    """Устунли архив: memory-map кўринишлари тўғридан-тўғри батч хавф моделига"""
+    import archive
+
+    with patient_db.database(history['db_path']) as conn:
+        archive.export_archive(conn, str(tmp_path))
+    benchmark(lambda: [risks for _, risks in archive.iter_risks(str(tmp_path))])
+
+def bench_history_search_db(benchmark, history):
+    """Тарих саҳифаси: исм бўйича FTS5 қидирув (сўзлар боши), 20 та ёзув"""
+    name = history['records'][len(history['records']) // 2]['name']
+    with patient_db.database(history['db_path']) as conn:
+        benchmark(patient_db.fetch_screenings_page, conn, 20, query=name)
+
+def bench_new_ids(benchmark):
+    """ids.new_ids: 100k ноёб ID битта блокда (оммавий импорт)"""
+    result = benchmark(ids.new_ids, 100_000)
+    assert len(set(result)) == len(result)
@@ -0,0 +1,83 @@
+# Ҳисоблаш ядроси: скаляр (битта бемор) ва векторли (бутун плашка) ўтказувчанлик
+
+import pytest
+
+from scoring import (
+    calculate_mom_delfia,
+    calculate_mom_delfia_batch,
+    calculate_syndrome_risks,
+    calculate_syndrome_risks_batch,
+    get_age_multiplier,
+    get_age_multiplier_batch,
+    get_delfia_norm,
+)
+from lr_model import calculate_syndrome_risks_lr_batch
+from synthetic import patient_arrays, patient_rows
+from uncertainty import risk_intervals
+
+SCALAR_ROWS = 1000
+BATCH_ROWS = 100_000
+LR_ROWS = 1_000_000
+
+@pytest.fixture(scope='module')
+def rows():
+    return patient_rows(SCALAR_ROWS)
+
+@pytest.fixture(scope='module')
+def arrays():
+    return patient_arrays(BATCH_ROWS)
+
+@pytest.fixture(scope='module')
+def quad_arrays():
+    """LR модели учун: биринчи ва иккиламчи скрининг маркерлари бирга (интеграл)"""
+    first, second = patient_arrays(LR_ROWS), patient_arrays(LR_ROWS, 'second', seed=1)
+    return dict(first, **{key: second[key] for key in ('afp', 'total_hcg', 'ue3')})
+
+def _throughput(benchmark, rows):
+    benchmark.extra_info['rows'] = rows
+
+# ==================== СКАЛЯР ====================
+
+def bench_calculate_mom_delfia(benchmark, rows):
+    _throughput(benchmark, len(rows))
+    benchmark(lambda: [calculate_mom_delfia(r['papp_a'], 'PAPP_A', r['gestational_age'], r['weight'])
+                       for r in rows])
+
+def bench_get_delfia_norm(benchmark, rows):
+    _throughput(benchmark, len(rows))
+    benchmark(lambda: [get_delfia_norm('PAPP_A', r['gestational_age']) for r in rows])
+
+def bench_get_age_multiplier(benchmark, rows):
+    _throughput(benchmark, len(rows))
+    benchmark(lambda: [get_age_multiplier(r['age'], 'downs') for r in rows])
+
+def bench_calculate_syndrome_risks(benchmark, rows):
+    _throughput(benchmark, len(rows))
+    benchmark(lambda: [calculate_syndrome_risks(r['age'], r['nt'] / 2, r['papp_a'] / 2, r['free_beta_hcg'] / 40)
+                       for r in rows])
+
+# ==================== ВЕКТОРЛИ ====================
+
+def bench_calculate_mom_delfia_batch(benchmark, arrays):
+    _throughput(benchmark, BATCH_ROWS)
+    benchmark(calculate_mom_delfia_batch, arrays['papp_a'], 'PAPP_A', arrays['gestational_age'], arrays['weight'])
+
+def bench_get_age_multiplier_batch(benchmark, arrays):
+    _throughput(benchmark, BATCH_ROWS)
+    benchmark(get_age_multiplier_batch, arrays['age'], 'downs')
+
+def bench_calculate_syndrome_risks_batch(benchmark, arrays):
+    _throughput(benchmark, BATCH_ROWS)
+    benchmark(calculate_syndrome_risks_batch, arrays['age'], arrays['nt'] / 2, arrays['papp_a'] / 2,
+              arrays['free_beta_hcg'] / 40)
+
+def bench_calculate_syndrome_risks_lr_batch(benchmark, quad_arrays):
+    _throughput(benchmark, LR_ROWS)
+    a = quad_arrays
+    benchmark(calculate_syndrome_risks_lr_batch, a['age'], a['nt'] / 2, a['papp_a'] / 2, a['free_beta_hcg'] / 40,
+              a['afp'] / 45, a['total_hcg'] / 22000, a['ue3'] / 2)
+
+def bench_risk_intervals(benchmark):
+    # Вақт бюджетисиз: барча тортимлар ҳисобланади
+    result = benchmark(risk_intervals, (35, 1.8, 0.5, 1.5), 'lr', time_budget=None)
+    _throughput(benchmark, result['draws'])
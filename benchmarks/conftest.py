@@ -0,0 +1,8 @@
+# Бенчмарклар учун умумий созламалар: лойиҳа модуллари илова илдизидан импорт қилинади
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
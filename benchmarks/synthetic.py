@@ -0,0 +1,62 @@
+# synthetic.py - Бенчмарклар учун синтетик беморлар генератори
+# Қийматлар DELFIA нормалари атрофида тасодифий, seed берилса - такрорланувчи
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from scoring import SYNDROMES, calculate_bmi, calculate_mom_delfia_batch, calculate_syndrome_risks_batch
+
+FIRST_ANALYTES = (('nt', 'NT', 0.8, 4.0), ('papp_a', 'PAPP_A', 0.3, 6.0), ('free_beta_hcg', 'FREE_BETA_HCG', 10.0, 120.0))
+SECOND_ANALYTES = (('afp', 'AFP', 15.0, 90.0), ('total_hcg', 'TOTAL_HCG', 10000.0, 60000.0), ('ue3', 'UE3', 0.5, 3.0))
+
+def patient_arrays(n, screening_type='first', seed=0):
+    """Векторли ҳисоб учун n та бемор: {'age', 'gestational_age', 'weight', аналитлар...}"""
+    rng = np.random.default_rng(seed)
+    columns = {
+        'age': rng.uniform(18, 45, n),
+        'gestational_age': rng.uniform(10, 13.9, n) if screening_type == 'first' else rng.uniform(15, 21.9, n),
+        'weight': rng.uniform(45, 110, n),
+    }
+    analytes = FIRST_ANALYTES if screening_type == 'first' else SECOND_ANALYTES
+    for column, _, low, high in analytes:
+        columns[column] = rng.uniform(low, high, n)
+    return columns
+
+def patient_rows(n, screening_type='first', seed=0):
+    """Скаляр ҳисоб учун n та бемор (Python float луғатлари)"""
+    columns = patient_arrays(n, screening_type, seed)
+    return [{key: float(values[i]) for key, values in columns.items()} for i in range(n)]
+
+def screening_records(n, seed=0):
+    """Базага ёки JSON тарихга ёзиладиган n та биринчи скрининг ёзуви"""
+    columns = patient_arrays(n, 'first', seed)
+    moms = {
+        column: calculate_mom_delfia_batch(columns[column], parameter, columns['gestational_age'], columns['weight'])
+        for column, parameter, _, _ in FIRST_ANALYTES
+    }
+    risks = calculate_syndrome_risks_batch(columns['age'], moms['nt'], moms['papp_a'], moms['free_beta_hcg'])
+
+    started = datetime(2024, 1, 1)
+    records = []
+    for i in range(n):
+        parameters = {}
+        for column, _, _, _ in FIRST_ANALYTES:
+            parameters[column] = float(columns[column][i])
+            parameters[f'{column}_mom'] = float(moms[column][i])
+        weight = float(columns['weight'][i])
+        records.append({
+            'id': f"P{seed}-{i:06d}",
+            'name': f"Бемор {i}",
+            'age': float(columns['age'][i]),
+            'screening_type': 'first',
+            'gestational_age': float(columns['gestational_age'][i]),
+            'bmi': calculate_bmi(weight, 165),
+            'weight': weight,
+            'height': 165,
+            'timestamp': (started + timedelta(minutes=i)).isoformat(),
+            'risks': {syndrome: float(risks[syndrome][i]) for syndrome in SYNDROMES},
+            'parameters': parameters,
+            'median_set': 'DELFIA/builtin',
+        })
+    return records
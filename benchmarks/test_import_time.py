@@ -0,0 +1,45 @@
+# Импорт вақти бюджети: ҳисоблаш ядроси ва фон вазифалари Streamlit, Plotly ва
+# pandas'ни юкламаслиги ҳамда тез импорт қилиниши керак. Ҳар бир ўлчов янги
+# Python жараёнида; бюджетни IMPORT_BUDGET_MS билан ўзгартириш мумкин
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+IMPORT_BUDGET_MS = float(os.environ.get('IMPORT_BUDGET_MS', '300'))
+HEAVY_MODULES = ('streamlit', 'plotly', 'pandas')
+
+# Streamlit'сиз модуллар: иш жараёнлари, API ва CLI воситалари шулардан фойдаланади
+CORE_MODULES = ('scoring', 'lr_model', 'uncertainty', 'result_cache', 'stage_timing', 'ids', 'labels', 'reports', 'reference_tables', 'median_sets', 'patient_db', 'rescore')
+
+MEASURE_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - started
+print(json.dumps({'ms': seconds * 1000, 'modules': sorted(sys.modules)}))
+"""
+
+def measure_import(module):
+    """Модулни янги жараёнда импорт қилиш: (миллисекунд, юкланган модуллар)"""
+    best = None
+    for _ in range(3):
+        output = subprocess.run([sys.executable, '-c', MEASURE_SCRIPT, module], cwd=ROOT,
+                                env=dict(os.environ, PYTHONPATH=ROOT), check=True,
+                                capture_output=True, text=True).stdout
+        result = json.loads(output)
+        if best is None or result['ms'] < best['ms']:
+            best = result
+    return best['ms'], set(best['modules'])
+
+@pytest.mark.parametrize('module', CORE_MODULES)
+def test_core_import_is_light(module):
+    ms, modules = measure_import(module)
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"{module} импорти {', '.join(loaded)} ни юклади"
+    assert ms <= IMPORT_BUDGET_MS, f"{module} импорти {ms:.0f} мс (бюджет {IMPORT_BUDGET_MS:.0f} мс)"
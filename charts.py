@@ -0,0 +1,76 @@
+# charts.py - Plotly графикларининг кеши
+# Статик референс графиклар жараёнда бир марта қурилади, бемор графиклари
+# хавфлар кортежи бўйича чегараланган LRU кешда сақланади. Кешда графикнинг
+# JSON'и сақланади, ҳар бир чизишда ундан янги Figure тикланади - сессиялар
+# битта ўзгарувчан Figure объектини бўлишмайди (px билан қайта қуриш шарт эмас)
+
+import plotly.express as px
+import plotly.io as pio
+import streamlit as st
+
+from labels import SYNDROME_LABELS
+from scoring import AGE_MULTIPLIERS, SYNDROMES
+
+# Бемор графиклари кешидаги энг кўп ёзувлар (эскилари чиқариб ташланади)
+PATIENT_CHART_CACHE_SIZE = 256
+
+SYNDROME_COLORS = ['#ff6b6b', '#ff9800', '#ff5722', '#9c27b0', '#4caf50']
+
+def risk_key(risks):
+    """Бемор графиги учун кеш калити: синдромлар тартибидаги хавфлар кортежи"""
+    return tuple(float(risks[syndrome]) for syndrome in SYNDROMES)
+
+@st.cache_data(max_entries=PATIENT_CHART_CACHE_SIZE)
+def _risk_bar_json(risk_tuple):
+    syndromes = [SYNDROME_LABELS[syndrome] for syndrome in SYNDROMES]
+    risk_values = [1/risk if risk > 0 else 10000 for risk in risk_tuple]
+
+    fig = px.bar(
+        x=syndromes,
+        y=risk_values,
+        title="Генетик синдромлар хавфлари (1:N)",
+        labels={'x': 'Синдром', 'y': 'Хавф нисбати (1:N)'},
+        color=syndromes,
+        color_discrete_sequence=SYNDROME_COLORS
+    )
+    fig.update_layout(height=400)
+    return fig.to_json()
+
+def risk_bar_figure(risk_tuple):
+    """Генетик синдромлар хавфлари (1:N) устунли диаграммаси (кешдаги JSON'дан янги Figure)"""
+    return pio.from_json(_risk_bar_json(risk_tuple))
+
+@st.cache_data
+def _age_risk_json():
+    ages = list(AGE_MULTIPLIERS.keys())
+    downs_mult = [AGE_MULTIPLIERS[age]['downs'] for age in ages]
+
+    fig_age = px.line(
+        x=ages,
+        y=downs_mult,
+        title="Ёш бўйича Даун синдроми хавфи",
+        labels={'x': 'Ёш', 'y': 'Хавф кўпайтирувчиси'},
+        markers=True
+    )
+
+    # Қўшимча синдромлар
+    fig_age.add_scatter(
+        x=ages,
+        y=[AGE_MULTIPLIERS[age]['edwards'] for age in ages],
+        mode='lines+markers',
+        name='Эдвардс'
+    )
+
+    fig_age.add_scatter(
+        x=ages,
+        y=[AGE_MULTIPLIERS[age]['patau'] for age in ages],
+        mode='lines+markers',
+        name='Патау'
+    )
+
+    fig_age.update_layout(height=400, legend=dict(orientation="h", yanchor="bottom", y=1.02))
+    return fig_age.to_json()
+
+def age_risk_figure():
+    """Ёш бўйича Даун синдроми хавфи графиги (барча беморлар учун бир хил, кешдаги JSON'дан)"""
+    return pio.from_json(_age_risk_json())
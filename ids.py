@@ -0,0 +1,82 @@
+# ids.py - Скрининг ID'лари: ноёб, вақт бўйича сараланадиган (ULID услубида)
+# Кўриниш: GEN-ЙЙЙЙООККССДДСС + мс (3 рақам) + "-" + 8 белгили Crockford base32 ҳисоблагич.
+# Вақт қисми эски GEN-%Y%m%d%H%M%S ID'лари билан бир хил - лексик тартиб вақт тартибига мос,
+# янги ID'лар индекс охирига ёзилади. Ҳар бир миллисекундда ҳисоблагич тасодифий қийматдан
+# бошланиб, жараён ичида қулф остида монотон оширилади (бир мс ичида ҳам тартиб сақланади)
+#
+# Фойдаланиш:
+#   python ids.py [--count 5] [--prefix GEN]
+
+import argparse
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_PREFIX = 'GEN'
+
+# Crockford base32 (I, L, O, U йўқ) - белгилар ASCII тартибида, шунинг учун сатр тартиби = сон тартиби
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+SUFFIX_LENGTH = 8
+SUFFIX_SPACE = 32 ** SUFFIX_LENGTH
+# Бошланғич қиймат пастки ярмидан: бир мс ичида камида 2^39 ID учун жой қолади
+RANDOM_START_SPACE = SUFFIX_SPACE // 2
+
+# 10 бит -> 2 белги жадвали: 8 белгили қисм 4 та жадвалдан ўқиш билан ҳосил бўлади
+_PAIRS = [a + b for a in ALPHABET for b in ALPHABET]
+
+_lock = threading.Lock()
+_state = {'ms': 0, 'counter': 0}
+
+def _encode(value):
+    pairs = _PAIRS
+    return pairs[value >> 30] + pairs[(value >> 20) & 1023] + pairs[(value >> 10) & 1023] + pairs[value & 1023]
+
+def _time_part(ms):
+    return datetime.fromtimestamp(ms / 1000).strftime('%Y%m%d%H%M%S') + f'{ms % 1000:03d}'
+
+def _reserve(count):
+    """count та кетма-кет ҳисоблагич қийматини банд қилиш: [(мс, биринчи қиймат, сони), ...]"""
+    blocks = []
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        if now > _state['ms']:
+            # Янги миллисекунд - тасодифий бошланғич қиймат
+            _state['ms'], _state['counter'] = now, secrets.randbelow(RANDOM_START_SPACE)
+        # Соат орқага кетса ҳам охирги мс дан давом этилади (монотонлик)
+        while count > 0:
+            taken = min(count, SUFFIX_SPACE - _state['counter'])
+            if taken == 0:
+                # Ҳисоблагич тўлди - кейинги миллисекундни "қарзга" олиш
+                _state['ms'], _state['counter'] = _state['ms'] + 1, secrets.randbelow(RANDOM_START_SPACE)
+                continue
+            blocks.append((_state['ms'], _state['counter'], taken))
+            _state['counter'] += taken
+            count -= taken
+    return blocks
+
+def new_id(prefix=DEFAULT_PREFIX):
+    """Битта янги скрининг ID'си"""
+    ((ms, counter, _),) = _reserve(1)
+    return f'{prefix}-{_time_part(ms)}-{_encode(counter)}'
+
+def new_ids(count, prefix=DEFAULT_PREFIX):
+    """count та янги ID (оммавий импорт учун): блок битта қулф ичида банд қилинади, тартиб ўсувчи"""
+    result = []
+    for ms, first, taken in _reserve(count):
+        head = f'{prefix}-{_time_part(ms)}-'
+        result.extend(head + _encode(counter) for counter in range(first, first + taken))
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Янги скрининг ID'лари")
+    parser.add_argument('--count', type=int, default=1)
+    parser.add_argument('--prefix', default=DEFAULT_PREFIX)
+    args = parser.parse_args(argv)
+    for value in new_ids(args.count, args.prefix):
+        print(value)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
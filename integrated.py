@@ -0,0 +1,113 @@
+# integrated.py - Интеграл хавф: иккиламчи скрининг + шу эпизоддаги биринчи скрининг MoM'лари
+# Иккиламчи скрининглар эпизоддаги охирги биринчи скрининг билан индексланган JOIN орқали
+# боғланади (idx_screenings_episode); бутун когорта бўлакма-бўлак батч хавф моделида ҳисобланади
+#
+# Фойдаланиш:
+#   python integrated.py report.csv [--db genetic_patients.db] [--engine lr] [--from 2026-01-01] [--to 2026-06-30]
+
+import argparse
+import csv
+import json
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+
+import patient_db
+from scoring import DEFAULT_RISK_ENGINE, RISK_ENGINES, SYNDROMES, get_risk_category, get_risk_engine
+
+DEFAULT_CHUNK_SIZE = 5000
+
+FIRST_MOMS = ('nt_mom', 'papp_a_mom', 'free_beta_hcg_mom')
+SECOND_MOMS = ('afp_mom', 'total_hcg_mom', 'ue3_mom')
+
+FIRST_PARAMETERS = ('nt', 'nt_mom', 'papp_a', 'papp_a_mom', 'free_beta_hcg', 'free_beta_hcg_mom')
+
+# Иккиламчи скрининг ва эпизоддаги охирги биринчи скрининг (коррелацияланган сўров индекс бўйича).
+# +screening_type - тур индекси ишлатилмасин: бўлаклар seq (PRIMARY KEY) оралиғи бўйича ўқилади
+LINKED_SQL = """
+SELECT s.seq, s.record, f.seq, f.record
+FROM screenings s
+JOIN screenings f ON f.seq = (
+    SELECT seq FROM screenings
+    WHERE episode_id = s.episode_id AND screening_type = 'first'
+    ORDER BY timestamp DESC, seq DESC LIMIT 1
+)
+WHERE s.seq > ? AND +s.screening_type = 'second' AND s.episode_id IS NOT NULL {where}
+ORDER BY s.seq
+LIMIT ?
+"""
+
+def first_trimester_parameters(first_record):
+    """Биринчи скрининг ёзувидан иккиламчи ёзувга кўчириладиган параметрлар (қайта ҳисоблаш учун)"""
+    parameters = first_record.get('parameters', {})
+    linked = {key: parameters[key] for key in FIRST_PARAMETERS if key in parameters}
+    linked['first_gestational_age'] = first_record.get('gestational_age')
+    return linked
+
+def iter_linked_chunks(conn, date_from=None, date_to=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Боғланган (иккиламчи seq, ёзув, биринчи seq, ёзув) бўлаклари, seq тартибида"""
+    conditions, params = [], []
+    if date_from is not None:
+        conditions.append("s.timestamp >= ?")
+        params.append(date_from.isoformat())
+    if date_to is not None:
+        conditions.append("s.timestamp < ?")
+        params.append((date_to + timedelta(days=1)).isoformat())
+    sql = LINKED_SQL.format(where=''.join(f" AND {condition}" for condition in conditions))
+    after_seq = 0
+    while True:
+        rows = conn.execute(sql, [after_seq] + params + [chunk_size]).fetchall()
+        if not rows:
+            return
+        yield [(seq, json.loads(record), first_seq, json.loads(first)) for seq, record, first_seq, first in rows]
+        after_seq = rows[-1][0]
+
+def _moms(records, keys):
+    return [np.array([record.get('parameters', {}).get(key) for record in records], dtype=float) for key in keys]
+
+def integrated_chunk_risks(rows, engine=DEFAULT_RISK_ENGINE):
+    """Бўлак учун интеграл хавфлар: биринчи скрининг MoM'лари сақланган ёзувдан олинади"""
+    seconds = [row[1] for row in rows]
+    firsts = [row[3] for row in rows]
+    age = np.array([record.get('age') for record in seconds], dtype=float)
+    return get_risk_engine(engine)[0](age, *_moms(firsts, FIRST_MOMS), *_moms(seconds, SECOND_MOMS))
+
+def write_integrated_report(conn, path, engine=DEFAULT_RISK_ENGINE, date_from=None, date_to=None,
+                            chunk_size=DEFAULT_CHUNK_SIZE):
+    """Когорта интеграл хавфлари CSV файлга; ёзилган қаторлар сонини қайтаради"""
+    rows_done = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['seq', 'first_seq', 'id', 'name', 'timestamp']
+                        + [f'{syndrome}_risk' for syndrome in SYNDROMES]
+                        + ['max_risk', 'risk_category', 'stored_max_risk'])
+        for rows in iter_linked_chunks(conn, date_from, date_to, chunk_size):
+            risks = integrated_chunk_risks(rows, engine)
+            highest = np.max([risks[syndrome] for syndrome in SYNDROMES], axis=0)
+            for i, (seq, record, first_seq, _) in enumerate(rows):
+                writer.writerow(
+                    [seq, first_seq, record['id'], record.get('name'), record['timestamp']]
+                    + [float(risks[syndrome][i]) for syndrome in SYNDROMES]
+                    + [float(highest[i]), get_risk_category(highest[i])[0],
+                       patient_db.max_risk(record.get('risks', {}))]
+                )
+            rows_done += len(rows)
+    return rows_done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Боғланган скрининглар бўйича интеграл хавфлар")
+    parser.add_argument('output', help="Натижа CSV файли")
+    parser.add_argument('--db', default=patient_db.DEFAULT_DB_PATH)
+    parser.add_argument('--engine', default=DEFAULT_RISK_ENGINE, choices=RISK_ENGINES)
+    parser.add_argument('--from', dest='date_from', type=date.fromisoformat, help="Биринчи сана (ЙЙЙЙ-ОО-КК)")
+    parser.add_argument('--to', dest='date_to', type=date.fromisoformat, help="Охирги сана (ЙЙЙЙ-ОО-КК)")
+    args = parser.parse_args(argv)
+
+    with patient_db.database(args.db) as conn:
+        rows = write_integrated_report(conn, args.output, args.engine, args.date_from, args.date_to)
+    print(f"{rows} боғланган скрининг -> {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,302 @@
+# jobs.py - Фон вазифалари: SQLite навбати ва алоҳида worker жараёни
+# Streamlit сессияси вазифани навбатга қўяди (submit) ва ҳолатини сўраб туради
+# (polling); оғир ҳисоблар worker жараёнида процесслар пули билан бажарилади,
+# шунинг учун саҳифа блокланмайди. Бекор қилиш - cancel_requested белгиси орқали
+#
+# Вазифа турлари:
+#   import  - плашка файлини ҳисоблаш (plate_import)
+#   rescore - сақланган скринингларни қайта ҳисоблаш (rescore)
+#   export  - барча скринингларни CSV га чиқариш
+#   archive - скринингларни ойлар бўйича устунли архивга ёзиш (archive)
+#   reports - сана оралиғидаги беморлар ҳисоботлари, ZIP файлда (reports)
+#
+# Фойдаланиш:
+#   python jobs.py worker [--db genetic_patients.db] [--processes 4]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import traceback
+from datetime import date, datetime
+
+import patient_db
+
+JOBS_DIR = "jobs"
+
+# Бўш навбатда worker шунча сонияда бир текширади
+POLL_INTERVAL = 0.5
+
+# Прогресс базага кўпи билан шунча сонияда бир ёзилади
+PROGRESS_INTERVAL = 0.5
+
+JOB_COLUMNS = ('id', 'kind', 'params', 'status', 'progress', 'message', 'result', 'cancel_requested',
+               'pid', 'created', 'started', 'finished')
+ACTIVE_STATUSES = ('queued', 'running')
+
+class JobCancelled(Exception):
+    """Фойдаланувчи вазифани бекор қилди"""
+
+# ==================== НАВБАТ ====================
+
+def _job(row):
+    job = dict(zip(JOB_COLUMNS, row))
+    job['params'] = json.loads(job['params'])
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+def submit(conn, kind, params):
+    """Вазифани навбатга қўйиш, вазифа рақамини қайтаради"""
+    if kind not in HANDLERS:
+        raise ValueError(f"Номаълум вазифа тури: {kind}")
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO jobs (kind, params, created) VALUES (?, ?, ?)",
+            (kind, json.dumps(params, ensure_ascii=False), datetime.now().isoformat())
+        )
+    return cursor.lastrowid
+
+def get_job(conn, job_id):
+    row = conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _job(row) if row else None
+
+def list_jobs(conn, limit=20):
+    """Охирги вазифалар (янгилари аввал)"""
+    rows = conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+    return [_job(row) for row in rows]
+
+def cancel(conn, job_id):
+    """Навбатдаги вазифа дарҳол бекор қилинади, бажарилаётганига белги қўйилади"""
+    with conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ? WHERE id = ? AND status = 'queued'",
+            (datetime.now().isoformat(), job_id)
+        )
+        conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+
+def _claim(conn):
+    """Навбатдаги энг эски вазифани олиш (бир нечта worker бўлса ҳам фақат биттаси олади)"""
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = 'running', started = ?, pid = ? WHERE id = ?",
+            (datetime.now().isoformat(), os.getpid(), row[0])
+        )
+    return _job(row)
+
+def _finish(conn, job_id, status, message=None, result=None):
+    with conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, message = ?, result = ?, finished = ?, "
+            "progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END WHERE id = ?",
+            (status, message, json.dumps(result, ensure_ascii=False) if result is not None else None,
+             datetime.now().isoformat(), status, job_id)
+        )
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+def _requeue_orphans(conn):
+    """Worker тўхтаб қолганда 'running' ҳолатида қолган вазифаларни навбатга қайтариш"""
+    orphans = [job_id for job_id, pid in conn.execute("SELECT id, pid FROM jobs WHERE status = 'running'")
+               if pid != os.getpid() and not _pid_alive(pid)]
+    with conn:
+        for job_id in orphans:
+            conn.execute("UPDATE jobs SET status = 'queued', pid = NULL WHERE id = ?", (job_id,))
+    return len(orphans)
+
+# ==================== ПРОГРЕСС ====================
+
+def _reporter(conn, job_id):
+    """Handler'лар учун report(progress, message): базага ёзади ва бекор қилишни текширади"""
+    last = {'time': 0.0}
+
+    def report(progress, message=None, force=False):
+        now = time.monotonic()
+        if not force and now - last['time'] < PROGRESS_INTERVAL:
+            return
+        last['time'] = now
+        with conn:
+            conn.execute("UPDATE jobs SET progress = ?, message = ? WHERE id = ?",
+                         (min(max(progress, 0.0), 1.0), message, job_id))
+        if conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]:
+            raise JobCancelled()
+
+    return report
+
+# ==================== HANDLER'ЛАР ====================
+
+def _count_rows(path):
+    """Плашка файлидаги маълумот қаторлари сони (прогресс учун тахминий)"""
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            return max((workbook.active.max_row or 1) - 1, 1)
+        finally:
+            workbook.close()
+    with open(path, 'rb') as f:
+        return max(sum(1 for _ in f) - 1, 1)
+
+def run_import(params, report, db_path, processes):
+    """params: input, output, screening_type (ихтиёрий), median_set (ЛОТ/ВЕРСИЯ, ихтиёрий)"""
+    import median_sets
+    import plate_import
+
+    total = _count_rows(params['input'])
+    median_set = median_sets.find_median_set(params['median_set']) if params.get('median_set') else None
+    report(0.0, f"0 / {total} қатор", force=True)
+    stats = plate_import.score_plate_file(
+        params['input'], params['output'], params.get('screening_type'),
+        median_set=median_set, processes=processes,
+        progress=lambda rows: report(rows / total, f"{rows} / {total} қатор")
+    )
+    return dict(stats, output=params['output'])
+
+def run_rescore(params, report, db_path, processes):
+    """params: median_set (ЛОТ/ВЕРСИЯ, ихтиёрий), from_median_set (манба тўплам, ихтиёрий), engine,
+    version (ихтиёрий), restart, report (ўзгаришлар CSV)
+    """
+    import median_sets
+    import rescore
+    from scoring import DEFAULT_RISK_ENGINE
+
+    with patient_db.database(db_path) as conn:
+        total = max(patient_db.count_screenings(conn, params.get('from_median_set')), 1)
+    median_set = median_sets.find_median_set(params['median_set']) if params.get('median_set') else None
+    report(0.0, f"0 / {total} ёзув", force=True)
+    run = rescore.run_rescore(
+        db_path, median_set, params.get('version'), processes=processes, restart=params.get('restart', False),
+        progress=lambda run: report(run['processed'] / total,
+                                    f"{run['processed']} / {total} ёзув, {run['changed']} ўзгарган"),
+        engine=params.get('engine', DEFAULT_RISK_ENGINE), source_median_set=params.get('from_median_set')
+    )
+    if params.get('report'):
+        with patient_db.database(db_path) as conn:
+            rescore.write_diff_report(conn, run['version'], params['report'])
+        run['output'] = params['report']
+    return run
+
+def run_export(params, report, db_path, processes):
+    """params: output"""
+    with patient_db.database(db_path) as conn:
+        total = max(patient_db.count_screenings(conn), 1)
+        report(0.0, f"0 / {total} ёзув", force=True)
+        rows = patient_db.export_csv(conn, params['output'],
+                                     progress=lambda rows: report(rows / total, f"{rows} / {total} ёзув"))
+    return {'rows': rows, 'output': params['output']}
+
+def run_archive(params, report, db_path, processes):
+    """params: directory (ихтиёрий), month_from, month_to, overwrite"""
+    import archive
+
+    report(0.0, "Ойлар текширилмоқда", force=True)
+    with patient_db.database(db_path) as conn:
+        return archive.export_archive(
+            conn, params.get('directory', archive.ARCHIVE_DIR), params.get('month_from'), params.get('month_to'),
+            params.get('overwrite', False),
+            progress=lambda rows, total: report(rows / max(total, 1), f"{rows} / {total} ёзув")
+        )
+
+def run_reports(params, report, db_path, processes):
+    """params: output (ZIP), date_from, date_to (ЙЙЙЙ-ОО-КК, ихтиёрий), format"""
+    import reports
+
+    directory = os.path.splitext(params['output'])[0]
+    report(0.0, "Ёзувлар танланмоқда", force=True)
+    result = reports.render_reports(
+        db_path, directory,
+        date.fromisoformat(params['date_from']) if params.get('date_from') else None,
+        date.fromisoformat(params['date_to']) if params.get('date_to') else None,
+        params.get('format', 'html'), processes,
+        progress=lambda done, total: report(done / max(total, 1), f"{done} / {total} ҳисобот")
+    )
+    report(1.0, "ZIP файлга жамланмоқда", force=True)
+    result['output'] = reports.zip_reports(directory, params['output'])
+    return result
+
+HANDLERS = {
+    'import': run_import,
+    'rescore': run_rescore,
+    'export': run_export,
+    'archive': run_archive,
+    'reports': run_reports,
+}
+
+# ==================== WORKER ====================
+
+def run_job(conn, job, db_path, processes):
+    """Битта вазифани бажариб, якуний ҳолатини ёзиш"""
+    report = _reporter(conn, job['id'])
+    try:
+        result = HANDLERS[job['kind']](job['params'], report, db_path, processes)
+    except JobCancelled:
+        _finish(conn, job['id'], 'cancelled', "Бекор қилинди")
+    except Exception as e:
+        traceback.print_exc()
+        _finish(conn, job['id'], 'failed', f"{type(e).__name__}: {e}")
+    else:
+        _finish(conn, job['id'], 'done', result=result)
+
+def work(db_path=patient_db.DEFAULT_DB_PATH, processes=None, once=False, parent_pid=None):
+    """Навбатдаги вазифаларни кетма-кет бажариш
+
+    once=True - навбат бўшагач чиқиш; parent_pid - шу жараён тугагач
+    (навбат бўш бўлганда) чиқиш.
+    """
+    processes = processes or os.cpu_count() or 1
+    with patient_db.database(db_path) as conn:
+        _requeue_orphans(conn)
+        while True:
+            job = _claim(conn)
+            if job is None:
+                if once or (parent_pid and not _pid_alive(parent_pid)):
+                    return
+                time.sleep(POLL_INTERVAL)
+                continue
+            run_job(conn, job, db_path, processes)
+
+def start_worker(db_path=patient_db.DEFAULT_DB_PATH, processes=None):
+    """Worker'ни алоҳида жараён сифатида ишга тушириш (Streamlit'дан), Popen қайтаради
+
+    Worker чақирган жараён тугагач ўзи ҳам тўхтайди.
+    """
+    command = [sys.executable, os.path.abspath(__file__), 'worker', '--db', db_path,
+               '--parent-pid', str(os.getpid())]
+    if processes:
+        command += ['--processes', str(processes)]
+    return subprocess.Popen(command, start_new_session=True)
+
+def job_path(name):
+    """Вазифа кирувчи/чиқувчи файли учун JOBS_DIR ичидаги ноёб йўл"""
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    return os.path.abspath(os.path.join(JOBS_DIR, f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}_{name}"))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Фон вазифалари worker'и")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    worker = subparsers.add_parser('worker', help="Навбатдаги вазифаларни бажариш")
+    worker.add_argument('--db', default=patient_db.DEFAULT_DB_PATH)
+    worker.add_argument('--processes', type=int, help="Процесслар сони (кўрсатилмаса CPU сони)")
+    worker.add_argument('--once', action='store_true', help="Навбат бўшагач чиқиш")
+    worker.add_argument('--parent-pid', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        work(args.db, args.processes, args.once, args.parent_pid)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
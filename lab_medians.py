@@ -0,0 +1,132 @@
+# lab_medians.py - Лабораториянинг ўз популяциясидан медиана тўпламини ҳосил қилиш
+# Хом қийматлар хотирага юкланмайди: ҳар бир сақланган скрининг aggregates.py
+# даги (аналит, гестация куни) скетчига қўшилади, бу ерда эса кунлик скетчлар
+# ҳафталарга бирлаштирилиб медианалар олинади. Натижа median_sets/ каталогига
+# JSON тўплам сифатида ёзилади ва get_delfia_norm / MoM ҳисобида ишлатилади
+#
+# Фойдаланиш:
+#   python lab_medians.py --lot LAB-2026 --version 1 [--from 2026-01] [--to 2026-06]
+#                         [--min-count 50] [--active] [--db genetic_patients.db]
+
+import argparse
+import json
+import os
+import sys
+
+import median_sets
+import patient_db
+from aggregates import sketch_quantile
+from reference_tables import DAYS_PER_WEEK
+
+# Ҳафта медианаси учун камида шунча натижа керак, акс ҳолда асос тўплам қиймати қолади
+MIN_COUNT = 50
+
+def week_medians(conn, month_from=None, month_to=None):
+    """{(триместр, параметр, ҳафта): (медиана, сон)}
+
+    Кунлик жадвалда ҳафта медианаси шу ҳафтанинг 0-кунига тўғри келади, шунинг
+    учун ҳафта атрофидаги ±3 кун скетчлари бирлаштирилади.
+    """
+    conditions, params = [], []
+    if month_from:
+        conditions.append("month >= ?")
+        params.append(month_from)
+    if month_to:
+        conditions.append("month <= ?")
+        params.append(month_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    sketches = {}
+    for trimester, analyte, week, bucket, count in conn.execute(
+        f"SELECT screening_type, analyte, (day + ?) / ? AS week, bucket, SUM(count) FROM agg_raw_sketch {where} "
+        f"GROUP BY screening_type, analyte, week, bucket",
+        [DAYS_PER_WEEK // 2, DAYS_PER_WEEK] + params
+    ):
+        sketches.setdefault((trimester, analyte.upper(), week), {})[bucket] = count
+    return {key: (sketch_quantile(buckets, 0.5), sum(buckets.values())) for key, buckets in sketches.items()}
+
+def compare_medians(conn, base_set=None, min_count=MIN_COUNT, month_from=None, month_to=None):
+    """Асос тўплам ва лаборатория медианаларини ҳафталар бўйича солиштириш
+
+    Фақат асос тўпламдаги ҳафталар; 'used' - лаборатория медианаси янги тўпламга
+    олинадими (натижалар сони min_count дан кам эмас).
+    """
+    base_set = base_set or median_sets.get_active_median_set()
+    lab = week_medians(conn, month_from, month_to)
+    rows = []
+    for trimester, norms in base_set['norms'].items():
+        for parameter, norm in norms.items():
+            for week, entry in sorted(norm['ranges_by_week'].items()):
+                median, count = lab.get((trimester, parameter, int(week)), (None, 0))
+                rows.append({
+                    'trimester': trimester,
+                    'parameter': parameter,
+                    'week': int(week),
+                    'count': count,
+                    'current': entry['median'],
+                    'lab': median,
+                    'ratio': median / entry['median'] if median else None,
+                    'used': count >= min_count,
+                })
+    return rows
+
+def save_median_set(conn, lot, version, directory=median_sets.MEDIAN_SETS_DIR, active=False, base_set=None,
+                    min_count=MIN_COUNT, month_from=None, month_to=None):
+    """Лаборатория медианаларидан янги тўплам файлини ёзиш, (файл йўли, солиштириш жадвали) қайтаради
+
+    Натижалари етарли бўлмаган ҳафталар ва min/max чегаралари асос тўпламдан олинади.
+    """
+    lot, version = str(lot).strip(), str(version).strip()
+    if not lot or not version or '/' in version:
+        raise ValueError(f"Нотўғри лот ёки версия: {lot}/{version}")
+    base_set = base_set or median_sets.get_active_median_set(directory)
+    path = os.path.join(directory, f"lab_{lot}_{version}.json".replace('/', '_'))
+    # Версияланган тўплам қайта ёзилмайди - унга муҳрланган ёзувлар қайта ҳисобланиши мумкин
+    existing = {(ms['lot'], ms['version']) for ms in median_sets.list_median_sets(directory)}
+    if (lot, version) in existing or os.path.exists(path):
+        raise ValueError(f"{lot}/{version} тўплами аллақачон мавжуд")
+
+    rows = compare_medians(conn, base_set, min_count, month_from, month_to)
+    data = {'lot': lot, 'version': version, 'active': bool(active)}
+    for trimester, norms in base_set['norms'].items():
+        data[trimester] = {
+            parameter: {str(week): dict(entry) for week, entry in norm['ranges_by_week'].items()}
+            for parameter, norm in norms.items()
+        }
+    for row in rows:
+        if row['used']:
+            data[row['trimester']][row['parameter']][str(row['week'])]['median'] = round(row['lab'], 4)
+
+    # Реестр файлни mtime бўйича қайта ўқийди - ярим ёзилган файл кўринмаслиги учун
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(temporary, path)
+    median_sets.refresh(directory, force=True)
+    return path, rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Лаборатория популяциясидан медиана тўплами")
+    parser.add_argument('--lot', required=True, help="Янги тўплам лоти")
+    parser.add_argument('--version', required=True, help="Янги тўплам версияси")
+    parser.add_argument('--from', dest='month_from', help="Бошланғич ой (ЙЙЙЙ-ОО)")
+    parser.add_argument('--to', dest='month_to', help="Охирги ой (ЙЙЙЙ-ОО)")
+    parser.add_argument('--min-count', type=int, default=MIN_COUNT, help="Ҳафта учун энг кам натижалар сони")
+    parser.add_argument('--active', action='store_true', help="Янги тўпламни фаол қилиш")
+    parser.add_argument('--db', default=patient_db.DEFAULT_DB_PATH)
+    parser.add_argument('--dir', default=median_sets.MEDIAN_SETS_DIR, help="Медиана тўпламлари каталоги")
+    args = parser.parse_args(argv)
+
+    with patient_db.database(args.db) as conn:
+        path, rows = save_median_set(conn, args.lot, args.version, args.dir, args.active,
+                                     min_count=args.min_count, month_from=args.month_from, month_to=args.month_to)
+    for row in rows:
+        lab = f"{row['lab']:.4g} ({row['ratio']:.2f})" if row['lab'] else "-"
+        print(f"{row['trimester']:6} {row['parameter']:14} {row['week']:3}  n={row['count']:<6} "
+              f"{row['current']:<10g} -> {lab}{'' if row['used'] else '  (асос қиймати)'}")
+    print(f"✅ {path}: {sum(row['used'] for row in rows)} / {len(rows)} ҳафта медианаси янгиланди")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,20 @@
+# labels.py - Синдромлар ва аналитларнинг кўрсатиладиган номлари, хавфни 1:N кўриниши
+# Streamlit'сиз: саҳифалар (charts.py, ui_common.py орқали) ва ҳисобот процесслари
+# (reports.py) учун умумий
+
+SYNDROME_LABELS = {
+    'downs': 'Даун',
+    'edwards': 'Эдвардс',
+    'patau': 'Патау',
+    'turner': 'Тернер',
+    'ntd': 'НТД',
+}
+
+ANALYTE_LABELS = {
+    'nt': 'NT', 'papp_a': 'PAPP-A', 'free_beta_hcg': 'Free β-hCG',
+    'afp': 'AFP', 'total_hcg': 'Total hCG', 'ue3': 'uE3',
+}
+
+def format_risk(risk_value):
+    """Хавфни 1:N кўринишида чиқариш"""
+    return f"1:{int(1/risk_value)}" if risk_value and risk_value > 0 else "1:∞"
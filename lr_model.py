@@ -0,0 +1,182 @@
+# lr_model.py - Ўхшашлик нисбати (likelihood ratio) хавф модели
+# Маркерларнинг log10(MoM) қийматлари касал ва соғлом ҳомиладорликларда кўп
+# ўлчовли Гаусс тақсимотига эга деб олинади. Хавф = ёш хавфи (априор) x LR.
+#
+# Ҳар бир синдром ва мавжуд маркерлар тўплами (маска) учун тескари ковариация
+# матрицалари ва детерминантлар модул юкланганда бир марта ҳисобланади;
+# баҳолаш - маска гуруҳлари бўйича матрица кўпайтмаси (1M намуна - бир неча сония)
+#
+# Параметрлар адабиётдаги тахминий қийматлар (медиана MoM, log10 SD,
+# корреляциялар); лаборатория ўз популяциясида текшириши керак
+
+import numpy as np
+
+from scoring import AGE_SYNDROMES, BASE_RISKS, SYNDROMES, _optional_mom, get_age_multiplier_batch
+
+# Хавф модели версияси (параметрлар ўзгарса оширилади)
+LR_MODEL_VERSION = "lr-1"
+
+MARKERS = ('nt', 'papp_a', 'free_beta_hcg', 'afp', 'total_hcg', 'ue3')
+
+# MoM чегаралари: четдаги қийматлар LR'ни ҳаддан ташқари оширмаслиги учун кесилади
+MOM_TRUNCATION = {
+    'nt': (0.5, 8.0),
+    'papp_a': (0.12, 4.0),
+    'free_beta_hcg': (0.2, 5.0),
+    'afp': (0.5, 2.5),
+    'total_hcg': (0.25, 4.0),
+    'ue3': (0.5, 2.0),
+}
+
+# Соғлом ҳомиладорлик: медиана MoM = 1, log10 SD
+UNAFFECTED_SD = {
+    'nt': 0.10, 'papp_a': 0.24, 'free_beta_hcg': 0.26,
+    'afp': 0.14, 'total_hcg': 0.24, 'ue3': 0.12,
+}
+
+# Касал ҳомиладорлик: маркер -> (медиана MoM, log10 SD); синдромда йўқ маркер LR'га кирмайди
+AFFECTED_PARAMETERS = {
+    'downs': {
+        'nt': (2.0, 0.23), 'papp_a': (0.45, 0.30), 'free_beta_hcg': (2.0, 0.28),
+        'afp': (0.75, 0.15), 'total_hcg': (2.0, 0.25), 'ue3': (0.72, 0.14),
+    },
+    'edwards': {
+        'nt': (2.0, 0.25), 'papp_a': (0.18, 0.30), 'free_beta_hcg': (0.27, 0.32),
+        'afp': (0.65, 0.18), 'total_hcg': (0.32, 0.30), 'ue3': (0.43, 0.18),
+    },
+    'patau': {
+        'nt': (2.2, 0.25), 'papp_a': (0.25, 0.30), 'free_beta_hcg': (0.50, 0.30),
+    },
+    'turner': {
+        'nt': (4.0, 0.30), 'papp_a': (0.50, 0.30), 'free_beta_hcg': (1.10, 0.30),
+    },
+    'ntd': {
+        'afp': (3.8, 0.22),
+    },
+}
+
+# Маркерлар орасидаги корреляциялар (касал ва соғлом учун умумий)
+CORRELATIONS = {
+    ('nt', 'papp_a'): 0.05,
+    ('nt', 'free_beta_hcg'): 0.05,
+    ('papp_a', 'free_beta_hcg'): 0.15,
+    ('papp_a', 'afp'): 0.15,
+    ('papp_a', 'total_hcg'): 0.15,
+    ('papp_a', 'ue3'): 0.20,
+    ('free_beta_hcg', 'afp'): 0.05,
+    ('free_beta_hcg', 'total_hcg'): 0.40,
+    ('afp', 'total_hcg'): 0.15,
+    ('afp', 'ue3'): 0.25,
+    ('total_hcg', 'ue3'): -0.05,
+}
+
+# ==================== МАТРИЦАЛАР ====================
+
+def _correlation_matrix():
+    matrix = np.eye(len(MARKERS))
+    for (a, b), r in CORRELATIONS.items():
+        i, j = MARKERS.index(a), MARKERS.index(b)
+        matrix[i, j] = matrix[j, i] = r
+    return matrix
+
+def _distribution(means, sds):
+    """(ўрта қийматлар, ковариация) log10 MoM учун"""
+    sds = np.asarray(sds, dtype=float)
+    return np.asarray(means, dtype=float), _correlation_matrix() * np.outer(sds, sds)
+
+def _syndrome_distributions(syndrome):
+    """Синдром учун (маркерлар маскаси, касал тақсимоти, соғлом тақсимоти)"""
+    parameters = AFFECTED_PARAMETERS[syndrome]
+    markers = np.array([marker in parameters for marker in MARKERS])
+    affected = _distribution(
+        [np.log10(parameters[m][0]) if m in parameters else 0.0 for m in MARKERS],
+        [parameters[m][1] if m in parameters else UNAFFECTED_SD[m] for m in MARKERS]
+    )
+    unaffected = _distribution(np.zeros(len(MARKERS)), [UNAFFECTED_SD[m] for m in MARKERS])
+    return markers, affected, unaffected
+
+def _precompute(syndrome):
+    """Ҳар бир маркерлар маскаси (0..2^6-1) учун тескари ковариациялар ва log LR ўзгармаси
+
+    Гаусс тақсимотининг маргинали - ковариациянинг мос қатор/устунлари, шунинг
+    учун йўқ маркерлар шунчаки матрицадан олиб ташланади.
+    """
+    markers, (mean_a, cov_a), (mean_u, cov_u) = _syndrome_distributions(syndrome)
+    tables = {}
+    for mask in range(1, 2 ** len(MARKERS)):
+        present = np.array([bool(mask >> i & 1) for i in range(len(MARKERS))])
+        if not present.any() or (present & ~markers).any():
+            continue
+        index = np.flatnonzero(present)
+        sub_a, sub_u = cov_a[np.ix_(index, index)], cov_u[np.ix_(index, index)]
+        tables[mask] = {
+            'index': index,
+            'mean_a': mean_a[index],
+            'mean_u': mean_u[index],
+            'inv_a': np.linalg.inv(sub_a),
+            'inv_u': np.linalg.inv(sub_u),
+            # log LR = -0.5 * (d_a' Σa⁻¹ d_a - d_u' Σu⁻¹ d_u) + constant
+            'constant': -0.5 * (np.linalg.slogdet(sub_a)[1] - np.linalg.slogdet(sub_u)[1]),
+        }
+    return markers, tables
+
+LR_TABLES = {syndrome: _precompute(syndrome) for syndrome in SYNDROMES}
+
+# ==================== БАҲОЛАШ ====================
+
+def log_mom_matrix(moms):
+    """MoM массивлари (MARKERS тартибида) -> кесилган log10 MoM матрицаси ва мавжудлик маскаси"""
+    values = np.column_stack(moms)
+    available = ~np.isnan(values) & (values > 0)
+    low = np.array([MOM_TRUNCATION[m][0] for m in MARKERS])
+    high = np.array([MOM_TRUNCATION[m][1] for m in MARKERS])
+    log_moms = np.log10(np.clip(np.where(available, values, 1.0), low, high))
+    return log_moms, available
+
+def likelihood_ratios(syndrome, log_moms, available):
+    """Синдром учун ҳар бир намунанинг LR'и (маркерлари йўқ намуналарда 1.0)"""
+    markers, tables = LR_TABLES[syndrome]
+    masks = (available & markers) @ (1 << np.arange(len(MARKERS)))
+    log_lr = np.zeros(len(log_moms))
+    for mask in np.unique(masks):
+        if mask == 0:
+            continue
+        table = tables[int(mask)]
+        rows = masks == mask
+        x = log_moms[np.ix_(rows, table['index'])]
+        d_a, d_u = x - table['mean_a'], x - table['mean_u']
+        log_lr[rows] = table['constant'] - 0.5 * (
+            ((d_a @ table['inv_a']) * d_a).sum(axis=1) - ((d_u @ table['inv_u']) * d_u).sum(axis=1)
+        )
+    return np.exp(log_lr)
+
+def _posterior(prior, likelihood_ratio):
+    odds = prior / (1 - prior) * likelihood_ratio
+    return odds / (1 + odds)
+
+def calculate_syndrome_risks_lr_batch(age, nt_mom, papp_mom, hcg_mom, afp_mom=None, total_hcg_mom=None,
+                                      ue3_mom=None):
+    """LR модели бўйича хавфлар (calculate_syndrome_risks_batch билан бир хил аргумент ва натижа)
+
+    NaN ёки 0 MoM - "маркер йўқ", у LR'га кирмайди. Априор хавф - асосий хавф
+    x ёш кўпайтирувчиси (қоидалар модели билан бир хил), НТД учун ёшсиз.
+    """
+    age = np.asarray(age, dtype=float)
+    shape = np.broadcast_shapes(
+        age.shape, *(np.shape(v) for v in (nt_mom, papp_mom, hcg_mom, afp_mom, total_hcg_mom, ue3_mom)
+                     if v is not None)
+    )
+    age = np.broadcast_to(age, shape)
+    moms = [_optional_mom(v, shape).ravel() for v in (nt_mom, papp_mom, hcg_mom, afp_mom, total_hcg_mom, ue3_mom)]
+    log_moms, available = log_mom_matrix(moms)
+
+    age_risk = {syndrome: get_age_multiplier_batch(age, syndrome) for syndrome in AGE_SYNDROMES}
+    risks = {}
+    for syndrome in SYNDROMES:
+        if syndrome in age_risk:
+            prior = BASE_RISKS[syndrome] * age_risk[syndrome]
+        else:
+            prior = np.full(shape, BASE_RISKS[syndrome])
+        risks[syndrome] = _posterior(prior, likelihood_ratios(syndrome, log_moms, available).reshape(shape))
+    risks['age_risk'] = age_risk
+    return risks
@@ -0,0 +1,168 @@
+# median_sets.py - Реагент лотлари бўйича версияланган медиана тўпламлари реестри
+# median_sets/ каталогидаги JSON ва CSV файллар юкланади, хотирада
+# (аналит, лот, версия) бўйича сақланади ва файл mtime ўзгарса қайта юкланади
+#
+# JSON формати:
+#   {"lot": "2024-A", "version": "2", "active": true,
+#    "first": {"PAPP_A": {"10": {"median": 1.0, "min": 0.4, "max": 3.0}, ...}, ...},
+#    "second": {"AFP": {"15": {"median": 30.0}, ...}, ...}}
+# CSV формати (бир файлда бир нечта тўплам бўлиши мумкин):
+#   lot,version,trimester,analyte,week,median[,min,max]
+
+import copy
+import csv
+import json
+import os
+import threading
+import time
+
+from reference_tables import make_median_set
+from scoring import DEFAULT_MEDIAN_SET
+
+MEDIAN_SETS_DIR = "median_sets"
+
+# Каталог кўпи билан шунча сонияда бир марта текширилади
+RESCAN_INTERVAL = 2.0
+
+_lock = threading.Lock()
+_files = {}        # файл йўли -> (mtime, [(лот, версия), ...])
+_sets = {}         # (лот, версия) -> медиана тўплами
+_active = {}       # файл йўли -> (лот, версия), "active": true белгиланганлар
+_last_scan = {'directory': None, 'time': 0.0}
+
+def _merge_with_builtin(ranges):
+    """Файлда бўлмаган аналитлар учун ўрнатилган DELFIA нормалари ишлатилади"""
+    norms = {}
+    for trimester, builtin in DEFAULT_MEDIAN_SET['norms'].items():
+        norms[trimester] = dict(builtin)
+        for analyte, ranges_by_week in ranges.get(trimester, {}).items():
+            base = copy.deepcopy(builtin.get(analyte, {}))
+            base['ranges_by_week'] = ranges_by_week
+            norms[trimester][analyte] = base
+    return norms
+
+def _week_entry(median, low=None, high=None):
+    entry = {'median': float(median)}
+    if low not in (None, ''):
+        entry['min'] = float(low)
+    if high not in (None, ''):
+        entry['max'] = float(high)
+    return entry
+
+def _parse_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    ranges = {}
+    for trimester in ('first', 'second'):
+        for analyte, weeks in data.get(trimester, {}).items():
+            ranges.setdefault(trimester, {})[analyte] = {
+                int(week): _week_entry(v['median'], v.get('min'), v.get('max')) if isinstance(v, dict)
+                else _week_entry(v)
+                for week, v in weeks.items()
+            }
+    median_set = make_median_set(data['lot'], data['version'], _merge_with_builtin(ranges), source=path)
+    return [(median_set, bool(data.get('active')))]
+
+def _parse_csv(path):
+    ranges_by_set = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            key = (row['lot'].strip(), row['version'].strip())
+            trimester = row['trimester'].strip()
+            analyte = row['analyte'].strip().upper()
+            ranges_by_set.setdefault(key, {}).setdefault(trimester, {}).setdefault(analyte, {})[
+                int(row['week'])
+            ] = _week_entry(row['median'], row.get('min'), row.get('max'))
+
+    return [(make_median_set(lot, version, _merge_with_builtin(ranges), source=path), False)
+            for (lot, version), ranges in ranges_by_set.items()]
+
+def _load_file(path):
+    return _parse_json(path) if path.endswith('.json') else _parse_csv(path)
+
+def refresh(directory=MEDIAN_SETS_DIR, force=False):
+    """Каталогни текшириб, янги ёки ўзгарган файлларни қайта юклаш
+
+    Ўзгармаган файллар қайта ўқилмайди; ўчирилган файлларнинг тўпламлари
+    реестрдан олиб ташланади. Юклашда хатолик бўлган файл ўтказиб юборилади.
+    """
+    now = time.monotonic()
+    if not force and _last_scan['directory'] == directory and now - _last_scan['time'] < RESCAN_INTERVAL:
+        return
+
+    with _lock:
+        seen = set()
+        if os.path.isdir(directory):
+            for entry in os.scandir(directory):
+                if not entry.name.endswith(('.json', '.csv')):
+                    continue
+                path = entry.path
+                seen.add(path)
+                mtime = entry.stat().st_mtime
+                if path in _files and _files[path][0] == mtime:
+                    continue
+                try:
+                    loaded = _load_file(path)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Медиана файлини ўқишда хатолик ({path}): {e}")
+                    continue
+                _forget(path)
+                keys = []
+                for median_set, active in loaded:
+                    key = (median_set['lot'], median_set['version'])
+                    _sets[key] = median_set
+                    keys.append(key)
+                    if active:
+                        _active[path] = key
+                _files[path] = (mtime, keys)
+
+        for path in [p for p in _files if p not in seen]:
+            _forget(path)
+            del _files[path]
+
+        _last_scan.update(directory=directory, time=now)
+
+def _forget(path):
+    for key in _files.get(path, (None, []))[1]:
+        _sets.pop(key, None)
+    _active.pop(path, None)
+
+def list_median_sets(directory=MEDIAN_SETS_DIR):
+    """Барча тўпламлар: аввал ўрнатилган, кейин лот ва версия бўйича"""
+    refresh(directory)
+    return [DEFAULT_MEDIAN_SET] + [_sets[key] for key in sorted(_sets)]
+
+def get_median_set(lot=None, version=None, directory=MEDIAN_SETS_DIR):
+    """Лот ва версия бўйича тўплам; кўрсатилмаса - фаол тўплам"""
+    refresh(directory)
+    if lot is None:
+        return get_active_median_set(directory)
+    if (lot, version) == (DEFAULT_MEDIAN_SET['lot'], DEFAULT_MEDIAN_SET['version']):
+        return DEFAULT_MEDIAN_SET
+    return _sets[(str(lot), str(version))]
+
+def find_median_set(label, directory=MEDIAN_SETS_DIR):
+    """"лот/версия" белгиси бўйича тўплам (ёзувдаги муҳр бўйича қайта ҳисоблаш учун)"""
+    if not label:
+        return DEFAULT_MEDIAN_SET
+    lot, _, version = label.rpartition('/')
+    return get_median_set(lot, version, directory)
+
+def get_active_median_set(directory=MEDIAN_SETS_DIR):
+    """"active": true белгиланган энг янги файл тўплами, бўлмаса ўрнатилган DELFIA"""
+    refresh(directory)
+    with _lock:
+        candidates = [(_files[path][0], key) for path, key in _active.items() if key in _sets]
+    if not candidates:
+        return DEFAULT_MEDIAN_SET
+    return _sets[max(candidates)[1]]
+
+def get_median_table(analyte, lot, version, directory=MEDIAN_SETS_DIR):
+    """(аналит, лот, версия) бўйича кунлик медиана жадвали"""
+    median_set = get_median_set(lot, version, directory)
+    for tables in median_set['tables'].values():
+        if analyte in tables:
+            return tables[analyte]
+    raise KeyError(analyte)
+
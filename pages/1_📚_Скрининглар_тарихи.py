@@ -0,0 +1,116 @@
+# Скрининглар тарихи - базадан саҳифалаб ўқиш (keyset пагинация) ва бемор қидируви
+# Исм/ID бўйича қидирув FTS5 индексида; сессияда фақат жорий саҳифа ва танланган бемор сақланади
+
+import streamlit as st
+import pandas as pd
+
+import patient_db
+from scoring import RISK_CATEGORY_BOUNDS, get_risk_category
+from ui_common import format_risk, init_database
+
+st.set_page_config(
+    page_title="Скрининглар тарихи - DELFIA Revvity",
+    page_icon="📚",
+    layout="wide"
+)
+
+st.markdown("## 📚 Скрининглар тарихи")
+
+db_path = init_database()
+
+SCREENING_TYPES = {"Ҳаммаси": None, "Биринчи скрининг": "first", "Иккиламчи скрининг": "second"}
+
+# ФИЛЬТРЛАР
+query = st.text_input("🔎 Бемор исми ёки ID", placeholder="Масалан: Қодир, mohira, GEN-2026",
+                      help="Ҳар бир сўзнинг боши бўйича қидирилади, кирилл ва лотин, катта-кичик ҳарф фарқсиз")
+col_f1, col_f2, col_f3, col_f4 = st.columns([3, 2, 2, 1])
+with col_f1:
+    date_range = st.date_input("Сана оралиғи", value=(), format="DD.MM.YYYY")
+with col_f2:
+    screening_label = st.selectbox("Скрининг тури", list(SCREENING_TYPES))
+with col_f3:
+    risk_category = st.selectbox("Хавф категорияси", ["Ҳаммаси"] + list(RISK_CATEGORY_BOUNDS))
+with col_f4:
+    page_size = st.selectbox("Саҳифада", [20, 50, 100])
+
+date_from = date_range[0] if len(date_range) > 0 else None
+date_to = date_range[1] if len(date_range) > 1 else date_from
+filters = {
+    'date_from': date_from,
+    'date_to': date_to,
+    'screening_type': SCREENING_TYPES[screening_label],
+    'risk_category': None if risk_category == "Ҳаммаси" else risk_category,
+    'query': query.strip() or None,
+}
+
+# Фильтр ўзгарса - биринчи саҳифага қайтиш
+if st.session_state.get('history_filters') != (filters, page_size):
+    st.session_state.history_filters = (filters, page_size)
+    st.session_state.history_cursors = [None]
+
+cursors = st.session_state.history_cursors
+with patient_db.database(db_path) as conn:
+    page, next_cursor = patient_db.fetch_screenings_page(conn, page_size, before=cursors[-1], **filters)
+st.session_state.history_page = page
+
+# САҲИФА
+if not page:
+    st.info("Ёзувлар топилмади")
+else:
+    table = pd.DataFrame(page)
+    table['max_risk'] = table['max_risk'].map(format_risk)
+    table['category'] = [get_risk_category(row['max_risk'])[0] for row in page]
+    table['timestamp'] = table['timestamp'].str.slice(0, 16).str.replace('T', ' ')
+    st.dataframe(
+        table.rename(columns={
+            'id': 'ID', 'name': 'Бемор', 'age': 'Ёши', 'screening_type': 'Скрининг',
+            'gestational_age': 'Ҳафта', 'max_risk': 'Энг юқори хавф',
+            'category': 'Категория', 'timestamp': 'Сана'
+        }).drop(columns=['seq']),
+        use_container_width=True,
+        hide_index=True
+    )
+
+col_prev, col_page, col_next = st.columns([1, 2, 1])
+with col_prev:
+    if len(cursors) > 1 and st.button("◀ Олдинги", use_container_width=True):
+        cursors.pop()
+        st.rerun()
+with col_page:
+    st.markdown(f"<p style='text-align: center;'>{len(cursors)}-саҳифа</p>", unsafe_allow_html=True)
+with col_next:
+    if next_cursor is not None and st.button("Кейинги ▶", use_container_width=True):
+        cursors.append(next_cursor)
+        st.rerun()
+
+# ТАНЛАНГАН БЕМОР
+if page:
+    st.markdown("### 👤 Бемор маълумотлари")
+    options = {f"{row['id']} - {row['name']} ({row['timestamp'][:10]})": row['seq'] for row in page}
+    selected = st.selectbox("Ёзувни танланг", list(options))
+    with patient_db.database(db_path) as conn:
+        st.session_state.current_patient = patient_db.get_screening(conn, options[selected])
+
+    patient = st.session_state.current_patient
+    col_i1, col_i2, col_i3, col_i4 = st.columns(4)
+    with col_i1:
+        st.metric("👤 Бемор", patient.get('name', ''))
+    with col_i2:
+        st.metric("🎂 Ёши", f"{patient.get('age')} йош")
+    with col_i3:
+        st.metric("🤰 Хомилалик", f"{patient.get('gestational_age')} ҳафта")
+    with col_i4:
+        st.metric("📊 BMI", f"{patient['bmi']:.1f}" if patient.get('bmi') is not None else "—")
+
+    risks = patient.get('risks', {})
+    risk_columns = st.columns(5)
+    for column, (syndrome, label) in zip(risk_columns, [
+        ('downs', 'Даун'), ('edwards', 'Эдвардс'), ('patau', 'Патау'), ('turner', 'Тернер'), ('ntd', 'НТД')
+    ]):
+        with column:
+            st.metric(label, format_risk(risks.get(syndrome)), get_risk_category(risks.get(syndrome, 0))[0],
+                      delta_color="off")
+
+    st.caption(f"🧪 Медиана тўплами: {patient.get('median_set') or 'DELFIA/builtin'}")
+    with st.expander("MoM параметрлари"):
+        st.json(patient.get('parameters', {}))
@@ -0,0 +1,91 @@
+# Фон вазифалари - қайта ҳисоблаш, экспорт ва ҳисоботларни навбатга қўйиш, ҳолатини кузатиш
+# Ҳисоблар алоҳида worker жараёнида; саҳифа ҳолатни базадан сўраб туради
+
+from datetime import date
+
+import streamlit as st
+
+import jobs
+import median_sets
+import patient_db
+import reports
+from reference_tables import median_set_label
+from ui_common import RISK_ENGINE_LABELS, init_database, refresh_while_active, show_job, submit_job
+
+st.set_page_config(
+    page_title="Фон вазифалари - DELFIA Revvity",
+    page_icon="⚙️",
+    layout="wide"
+)
+
+st.markdown("## ⚙️ Фон вазифалари")
+
+db_path = init_database()
+
+# ЯНГИ ВАЗИФА
+col_rescore, col_export, col_archive = st.columns(3)
+with col_rescore:
+    st.markdown("#### 🔁 Қайта ҳисоблаш")
+    labels = [median_set_label(ms) for ms in median_sets.list_median_sets()]
+    active = median_set_label(median_sets.get_active_median_set())
+    rescore_set = st.selectbox("Медиана тўплами", labels, index=labels.index(active) if active in labels else 0)
+    with patient_db.database(db_path) as conn:
+        stored_sets = patient_db.stored_median_sets(conn)
+    source_set = st.selectbox(
+        "Қайси ёзувлар", [None] + stored_sets,
+        format_func=lambda label: "Барча скрининглар" if label is None else f"{label} билан ҳисобланганлар"
+    )
+    engine = st.selectbox("Хавф модели", list(RISK_ENGINE_LABELS), format_func=RISK_ENGINE_LABELS.get,
+                          help="Натижалар сақланган хавфлар билан солиштирилади")
+    restart = st.checkbox("Бошидан бошлаш (аввалги натижаларни ўчириш)")
+    if st.button("🔁 Скринингларни қайта ҳисоблаш", use_container_width=True):
+        submit_job('rescore', {
+            'median_set': rescore_set,
+            'from_median_set': source_set,
+            'engine': engine,
+            'restart': restart,
+            'report': jobs.job_path(f"rescore_{engine}_{rescore_set.replace('/', '_')}"
+                                    f"{'_from_' + source_set.replace('/', '_') if source_set else ''}.csv"),
+        })
+with col_export:
+    st.markdown("#### 📤 CSV экспорт")
+    st.caption("Барча скрининглар ва синдромлар хавфлари битта CSV файлда")
+    if st.button("📤 Экспорт қилиш", use_container_width=True):
+        submit_job('export', {'output': jobs.job_path("screenings.csv")})
+with col_archive:
+    st.markdown("#### 🗃️ Устунли архив")
+    st.caption("Ойлар бўйича Arrow файллари; ўзгармаган ойлар қайта ёзилмайди")
+    overwrite = st.checkbox("Барча ойларни қайта ёзиш")
+    if st.button("🗃️ Архивлаш", use_container_width=True):
+        submit_job('archive', {'overwrite': overwrite})
+
+st.markdown("#### 🧾 Беморлар ҳисоботлари")
+col_r1, col_r2, col_r3 = st.columns([2, 1, 1])
+with col_r1:
+    report_dates = st.date_input("Сана оралиғи", value=(date.today(), date.today()))
+with col_r2:
+    report_format = st.selectbox("Формат", reports.report_formats(), format_func=str.upper,
+                                 help="PDF учун weasyprint ўрнатилган бўлиши керак")
+with col_r3:
+    st.markdown("<br>", unsafe_allow_html=True)
+    if st.button("🧾 Ҳисоботларни тайёрлаш", use_container_width=True, disabled=len(report_dates) != 2):
+        date_from, date_to = report_dates
+        submit_job('reports', {
+            'date_from': date_from.isoformat(),
+            'date_to': date_to.isoformat(),
+            'format': report_format,
+            'output': jobs.job_path(f"reports_{date_from}_{date_to}.zip"),
+        })
+
+# ВАЗИФАЛАР
+st.markdown("### 📋 Охирги вазифалар")
+with patient_db.database(db_path) as conn:
+    st.session_state.jobs = jobs.list_jobs(conn)
+
+if not st.session_state.jobs:
+    st.info("Вазифалар йўқ")
+for job in st.session_state.jobs:
+    show_job(job)
+    st.divider()
+
+refresh_while_active(st.session_state.jobs)
@@ -0,0 +1,186 @@
+# Сифат назорати - скрин-позитив улуши ва медиана MoM дрейфи
+# Фақат агрегат жадваллар (aggregates.py) ва устунли архив (archive.py) ўқилади,
+# тарих ҳажмига боғлиқ эмас
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+import aggregates
+import archive
+import lab_medians
+import patient_db
+from charts import SYNDROME_LABELS
+from ui_common import ANALYTE_LABELS, RISK_ENGINE_LABELS, init_database
+
+st.set_page_config(
+    page_title="Сифат назорати - DELFIA Revvity",
+    page_icon="📊",
+    layout="wide"
+)
+
+st.markdown("## 📊 Сифат назорати")
+
+db_path = init_database()
+
+# Медиана MoM шу оралиқдан чиқса - референс медианаларни текшириш керак
+MOM_DRIFT_LIMITS = (0.9, 1.1)
+
+SCREENING_TYPES = {"Ҳаммаси": None, "Биринчи скрининг": "first", "Иккиламчи скрининг": "second"}
+
+with patient_db.database(db_path) as conn:
+    months = aggregates.list_months(conn)
+
+if not months:
+    st.info("Ҳали сақланган скрининглар йўқ")
+    st.stop()
+
+# ФИЛЬТРЛАР
+col_f1, col_f2, col_f3 = st.columns([3, 2, 2])
+with col_f1:
+    if len(months) > 1:
+        month_from, month_to = st.select_slider("Ойлар", options=months, value=(months[0], months[-1]))
+    else:
+        month_from = month_to = months[0]
+        st.markdown(f"**Ой:** {months[0]}")
+with col_f2:
+    screening_label = st.selectbox("Скрининг тури", list(SCREENING_TYPES))
+with col_f3:
+    positive_category = st.selectbox(
+        "Скрин-позитив чегараси (шу категория ва юқори)", aggregates.RISK_CATEGORIES,
+        index=aggregates.RISK_CATEGORIES.index(aggregates.DEFAULT_POSITIVE_CATEGORY)
+    )
+
+period = {'month_from': month_from, 'month_to': month_to}
+with patient_db.database(db_path) as conn:
+    by_month = pd.DataFrame(aggregates.screen_positive_rates(
+        conn, 'month', positive_category, screening_type=SCREENING_TYPES[screening_label], **period))
+    by_week = pd.DataFrame(aggregates.screen_positive_rates(
+        conn, 'week', positive_category, screening_type=SCREENING_TYPES[screening_label], **period))
+    mom_by_month = pd.DataFrame(aggregates.mom_medians(conn, 'month', **period))
+    mom_by_week = pd.DataFrame(aggregates.mom_medians(conn, 'week', **period))
+
+# СКРИН-ПОЗИТИВ УЛУШИ
+st.markdown("### 🎯 Скрин-позитив улуши")
+if by_month.empty:
+    st.info("Танланган оралиқда ёзувлар йўқ")
+else:
+    for frame in (by_month, by_week):
+        frame['Синдром'] = frame['syndrome'].map(SYNDROME_LABELS)
+        frame['Улуш (%)'] = frame['rate'] * 100
+
+    totals = by_month.groupby('syndrome')[['total', 'positive']].sum()
+    metric_columns = st.columns(len(totals))
+    for column, (syndrome, row) in zip(metric_columns, totals.iterrows()):
+        with column:
+            st.metric(SYNDROME_LABELS[syndrome], f"{row['positive'] / row['total'] * 100:.1f}%",
+                      f"{row['positive']} / {row['total']}", delta_color="off")
+
+    col_c1, col_c2 = st.columns(2)
+    with col_c1:
+        fig = px.line(by_month, x='month', y='Улуш (%)', color='Синдром', markers=True,
+                      title="Ойлар бўйича", labels={'month': 'Ой'})
+        fig.update_layout(height=380)
+        st.plotly_chart(fig, use_container_width=True)
+    with col_c2:
+        fig = px.bar(by_week[by_week['week'] >= 0], x='week', y='Улуш (%)', color='Синдром', barmode='group',
+                     title="Гестация ҳафтаси бўйича", labels={'week': 'Ҳафта'})
+        fig.update_layout(height=380)
+        st.plotly_chart(fig, use_container_width=True)
+
+# МЕДИАНА MoM ДРЕЙФИ
+st.markdown("### 🧪 Медиана MoM дрейфи")
+if mom_by_month.empty:
+    st.info("Танланган оралиқда MoM маълумотлари йўқ")
+else:
+    low, high = MOM_DRIFT_LIMITS
+    for frame in (mom_by_month, mom_by_week):
+        frame['Аналит'] = frame['analyte'].map(ANALYTE_LABELS)
+
+    col_m1, col_m2 = st.columns(2)
+    with col_m1:
+        fig = px.line(mom_by_month, x='month', y='median', color='Аналит', markers=True,
+                      title="Медиана MoM (ойлар бўйича)", labels={'month': 'Ой', 'median': 'Медиана MoM'})
+        fig.add_hrect(y0=low, y1=high, fillcolor='green', opacity=0.08, line_width=0)
+        fig.update_layout(height=380)
+        st.plotly_chart(fig, use_container_width=True)
+    with col_m2:
+        fig = px.line(mom_by_week[mom_by_week['week'] >= 0], x='week', y='median', color='Аналит', markers=True,
+                      title="Медиана MoM (ҳафталар бўйича)", labels={'week': 'Ҳафта', 'median': 'Медиана MoM'})
+        fig.add_hrect(y0=low, y1=high, fillcolor='green', opacity=0.08, line_width=0)
+        fig.update_layout(height=380)
+        st.plotly_chart(fig, use_container_width=True)
+
+    latest = mom_by_month[mom_by_month['month'] == mom_by_month['month'].max()]
+    drifted = latest[(latest['median'] < low) | (latest['median'] > high)]
+    for _, row in drifted.iterrows():
+        st.warning(f"⚠️ {row['month']}: {row['Аналит']} медиана MoM = {row['median']:.2f} "
+                   f"({low}-{high} оралиғидан ташқарида, n={row['count']})")
+
+    st.dataframe(
+        mom_by_month.rename(columns={'month': 'Ой', 'count': 'Сон', 'median': 'Медиана MoM',
+                                     'geo_mean': 'Геометрик ўрта', 'log_sd': 'log SD'})
+        .drop(columns=['analyte'])
+        .round(3),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# ЛАБОРАТОРИЯ МЕДИАНАЛАРИ
+st.markdown("### 🧬 Лаборатория медианалари")
+st.caption("Танланган ойлардаги хом натижалар скетчидан ҳафталик медианалар - фаол тўплам билан солиштириш")
+min_count = st.number_input("Ҳафта учун энг кам натижалар сони", min_value=1, value=lab_medians.MIN_COUNT)
+with patient_db.database(db_path) as conn:
+    lab_rows = pd.DataFrame(lab_medians.compare_medians(conn, min_count=min_count, **period))
+
+lab_rows = lab_rows[lab_rows['count'] > 0]
+if lab_rows.empty:
+    st.info("Танланган оралиқда хом натижалар йўқ")
+else:
+    st.dataframe(
+        lab_rows.rename(columns={'trimester': 'Триместр', 'parameter': 'Параметр', 'week': 'Ҳафта',
+                                 'count': 'Сон', 'current': 'Жорий медиана', 'lab': 'Лаборатория медианаси',
+                                 'ratio': 'Нисбат', 'used': 'Олинади'})
+        .round(3),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    col_l1, col_l2, col_l3 = st.columns([2, 2, 2])
+    with col_l1:
+        new_lot = st.text_input("Янги тўплам лоти", value="LAB")
+    with col_l2:
+        new_version = st.text_input("Версия", value=month_to)
+    with col_l3:
+        make_active = st.checkbox("Фаол қилиш", help="Янги скрининглар MoM'и шу тўплам бўйича ҳисобланади")
+    if st.button("💾 Медиана тўплами сифатида сақлаш", disabled=not lab_rows['used'].any()):
+        try:
+            with patient_db.database(db_path) as conn:
+                path, rows = lab_medians.save_median_set(conn, new_lot, new_version, active=make_active,
+                                                         min_count=min_count, **period)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.success(f"✅ {new_lot.strip()}/{new_version.strip()} тўплами сақланди: {path} "
+                       f"({sum(row['used'] for row in rows)} ҳафта медианаси янгиланди)")
+
+# АРХИВ БЎЙИЧА ХАВФ МОДЕЛЛАРИ
+st.markdown("### 🗃️ Архив бўйича хавф моделлари")
+st.caption("Устунли архивдаги MoM'лар танланган модел билан қайта ҳисобланади (memory-map, JSON ўқилмайди)")
+if not archive.list_archive():
+    st.info("Архив ҳали ёзилмаган - \"⚙️ Фон вазифалари\" саҳифасида архивланг")
+else:
+    archive_engine = st.selectbox("Хавф модели", list(RISK_ENGINE_LABELS), format_func=RISK_ENGINE_LABELS.get,
+                                  index=len(RISK_ENGINE_LABELS) - 1)
+    categories = pd.DataFrame(archive.compare_risk_categories(
+        engine=archive_engine, screening_type=SCREENING_TYPES[screening_label], **period))
+    if not categories['stored'].any():
+        st.info("Танланган оралиқ архивда йўқ")
+    else:
+        categories['Синдром'] = categories['syndrome'].map(SYNDROME_LABELS)
+        st.dataframe(
+            categories.pivot_table(index='category', columns='Синдром', values=['stored', 'rescored'], aggfunc='sum',
+                                 sort=False)
+            .rename(columns={'stored': 'Сақланган', 'rescored': RISK_ENGINE_LABELS[archive_engine]}),
+            use_container_width=True
+        )
@@ -0,0 +1,104 @@
+# Тизим - сервер жараёни ҳолати: натижалар кеши (result_cache.py), босқичлар кечикиши (stage_timing.py)
+# Кеш жараён бўйлаб умумий, шунинг учун бу ерда барча сессиялар ҳисоблари кўринади
+
+import streamlit as st
+import pandas as pd
+
+import result_cache
+import stage_timing
+
+st.set_page_config(
+    page_title="Тизим - DELFIA Revvity",
+    page_icon="🛠️",
+    layout="wide"
+)
+
+st.markdown("## 🛠️ Тизим")
+
+CACHE_KIND_LABELS = {
+    'mom': "MoM",
+    'risks': "Синдромлар хавфи",
+    'intervals': "Ноаниқлик оралиқлари",
+}
+
+STAGE_LABELS = {
+    'script': "Бутун скрипт",
+    'css': "CSS (st.markdown)",
+    'db_load': "Базадан ўқиш",
+    'db_save': "Базага ёзиш",
+    'risk': "Хавф ҳисоби",
+    'charts': "Plotly графиклари",
+}
+
+# НАТИЖАЛАР КЕШИ
+st.markdown("### 🗄️ Натижалар кеши")
+st.caption("Бир хил кирувчи қийматлар, медиана тўплами ва хавф модели учун MoM ва хавфлар қайта ҳисобланмайди")
+
+stats = result_cache.stats()
+lookups = stats['hits'] + stats['misses']
+col_s1, col_s2, col_s3, col_s4 = st.columns(4)
+with col_s1:
+    st.metric("Ёзувлар", f"{stats['entries']} / {stats['max_entries']}")
+with col_s2:
+    st.metric("Hit улуши", f"{stats['hits'] / lookups:.0%}" if lookups else "—")
+with col_s3:
+    st.metric("Hit / Miss", f"{stats['hits']} / {stats['misses']}")
+with col_s4:
+    st.metric("Чиқарилган (LRU)", stats['evictions'])
+
+if stats['by_kind']:
+    st.dataframe(
+        pd.DataFrame([
+            {'Ҳисоб': CACHE_KIND_LABELS.get(kind, kind), 'Hit': counters['hits'], 'Miss': counters['misses'],
+             'Hit улуши': counters['hits'] / (counters['hits'] + counters['misses'])}
+            for kind, counters in stats['by_kind'].items()
+        ]).round(3),
+        use_container_width=True,
+        hide_index=True
+    )
+
+col_c1, col_c2, col_c3 = st.columns([2, 1, 1])
+with col_c1:
+    max_entries = st.number_input("Кеш чегараси (ёзувлар)", min_value=1, value=stats['max_entries'], step=1000)
+with col_c2:
+    st.markdown("<br>", unsafe_allow_html=True)
+    if st.button("💾 Чегарани сақлаш", use_container_width=True):
+        result_cache.set_max_entries(max_entries)
+        st.rerun()
+with col_c3:
+    st.markdown("<br>", unsafe_allow_html=True)
+    if st.button("🧹 Кешни тозалаш", use_container_width=True):
+        result_cache.clear(reset_counters=True)
+        st.rerun()
+
+# БОСҚИЧЛАР КЕЧИКИШИ
+st.markdown("### ⏱️ Босқичлар кечикиши")
+st.caption(f"Асосий саҳифа скрипти босқичлари, ҳар бир босқич учун охирги {stage_timing.SAMPLE_SIZE} ўлчов бўйича; "
+           "профиль учун асосий саҳифани ?profile=cprofile (ёки pyinstrument) билан очинг")
+
+stages = stage_timing.snapshot()
+if stages:
+    st.dataframe(
+        pd.DataFrame([
+            {'Босқич': STAGE_LABELS.get(name, name), 'p50 (мс)': values['p50'] * 1000,
+             'p95 (мс)': values['p95'] * 1000, 'Энг кўп (мс)': values['max'] * 1000,
+             'Ўлчовлар': values['count']}
+            for name, values in stages.items()
+        ]).round(2),
+        use_container_width=True,
+        hide_index=True
+    )
+else:
+    st.info("Ҳали ўлчовлар йўқ - асосий саҳифани очинг")
+
+col_t1, col_t2, col_t3 = st.columns([2, 1, 1])
+with col_t1:
+    st.caption(f"Prometheus файли: `{stage_timing.METRICS_FILE}` "
+               f"(ҳар {stage_timing.WRITE_INTERVAL_SECONDS:.0f} сонияда янгиланади)")
+with col_t2:
+    if st.button("📝 Файлни ҳозир ёзиш", use_container_width=True):
+        st.success(f"Ёзилди: {stage_timing.write_metrics()}")
+with col_t3:
+    if st.button("🧹 Ўлчовларни тозалаш", use_container_width=True):
+        stage_timing.reset()
+        st.rerun()
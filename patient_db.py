@@ -0,0 +1,441 @@
+# patient_db.py - Беморлар ва скрининглар учун SQLite маълумотлар базаси
+# WAL режими: бир нечта сессия бир вақтда ёзиши мумкин, ҳар бир ҳисоб битта INSERT
+# JSON тарихдан бир марталик кўчириш (migrate_json) ҳам шу ерда
+#
+# Фойдаланиш:
+#   python patient_db.py migrate genetic_patients_data.json [--db genetic_patients.db]
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    import pysqlite3 as sqlite3  # Streamlit Cloud: янги SQLite версияси
+except ImportError:
+    import sqlite3
+
+import aggregates
+from scoring import RISK_CATEGORY_BOUNDS, SYNDROMES, get_risk_category
+
+DEFAULT_DB_PATH = "genetic_patients.db"
+LEGACY_JSON_PATH = "genetic_patients_data.json"
+
+# Эски базаларга қўшиладиган устунлар (устун -> тури)
+ADDED_COLUMNS = {
+    'median_set': 'TEXT',
+    'episode_id': 'INTEGER',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS screenings (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    name TEXT,
+    age REAL,
+    screening_type TEXT NOT NULL,
+    gestational_age REAL,
+    bmi REAL,
+    max_risk REAL,
+    timestamp TEXT NOT NULL,
+    median_set TEXT,
+    record TEXT NOT NULL,
+    episode_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_screenings_id ON screenings (id);
+CREATE INDEX IF NOT EXISTS idx_screenings_timestamp ON screenings (timestamp, seq);
+CREATE INDEX IF NOT EXISTS idx_screenings_type ON screenings (screening_type, timestamp, seq);
+CREATE INDEX IF NOT EXISTS idx_screenings_max_risk ON screenings (max_risk);
+CREATE INDEX IF NOT EXISTS idx_screenings_median_set ON screenings (median_set);
+CREATE INDEX IF NOT EXISTS idx_screenings_episode ON screenings (episode_id, screening_type, timestamp);
+
+-- Беморлар ва ҳомиладорлик эпизодлари: битта эпизоддаги биринчи ва иккиламчи скрининглар
+-- боғланади (интеграл хавф учун биринчи скрининг MoM'лари қайта киритилмайди)
+CREATE TABLE IF NOT EXISTS patients (
+    patient_id INTEGER PRIMARY KEY,
+    name TEXT,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS screening_episodes (
+    episode_id INTEGER PRIMARY KEY,
+    patient_id INTEGER NOT NULL REFERENCES patients (patient_id),
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_patient ON screening_episodes (patient_id);
+
+-- Қайта ҳисоблаш натижалари: асл ёзув ўзгармайди, янги хавфлар версия бўйича ёнма-ён
+CREATE TABLE IF NOT EXISTS risk_versions (
+    version TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    risks TEXT NOT NULL,
+    max_risk REAL,
+    changed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (version, seq)
+) WITHOUT ROWID;
+
+-- Қайта ҳисоблаш ишлари ва уларнинг текширув нуқтаси (last_seq)
+CREATE TABLE IF NOT EXISTS rescore_runs (
+    version TEXT PRIMARY KEY,
+    median_set TEXT,
+    model_version TEXT,
+    last_seq INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    changed INTEGER NOT NULL DEFAULT 0,
+    started TEXT,
+    finished TEXT
+);
+
+-- Фон вазифалари навбати (jobs.py): import, rescore, export
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    pid INTEGER,
+    created TEXT NOT NULL,
+    started TEXT,
+    finished TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Исм ва ID бўйича қидирув: FTS5 (ташқи контент - screenings), триггер билан янгиланади.
+-- unicode61 - кирилл ва лотин ҳарфлари катта-кичиклигидан қатъи назар; prefix - префикс индекслари
+CREATE VIRTUAL TABLE IF NOT EXISTS screenings_fts USING fts5(
+    name, id,
+    content='screenings', content_rowid='seq',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS screenings_fts_insert AFTER INSERT ON screenings BEGIN
+    INSERT INTO screenings_fts (rowid, name, id) VALUES (new.seq, new.name, new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS screenings_fts_delete AFTER DELETE ON screenings BEGIN
+    INSERT INTO screenings_fts (screenings_fts, rowid, name, id) VALUES ('delete', old.seq, old.name, old.id);
+END;
+"""
+
+# Қидирув индекси версияси (ўзгарса ёки индекс йўқ эски базада бир марта қайта қурилади)
+SEARCH_INDEX_VERSION = 1
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+def connect(path=DEFAULT_DB_PATH):
+    """Базага уланиш (схема жараён давомида бир марта яратилади)"""
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+
+    key = os.path.abspath(path)
+    if key not in _initialized:
+        with _init_lock:
+            if key not in _initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                _add_missing_columns(conn)
+                conn.executescript(SCHEMA)
+                conn.executescript(aggregates.SCHEMA)
+                if get_meta(conn, 'aggregates_version') != str(aggregates.AGGREGATES_VERSION):
+                    # Агрегатлардан олдинги ёки эски тузилишдаги базалар: бир марта тўлиқ қуриш
+                    aggregates.rebuild(conn)
+                    set_meta(conn, 'aggregates_version', str(aggregates.AGGREGATES_VERSION))
+                if get_meta(conn, 'search_index_version') != str(SEARCH_INDEX_VERSION):
+                    with conn:
+                        conn.execute("INSERT INTO screenings_fts (screenings_fts) VALUES ('rebuild')")
+                    set_meta(conn, 'search_index_version', str(SEARCH_INDEX_VERSION))
+                _initialized.add(key)
+    return conn
+
+def _add_missing_columns(conn):
+    """Эски схемадаги screenings жадвалига янги устунларни қўшиш"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(screenings)")}
+    if not existing:
+        return
+    for column, column_type in ADDED_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE screenings ADD COLUMN {column} {column_type}")
+
+@contextmanager
+def database(path=DEFAULT_DB_PATH):
+    """Уланишни очиб, блок охирида ёпиш"""
+    conn = connect(path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def max_risk(risks):
+    """Синдромлар бўйича энг юқори хавф"""
+    return max(risks.get(syndrome, 0.0) for syndrome in SYNDROMES)
+
+def _screening_row(record):
+    return (
+        record['id'],
+        record.get('name'),
+        record.get('age'),
+        record['screening_type'],
+        record.get('gestational_age'),
+        record.get('bmi'),
+        max_risk(record.get('risks', {})),
+        record['timestamp'],
+        record.get('median_set'),
+        json.dumps(record, ensure_ascii=False, separators=(',', ':')),
+        record.get('episode_id'),
+    )
+
+INSERT_SQL = """
+INSERT INTO screenings (id, name, age, screening_type, gestational_age, bmi, max_risk, timestamp, median_set, record,
+                        episode_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _assign_episodes(conn, records):
+    """Эпизодсиз янги ёзувларга эпизод бериш (record['episode_id'] ёзилади)
+
+    first_seq бўлса - боғланган скрининг эпизоди (ва бемори), акс ҳолда янги бемор ва эпизод.
+    """
+    for record in records:
+        if record.get('episode_id') is not None:
+            continue
+        if record.get('first_seq') is not None:
+            record['episode_id'] = _screening_episode(conn, record['first_seq'])
+        else:
+            record['episode_id'] = create_episode(conn, record.get('name'))
+
+def save_screening(conn, record):
+    """Битта скрининг натижасини сақлаш (битта INSERT), қатор рақамини қайтаради
+
+    record['episode_id'] бўлмаса - _assign_episodes бўйича эпизод берилади.
+    """
+    return save_screenings(conn, [record])[0]
+
+def save_screenings(conn, records):
+    """Бир нечта скринингни битта транзакцияда сақлаш, қатор рақамлари рўйхатини қайтаради
+
+    Транзакция бекор бўлса, шу ерда берилган episode_id'лар ёзувлардан олиб ташланади
+    (ёзувни қайта сақлаш мумкин).
+    """
+    unassigned = [record for record in records if record.get('episode_id') is None]
+    try:
+        with conn:
+            _assign_episodes(conn, records)
+            seqs = [conn.execute(INSERT_SQL, _screening_row(record)).lastrowid for record in records]
+            aggregates.update(conn, records)
+    except Exception:
+        for record in unassigned:
+            record['episode_id'] = None
+        raise
+    return seqs
+
+# ==================== БЕМОРЛАР ВА ЭПИЗОДЛАР ====================
+
+def create_episode(conn, name=None):
+    """Янги бемор ва унинг ҳомиладорлик эпизоди, эпизод рақамини қайтаради
+
+    Чақирувчи транзакцияси ичида ишлатилади.
+    """
+    now = datetime.now().isoformat()
+    patient_id = conn.execute("INSERT INTO patients (name, created) VALUES (?, ?)", (name, now)).lastrowid
+    return conn.execute(
+        "INSERT INTO screening_episodes (patient_id, created) VALUES (?, ?)", (patient_id, now)
+    ).lastrowid
+
+def _screening_episode(conn, seq):
+    """Скрининг эпизоди; эпизодсиз эски ёзувга янги бемор ва эпизод (чақирувчи транзакцияси ичида)
+
+    Боғлаш битта шартли UPDATE билан: бошқа уланиш аввалроқ боғлаган бўлса, яратилган
+    эпизод ўчирилади ва мавжуд эпизод қайтарилади (эпизод етим қолмайди).
+    """
+    row = conn.execute("SELECT episode_id, name FROM screenings WHERE seq = ?", (seq,)).fetchone()
+    if row is None:
+        raise ValueError(f"Скрининг топилмади: {seq}")
+    if row[0] is not None:
+        return row[0]
+    episode_id = create_episode(conn, row[1])
+    cursor = conn.execute(
+        "UPDATE screenings SET episode_id = ? WHERE seq = ? AND episode_id IS NULL", (episode_id, seq)
+    )
+    if cursor.rowcount:
+        return episode_id
+    patient_id = conn.execute(
+        "SELECT patient_id FROM screening_episodes WHERE episode_id = ?", (episode_id,)
+    ).fetchone()[0]
+    conn.execute("DELETE FROM screening_episodes WHERE episode_id = ?", (episode_id,))
+    conn.execute("DELETE FROM patients WHERE patient_id = ?", (patient_id,))
+    return conn.execute("SELECT episode_id FROM screenings WHERE seq = ?", (seq,)).fetchone()[0]
+
+def count_screenings(conn, median_set=None):
+    """Сақланган скрининглар сони (median_set - фақат шу тўплам билан ҳисоблангани)"""
+    if median_set is not None:
+        return conn.execute("SELECT COUNT(*) FROM screenings WHERE median_set = ?", (median_set,)).fetchone()[0]
+    return conn.execute("SELECT COUNT(*) FROM screenings").fetchone()[0]
+
+def stored_median_sets(conn):
+    """Сақланган ёзувлардаги медиана тўпламлари (ЛОТ/ВЕРСИЯ), индекс бўйича"""
+    return [row[0] for row in conn.execute(
+        "SELECT DISTINCT median_set FROM screenings WHERE median_set IS NOT NULL ORDER BY median_set"
+    )]
+
+SUMMARY_COLUMNS = ('seq', 'id', 'name', 'age', 'screening_type', 'gestational_age', 'max_risk', 'timestamp')
+
+def search_expression(query):
+    """Қидирув матни -> FTS5 ифодаси: ҳар бир сўз префикс сифатида ("ива"* "мар"*), ҳаммаси AND
+
+    Сўзлар ҳарф ва рақамлардан иборат, бошқа белгилар (тирноқ, дефис) ажратувчи.
+    Сўз бўлмаса None.
+    """
+    words = re.findall(r'\w+', query or '')
+    return ' '.join(f'"{word}"*' for word in words) or None
+
+def fetch_screenings_page(conn, page_size=20, before=None, date_from=None, date_to=None,
+                          screening_type=None, risk_category=None, query=None):
+    """Скрининглар рўйхатининг битта саҳифаси (янгилари аввал, keyset пагинация)
+
+    before - олдинги саҳифанинг охирги ёзуви (timestamp, seq); None - биринчи саҳифа.
+    query - исм ёки ID боши (кирилл/лотин, катта-кичик ҳарф фарқсиз), FTS5 индекси бўйича.
+    Фильтрлар SQL даражасида қўлланилади, JSON ёзувлар ўқилмайди.
+    Қайтарилади: (қисқа ёзувлар рўйхати, кейинги саҳифа курсори ёки None).
+    """
+    conditions, params = [], []
+    expression = search_expression(query)
+    if expression is not None:
+        conditions.append("seq IN (SELECT rowid FROM screenings_fts WHERE screenings_fts MATCH ?)")
+        params.append(expression)
+    if before is not None:
+        conditions.append("(timestamp < ? OR (timestamp = ? AND seq < ?))")
+        params += [before[0], before[0], before[1]]
+    if date_from is not None:
+        conditions.append("timestamp >= ?")
+        params.append(date_from.isoformat())
+    if date_to is not None:
+        conditions.append("timestamp < ?")
+        params.append((date_to + timedelta(days=1)).isoformat())
+    if screening_type is not None:
+        conditions.append("screening_type = ?")
+        params.append(screening_type)
+    if risk_category is not None:
+        low, high = RISK_CATEGORY_BOUNDS[risk_category]
+        if low is not None:
+            conditions.append("max_risk > ?")
+            params.append(low)
+        if high is not None:
+            conditions.append("max_risk <= ?")
+            params.append(high)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = conn.execute(
+        f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM screenings {where} "
+        "ORDER BY timestamp DESC, seq DESC LIMIT ?",
+        params + [page_size + 1]
+    ).fetchall()
+
+    page = [dict(zip(SUMMARY_COLUMNS, row)) for row in rows[:page_size]]
+    next_cursor = (page[-1]['timestamp'], page[-1]['seq']) if len(rows) > page_size else None
+    return page, next_cursor
+
+def iter_screening_chunks(conn, after_seq=0, chunk_size=1000, median_set=None):
+    """Барча скрининглар (seq, record JSON) бўлаклари, seq тартибида
+
+    Ҳар бир бўлак алоҳида сўров (seq > охирги), шунинг учун бўлаклар орасида
+    шу уланиш орқали ёзиш мумкин. median_set (ЛОТ/ВЕРСИЯ) - фақат шу тўплам билан
+    ҳисобланган ёзувлар (idx_screenings_median_set бўйича).
+    """
+    where, params = ("median_set = ? AND ", [median_set]) if median_set is not None else ("", [])
+    while True:
+        rows = conn.execute(
+            f"SELECT seq, record FROM screenings WHERE {where}seq > ? ORDER BY seq LIMIT ?",
+            params + [after_seq, chunk_size]
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        after_seq = rows[-1][0]
+
+EXPORT_COLUMNS = ('seq', 'id', 'name', 'age', 'screening_type', 'gestational_age', 'bmi',
+                  'timestamp', 'median_set')
+
+def export_csv(conn, path, chunk_size=1000, progress=None):
+    """Барча скринингларни CSV га бўлакма-бўлак ёзиш (ҳар бир синдром хавфи алоҳида устун)
+
+    progress(rows_done) - ҳар бир бўлакдан кейин чақирилади. Ёзилган қаторлар сонини қайтаради.
+    """
+    rows_done = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS + tuple(f'{syndrome}_risk' for syndrome in SYNDROMES)
+                        + ('max_risk', 'risk_category'))
+        for rows in iter_screening_chunks(conn, 0, chunk_size):
+            for seq, record_json in rows:
+                record = json.loads(record_json)
+                risks = record.get('risks', {})
+                highest = max_risk(risks)
+                writer.writerow(
+                    [seq] + [record.get(column) for column in EXPORT_COLUMNS[1:]]
+                    + [risks.get(syndrome) for syndrome in SYNDROMES]
+                    + [highest, get_risk_category(highest)[0]]
+                )
+            rows_done += len(rows)
+            if progress:
+                progress(rows_done)
+    return rows_done
+
+def get_screening(conn, seq):
+    """Битта скрининг ёзувини тўлиқ ўқиш"""
+    row = conn.execute("SELECT record FROM screenings WHERE seq = ?", (seq,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+def get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def set_meta(conn, key, value):
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+def migrate_json(conn, json_path=LEGACY_JSON_PATH):
+    """Эски JSON тарихини базага бир марта кўчириш
+
+    Кўчирилган файл meta жадвалида белгиланади, қайта чақирилса ҳеч нарса
+    қилмайди. Кўчирилган ёзувлар сонини қайтаради.
+    """
+    meta_key = f"migrated:{os.path.abspath(json_path)}"
+    if not os.path.exists(json_path) or get_meta(conn, meta_key):
+        return 0
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    with conn:
+        conn.executemany(INSERT_SQL, (_screening_row(record) for record in records))
+        aggregates.update(conn, records)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (meta_key, str(len(records))))
+    return len(records)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Генетик скрининг базаси")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    migrate = subparsers.add_parser('migrate', help="JSON тарихни базага кўчириш")
+    migrate.add_argument('json_path', nargs='?', default=LEGACY_JSON_PATH)
+    migrate.add_argument('--db', default=DEFAULT_DB_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == 'migrate':
+        with database(args.db) as conn:
+            migrated = migrate_json(conn, args.json_path)
+            print(f"{migrated} ёзув кўчирилди, базада жами {count_screenings(conn)} ёзув -> {args.db}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
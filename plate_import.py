@@ -0,0 +1,232 @@
+# plate_import.py - DELFIA плашка экспорт файлларини (CSV/XLSX) оммавий ҳисоблаш
+# Файл бўлакларга бўлиб ўқилади, ҳар бир бўлак учун MoM ва хавфлар векторли
+# ҳисобланади ва натижа CSV файлга бўлакма-бўлак ёзилади (бутун файл хотирада сақланмайди)
+#
+# Фойдаланиш:
+#   python plate_import.py plate.csv natija.csv [--screening-type first] [--chunk-size 5000]
+#                          [--median-set ЛОТ/ВЕРСИЯ] [--processes 4]
+
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+import ids
+import median_sets
+from reference_tables import median_set_label
+from scoring import (
+    SYNDROMES,
+    calculate_mom_delfia_batch,
+    calculate_syndrome_risks_batch,
+    get_risk_category_batch,
+)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Скрининг тури бўйича аналит устунлари: (устун номи, DELFIA параметри)
+ANALYTE_COLUMNS = {
+    'first': (('nt', 'NT'), ('papp_a', 'PAPP_A'), ('free_beta_hcg', 'FREE_BETA_HCG')),
+    'second': (('afp', 'AFP'), ('total_hcg', 'TOTAL_HCG'), ('ue3', 'UE3')),
+}
+
+REQUIRED_COLUMNS = ('age', 'gestational_age')
+
+def normalize_column(name):
+    """Устун номини бир хил кўринишга келтириш ("PAPP-A" -> "papp_a")"""
+    return re.sub(r'[^0-9a-z]+', '_', str(name).strip().lower()).strip('_')
+
+def detect_format(source):
+    """Файл форматини номидан аниқлаш (csv ёки xlsx)"""
+    name = source if isinstance(source, str) else getattr(source, 'name', '')
+    return 'xlsx' if str(name).lower().endswith(('.xlsx', '.xlsm')) else 'csv'
+
+def detect_screening_type(columns):
+    """Устунларга қараб скрининг турини аниқлаш"""
+    columns = {normalize_column(c) for c in columns}
+    for screening_type in ('second', 'first'):
+        if all(column in columns for column, _ in ANALYTE_COLUMNS[screening_type]):
+            return screening_type
+    raise ValueError("Файлда на биринчи, на иккиламчи скрининг аналитлари топилмади")
+
+def _read_xlsx_chunks(source, chunk_size):
+    """XLSX файлини read-only режимда қаторма-қатор ўқиб, бўлаклар ҳосил қилиш"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+def read_plate_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, file_format=None):
+    """Плашка файлини DataFrame бўлаклари сифатида ўқиш"""
+    file_format = file_format or detect_format(source)
+    if file_format == 'xlsx':
+        chunks = _read_xlsx_chunks(source, chunk_size)
+    else:
+        chunks = pd.read_csv(source, chunksize=chunk_size)
+
+    for chunk in chunks:
+        chunk.columns = [normalize_column(c) for c in chunk.columns]
+        yield chunk
+
+def _numeric(chunk, column):
+    return pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=float)
+
+def score_plate_chunk(chunk, screening_type, median_set=None):
+    """Битта бўлак учун учта MoM ва барча синдром хавфларини ҳисоблаш"""
+    median_set = median_set or median_sets.get_active_median_set()
+    missing = [c for c in REQUIRED_COLUMNS + tuple(c for c, _ in ANALYTE_COLUMNS[screening_type])
+               if c not in chunk]
+    if missing:
+        raise ValueError(f"Файлда устунлар етишмайди: {', '.join(missing)}")
+
+    age = _numeric(chunk, 'age')
+    gestational_age = _numeric(chunk, 'gestational_age')
+    weight = _numeric(chunk, 'weight') if 'weight' in chunk else None
+
+    result = chunk.copy()
+    moms = {}
+    for column, parameter in ANALYTE_COLUMNS[screening_type]:
+        moms[column] = calculate_mom_delfia_batch(
+            _numeric(chunk, column), parameter, gestational_age, weight, screening_type, median_set
+        )
+        result[f'{column}_mom'] = moms[column]
+
+    if screening_type == 'first':
+        risks = calculate_syndrome_risks_batch(age, moms['nt'], moms['papp_a'], moms['free_beta_hcg'])
+    else:
+        # Биринчи скрининг натижалари файлда бўлса - интеграл ҳисоб, бўлмаса NaN
+        # (UI ва API'даги каби: йўқ маркер хавф моделида ҳисобга олинмайди)
+        first_moms = {}
+        has_first = 'first_gestational_age' in chunk and all(
+            column in chunk for column, _ in ANALYTE_COLUMNS['first']
+        )
+        for column, parameter in ANALYTE_COLUMNS['first']:
+            if has_first:
+                mom = calculate_mom_delfia_batch(
+                    _numeric(chunk, column), parameter,
+                    _numeric(chunk, 'first_gestational_age'), weight, 'first', median_set
+                )
+                first_moms[column] = mom
+                result[f'{column}_mom'] = mom
+            else:
+                first_moms[column] = np.nan
+        risks = calculate_syndrome_risks_batch(
+            age, first_moms['nt'], first_moms['papp_a'], first_moms['free_beta_hcg'],
+            moms['afp'], moms['total_hcg'], moms['ue3']
+        )
+
+    for syndrome in SYNDROMES:
+        result[f'{syndrome}_risk'] = risks[syndrome]
+    max_risk = np.max([risks[syndrome] for syndrome in SYNDROMES], axis=0)
+    result['max_risk'] = max_risk
+    result['risk_category'] = get_risk_category_batch(max_risk)
+    result['screening_type'] = screening_type
+    result['median_set'] = median_set_label(median_set)
+    return result
+
+def _with_ids(chunks):
+    """Файлда ID устуни бўлмаса - ҳар бир қаторга янги ID (асосий процессда, пулга юборишдан олдин)"""
+    for chunk in chunks:
+        if 'id' not in chunk:
+            chunk.insert(0, 'id', ids.new_ids(len(chunk)))
+        yield chunk
+
+def _scored_chunks(chunks, screening_type, median_set, processes):
+    """Бўлакларни тартиб билан ҳисоблаш; processes > 1 бўлса - процесслар пулида"""
+    if processes <= 1:
+        for chunk in chunks:
+            yield score_plate_chunk(chunk, screening_type, median_set)
+        return
+
+    # Хотира чегараланган: бир вақтда кўпи билан 2 x процесс бўлак
+    with Pool(processes) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(score_plate_chunk, (chunk, screening_type, median_set)))
+            if len(pending) >= processes * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+def score_plate_file(source, output, screening_type=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     file_format=None, progress=None, median_set=None, processes=1):
+    """Плашка файлини бўлакма-бўлак ҳисоблаб, натижани CSV га ёзиш
+
+    median_set - медиана тўплами (кўрсатилмаса фаол тўплам).
+    progress(rows_done) - ҳар бир бўлакдан кейин чақирилади (ихтиёрий).
+    processes - бўлакларни параллел ҳисоблайдиган процесслар сони.
+    Қайтарилади: {'rows', 'seconds', 'rows_per_second', 'screening_type'}.
+    """
+    started = time.perf_counter()
+    rows = 0
+    median_set = median_set or median_sets.get_active_median_set()
+
+    chunks = read_plate_chunks(source, chunk_size, file_format)
+    first = next(chunks, None)
+    if first is not None and screening_type is None:
+        screening_type = detect_screening_type(first.columns)
+
+    with open(output, 'w', encoding='utf-8', newline='') as out:
+        if first is not None:
+            chunks = _with_ids(itertools.chain([first], chunks))
+            for scored in _scored_chunks(chunks, screening_type, median_set, processes):
+                scored.to_csv(out, header=(rows == 0), index=False)
+                rows += len(scored)
+                if progress:
+                    progress(rows)
+
+    seconds = time.perf_counter() - started
+    return {
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else 0.0,
+        'screening_type': screening_type,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DELFIA плашка файлини оммавий ҳисоблаш")
+    parser.add_argument('input', help="CSV ёки XLSX экспорт файли")
+    parser.add_argument('output', help="Натижа CSV файли")
+    parser.add_argument('--screening-type', choices=('first', 'second'),
+                        help="Скрининг тури (кўрсатилмаса устунлардан аниқланади)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--median-set', help="Медиана тўплами ЛОТ/ВЕРСИЯ (кўрсатилмаса фаол тўплам)")
+    parser.add_argument('--processes', type=int, default=1, help="Параллел процесслар сони")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        parser.error(f"Файл топилмади: {args.input}")
+
+    try:
+        median_set = median_sets.find_median_set(args.median_set) if args.median_set else None
+    except KeyError:
+        parser.error(f"Медиана тўплами топилмади: {args.median_set}")
+
+    stats = score_plate_file(args.input, args.output, args.screening_type, args.chunk_size,
+                             median_set=median_set, processes=args.processes)
+    print(f"{stats['rows']} қатор ({stats['screening_type']}) {stats['seconds']:.2f} сонияда ҳисобланди: "
+          f"{stats['rows_per_second']:,.0f} қатор/сония -> {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# reference_tables.py - DELFIA референс медианаларининг кунлик жадваллари
+# Ҳафталик медианалар орасида лог-линей интерполяция қилиниб, ҳар бир
+# гестация куни учун тайёр NumPy массиви ҳосил қилинади; қидириш - O(1) индекс
+
+import hashlib
+import json
+
+import numpy as np
+
+DAYS_PER_WEEK = 7
+
+def build_median_table(ranges_by_week):
+    """Ҳафталик медианалардан кунлик жадвал қуриш
+
+    Бутун ҳафталарда қиймат жадвалдаги медиананинг ўзи, ҳафталар орасида
+    лог-линей интерполяция, диапазондан ташқарида - четки ҳафта қиймати.
+    """
+    weeks = sorted(int(week) for week in ranges_by_week)
+    medians = np.array([ranges_by_week[week]['median'] for week in weeks], dtype=float)
+    week_days = np.array(weeks) * DAYS_PER_WEEK
+
+    first_day = week_days[0]
+    days = np.arange(first_day, week_days[-1] + DAYS_PER_WEEK)
+    table = np.exp(np.interp(days, week_days, np.log(medians)))
+    table[week_days - first_day] = medians
+    # Охирги ҳафтадан кейинги кунлар (ва жадвалдан ташқари қисқартирилган кунлар) - медиананинг ўзи
+    table[week_days[-1] - first_day:] = medians[-1]
+
+    # get_delfia_norm учун: ҳар бир кунга энг яқин ҳафта (тенг масофада - кичиги)
+    nearest_week = np.array(weeks)[np.abs(days[:, np.newaxis] / DAYS_PER_WEEK - weeks).argmin(axis=1)]
+
+    return {
+        'first_day': int(first_day),
+        'medians': table,
+        'nearest_week': nearest_week,
+    }
+
+def build_median_tables(norms):
+    """Триместр нормалари луғатидан {параметр: кунлик жадвал}"""
+    return {parameter: build_median_table(norm['ranges_by_week']) for parameter, norm in norms.items()}
+
+def week_to_day(gestational_week):
+    """Гестация ҳафтаси (каср бўлиши мумкин) -> гестация куни"""
+    return np.rint(np.asarray(gestational_week, dtype=float) * DAYS_PER_WEEK)
+
+def _day_index(table, gestational_day):
+    index = np.asarray(gestational_day, dtype=float) - table['first_day']
+    index = np.nan_to_num(index, nan=0.0)
+    return np.clip(index, 0, len(table['medians']) - 1).astype(np.intp)
+
+def lookup_median(table, gestational_day):
+    """Кун(лар) учун медиана: скаляр ёки массив"""
+    return table['medians'][_day_index(table, gestational_day)]
+
+def lookup_nearest_week(table, gestational_day):
+    """Кун учун норма жадвалидаги энг яқин ҳафта"""
+    return int(table['nearest_week'][_day_index(table, gestational_day)])
+
+def make_median_set(lot, version, norms_by_trimester, source=None):
+    """Медиана тўплами: лот, версия, ҳафталик нормалар ва кунлик жадваллар
+
+    norms_by_trimester: {'first': {параметр: {'ranges_by_week': {...}}}, 'second': {...}}
+    fingerprint - нормалар мазмуни хеши (файл ўзгарса, лот/версия бир хил бўлса ҳам ўзгаради)
+    """
+    content = json.dumps(norms_by_trimester, sort_keys=True, ensure_ascii=False, default=float)
+    return {
+        'lot': str(lot),
+        'version': str(version),
+        'source': source,
+        'fingerprint': hashlib.sha256(content.encode('utf-8')).hexdigest()[:16],
+        'norms': norms_by_trimester,
+        'tables': {trimester: build_median_tables(norms) for trimester, norms in norms_by_trimester.items()},
+    }
+
+def median_set_label(median_set):
+    """Тўплам белгиси: "лот/версия" (ёзувларга муҳрланади)"""
+    return f"{median_set['lot']}/{median_set['version']}"
@@ -0,0 +1,264 @@
+# reports.py - Сақланган скрининглар бўйича беморлар ҳисоботлари (HTML, ихтиёрий PDF)
+# Шаблон жараёнда бир марта компиляция қилинади; хавфлар диаграммаси статик SVG
+# бўлиб, бир хил хавф профили (1:N қийматлари) учун бир марта чизилади (LRU кеш).
+# Сана оралиғидаги ёзувлар бўлакларга бўлиниб процесслар пулида ҳисоботга айланади
+#
+# Фойдаланиш:
+#   python reports.py --from 2026-01-01 --to 2026-01-31 [--format html] [--out reports] [--zip reports.zip]
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from datetime import date, timedelta
+from functools import lru_cache
+from multiprocessing import Pool
+
+import jinja2
+import numpy as np
+
+import patient_db
+from aggregates import ANALYTES
+from labels import ANALYTE_LABELS, SYNDROME_LABELS, format_risk
+from scoring import AGE_SYNDROMES, SYNDROMES, get_risk_category
+
+try:
+    from weasyprint import HTML  # PDF ихтиёрий: pip install weasyprint
+except ImportError:
+    HTML = None
+
+REPORTS_DIR = "reports"
+DEFAULT_CHUNK_SIZE = 200
+
+# Ҳар бир процессдаги диаграммалар кешидаги энг кўп ёзувлар
+REPORT_CHART_CACHE_SIZE = 4096
+
+SYNDROME_TITLES = {
+    'downs': "Даун синдроми (Трисомия 21)",
+    'edwards': "Эдвардс синдроми (Трисомия 18)",
+    'patau': "Патау синдроми (Трисомия 13)",
+    'turner': "Тернер синдроми (45,X)",
+    'ntd': "Нейротубуляр дефект (НТД)",
+}
+SCREENING_TYPE_TITLES = {'first': "Биринчи скрининг", 'second': "Иккиламчи скрининг"}
+
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html lang="uz">
+<head>
+<meta charset="utf-8">
+<title>{{ patient.name or patient.id }} - генетик скрининг</title>
+<style>
+@page { size: A4; margin: 15mm; }
+body { font-family: 'DejaVu Sans', Arial, sans-serif; font-size: 11pt; color: #212121; }
+h1 { font-size: 16pt; color: #1a237e; border-bottom: 2px solid #1a237e; padding-bottom: 4px; }
+h2 { font-size: 12pt; color: #1a237e; margin-top: 18px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #cfd8dc; padding: 4px 8px; text-align: left; }
+th { background: #eceff1; }
+.category { color: #fff; font-weight: bold; padding: 2px 8px; border-radius: 4px; }
+.footer { margin-top: 24px; font-size: 8pt; color: #757575; }
+</style>
+</head>
+<body>
+<h1>Пренатал генетик скрининг натижалари</h1>
+<table>
+<tr><th>Бемор</th><td>{{ patient.name or "—" }}</td><th>ID</th><td>{{ patient.id }}</td></tr>
+<tr><th>Ёши</th><td>{{ age }} йош</td><th>Скрининг</th><td>{{ screening_type }}</td></tr>
+<tr><th>Хомиладорлик</th><td>{{ gestational_age }} ҳафта</td><th>BMI</th><td>{{ bmi }}</td></tr>
+<tr><th>Сана</th><td>{{ patient.timestamp[:16].replace('T', ' ') }}</td>
+<th>Медиана тўплами / модел</th><td>{{ patient.median_set or "—" }} / {{ patient.risk_model or "—" }}</td></tr>
+</table>
+
+<h2>Биокимёвий маркерлар</h2>
+<table>
+<tr><th>Маркер</th><th>Қиймат</th><th>MoM</th></tr>
+{% for row in markers %}
+<tr><td>{{ row.label }}</td><td>{{ row.value }}</td><td>{{ row.mom }}</td></tr>
+{% endfor %}
+</table>
+
+<h2>Генетик синдромлар хавфлари</h2>
+<table>
+<tr><th>Синдром</th><th>Хавф нисбати</th><th>Категория</th><th>Ёш кўпайтирувчиси</th></tr>
+{% for row in risks %}
+<tr><td>{{ row.title }}</td><td>{{ row.ratio }}</td>
+<td><span class="category" style="background: {{ row.color }}">{{ row.category }}</span></td>
+<td>{{ row.age_risk }}</td></tr>
+{% endfor %}
+</table>
+{{ chart | safe }}
+
+<div class="footer">DELFIA Revvity · {{ generated }} · Ҳисобот скрининг натижаси бўлиб, ташхис эмас</div>
+</body>
+</html>
+"""
+
+# Шаблон жараён бошида бир марта компиляция қилинади (процесслар пули fork орқали мерос олади)
+_environment = jinja2.Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+TEMPLATE = _environment.from_string(REPORT_TEMPLATE)
+
+def report_formats():
+    """Мавжуд ҳисобот форматлари (PDF - weasyprint ўрнатилган бўлса)"""
+    return ('html', 'pdf') if HTML is not None else ('html',)
+
+# ==================== ДИАГРАММА ====================
+
+def _ratio(risk):
+    return int(1 / risk) if risk and risk > 0 else None
+
+@lru_cache(maxsize=REPORT_CHART_CACHE_SIZE)
+def risk_chart_svg(ratios):
+    """Синдромлар хавфлари (1:N, логарифмик шкала) статик SVG диаграммаси
+
+    ratios - SYNDROMES тартибидаги N қийматлари (None - хавф йўқ); кеш калити шу
+    кортеж, шунинг учун бир хил кўринадиган диаграммалар бир марта чизилади.
+    """
+    width, bar_height, label_width, top = 640, 26, 130, 30
+    plot_width = width - label_width - 80
+    high = np.log10(max(max((n for n in ratios if n), default=10), 10))
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{top + bar_height * len(ratios) + 10}" '
+        'font-family="DejaVu Sans, Arial, sans-serif" font-size="12">',
+        '<text x="0" y="16" font-weight="bold">Генетик синдромлар хавфлари (1:N)</text>',
+    ]
+    for i, (syndrome, n) in enumerate(zip(SYNDROMES, ratios)):
+        y = top + i * bar_height
+        color = get_risk_category(1 / n if n else 0.0)[2]
+        length = plot_width * np.log10(n) / high if n and n > 1 else 0
+        parts.append(f'<text x="0" y="{y + 17}">{SYNDROME_LABELS[syndrome]}</text>')
+        parts.append(f'<rect x="{label_width}" y="{y + 4}" width="{length:.1f}" height="{bar_height - 8}" '
+                     f'fill="{color}"/>')
+        parts.append(f'<text x="{label_width + length + 6:.1f}" y="{y + 17}">{f"1:{n}" if n else "1:∞"}</text>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+# ==================== ҲИСОБОТ ====================
+
+def _number(value, digits=2):
+    return f"{value:.{digits}f}" if isinstance(value, (int, float)) else "—"
+
+def _short(value):
+    """Бир хонагача, ортиқча нолсиз: 30 -> '30', 12.34 -> '12.3'"""
+    return f"{round(value, 1):g}" if isinstance(value, (int, float)) else "—"
+
+def render_report(record):
+    """Битта скрининг ёзуви учун HTML ҳисобот"""
+    parameters = record.get('parameters', {})
+    risks = record.get('risks', {})
+    age_risk = risks.get('age_risk', {})
+    markers = [
+        {'label': ANALYTE_LABELS[analyte], 'value': _number(parameters.get(analyte)),
+         'mom': _number(parameters.get(f'{analyte}_mom'))}
+        for analyte in ANALYTES['first'] + ANALYTES['second'] if parameters.get(analyte) is not None
+    ]
+    risk_rows = []
+    for syndrome in SYNDROMES:
+        category, _, color = get_risk_category(risks.get(syndrome, 0.0))
+        risk_rows.append({
+            'title': SYNDROME_TITLES[syndrome],
+            'ratio': format_risk(risks.get(syndrome)),
+            'category': category,
+            'color': color,
+            'age_risk': f"{age_risk[syndrome]:.1f}x" if syndrome in AGE_SYNDROMES and syndrome in age_risk else "—",
+        })
+    return TEMPLATE.render(
+        patient=record,
+        screening_type=SCREENING_TYPE_TITLES.get(record['screening_type'], record['screening_type']),
+        age=_short(record.get('age')),
+        gestational_age=_short(record.get('gestational_age')),
+        bmi=_number(record.get('bmi'), 1),
+        markers=markers,
+        risks=risk_rows,
+        chart=risk_chart_svg(tuple(_ratio(risks.get(syndrome)) for syndrome in SYNDROMES)),
+        generated=date.today().isoformat(),
+    )
+
+def report_filename(seq, record, fmt='html'):
+    """Ҳисобот файли номи: сана_seq_ID.формат (ID файл номига мос белгиларга келтирилади)"""
+    safe_id = re.sub(r'[^\w.-]+', '_', str(record['id']))
+    return f"{record['timestamp'][:10]}_{seq}_{safe_id}.{fmt}"
+
+def _render_chunk(db_path, seqs, directory, fmt):
+    """Процесс пулидаги иш: бўлакдаги ёзувлар ҳисоботларини ёзиш, ёзилганлар сонини қайтаради"""
+    with patient_db.database(db_path) as conn:
+        rows = conn.execute(
+            f"SELECT seq, record FROM screenings WHERE seq IN ({', '.join('?' * len(seqs))})", seqs
+        ).fetchall()
+    for seq, record_json in rows:
+        record = json.loads(record_json)
+        html = render_report(record)
+        path = os.path.join(directory, report_filename(seq, record, fmt))
+        if fmt == 'pdf':
+            HTML(string=html).write_pdf(path)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+    return len(rows)
+
+def _chunk_worker(args):
+    return _render_chunk(*args)
+
+def report_seqs(conn, date_from=None, date_to=None):
+    """Сана оралиғидаги скринингларнинг seq рақамлари (timestamp индекси бўйича)"""
+    conditions, params = [], []
+    if date_from is not None:
+        conditions.append("timestamp >= ?")
+        params.append(date_from.isoformat())
+    if date_to is not None:
+        conditions.append("timestamp < ?")
+        params.append((date_to + timedelta(days=1)).isoformat())
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return [row[0] for row in conn.execute(f"SELECT seq FROM screenings {where} ORDER BY timestamp, seq", params)]
+
+def render_reports(db_path=patient_db.DEFAULT_DB_PATH, directory=REPORTS_DIR, date_from=None, date_to=None,
+                   fmt='html', processes=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Сана оралиғидаги барча скринингларнинг ҳисоботлари (процесслар пулида)
+
+    progress(done, total) - ҳар бир бўлакдан кейин чақирилади.
+    Қайтарилади: {'reports', 'directory', 'format', 'seconds'}.
+    """
+    if fmt not in report_formats():
+        raise ValueError(f"Ҳисобот формати мавжуд эмас: {fmt} (PDF учун weasyprint керак)")
+    started = time.perf_counter()
+    with patient_db.database(db_path) as conn:
+        seqs = report_seqs(conn, date_from, date_to)
+    os.makedirs(directory, exist_ok=True)
+
+    chunks = [seqs[i:i + chunk_size] for i in range(0, len(seqs), chunk_size)]
+    done = 0
+    with Pool(processes or os.cpu_count() or 1) as pool:
+        for rendered in pool.imap_unordered(_chunk_worker, [(db_path, chunk, directory, fmt) for chunk in chunks]):
+            done += rendered
+            if progress:
+                progress(done, len(seqs))
+    return {'reports': done, 'directory': directory, 'format': fmt, 'seconds': time.perf_counter() - started}
+
+def zip_reports(directory, path):
+    """Ҳисоботлар папкасини битта ZIP файлга жамлаш (юклаб олиш учун)"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        for name in sorted(os.listdir(directory)):
+            bundle.write(os.path.join(directory, name), name)
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Беморлар ҳисоботлари (сана оралиғи бўйича)")
+    parser.add_argument('--db', default=patient_db.DEFAULT_DB_PATH)
+    parser.add_argument('--from', dest='date_from', type=date.fromisoformat, help="Биринчи сана (ЙЙЙЙ-ОО-КК)")
+    parser.add_argument('--to', dest='date_to', type=date.fromisoformat, help="Охирги сана (ЙЙЙЙ-ОО-КК)")
+    parser.add_argument('--format', dest='fmt', default='html', choices=('html', 'pdf'))
+    parser.add_argument('--out', default=REPORTS_DIR, help="Ҳисоботлар папкаси")
+    parser.add_argument('--zip', help="Ҳисоботларни шу ZIP файлга ҳам жамлаш")
+    parser.add_argument('--processes', type=int, help="Процесслар сони (кўрсатилмаса CPU сони)")
+    args = parser.parse_args(argv)
+
+    result = render_reports(args.db, args.out, args.date_from, args.date_to, args.fmt, args.processes)
+    if args.zip:
+        zip_reports(args.out, args.zip)
+    print(f"{result['reports']} ҳисобот {result['seconds']:.1f} сонияда -> {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
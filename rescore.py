@@ -0,0 +1,241 @@
+# rescore.py - Сақланган скринингларни янги хавф модели ёки медиана тўплами билан қайта ҳисоблаш
+# Ёзувлар бўлакма-бўлак процесслар пулида ҳисобланади, натижа risk_versions
+# жадвалига асл ёзув ёнига ёзилади. Ҳар бир бўлакдан кейин текширув нуқтаси
+# сақланади - тўхтатилган иш шу жойдан давом эттирилади.
+#
+# Фойдаланиш:
+#   python rescore.py [--median-set ЛОТ/ВЕРСИЯ] [--from-median-set ЛОТ/ВЕРСИЯ] [--engine rules|lr]
+#                     [--version НОМ] [--report diff.csv]
+#                     [--chunk-size 1000] [--processes 4] [--restart]
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from multiprocessing import Pool
+
+import numpy as np
+
+import median_sets
+import patient_db
+from reference_tables import median_set_label
+from scoring import (
+    DEFAULT_RISK_ENGINE,
+    RISK_ENGINES,
+    SYNDROMES,
+    WEIGHT_CORRECTED_PARAMETERS,
+    calculate_mom_delfia,
+    calculate_syndrome_risks,
+    get_risk_category,
+    get_risk_engine,
+)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+FIRST_PARAMETERS = (('nt', 'NT'), ('papp_a', 'PAPP_A'), ('free_beta_hcg', 'FREE_BETA_HCG'))
+SECOND_PARAMETERS = (('afp', 'AFP'), ('total_hcg', 'TOTAL_HCG'), ('ue3', 'UE3'))
+
+def _recompute_mom(record, key, parameter, gestational_week, trimester, median_set):
+    """Хом қийматдан MoM; вазн номаълум эски ёзувларда сақланган MoM ишлатилади"""
+    parameters = record.get('parameters', {})
+    value = parameters.get(key)
+    weight_known = parameter not in WEIGHT_CORRECTED_PARAMETERS or 'weight' in record
+    if value is not None and gestational_week is not None and weight_known:
+        return calculate_mom_delfia(value, parameter, gestational_week, record.get('weight'), trimester, median_set)
+    return parameters.get(f'{key}_mom')
+
+def record_moms(record, median_set):
+    """Ёзув учун (ёш, NT, PAPP-A, free β-hCG, AFP, total hCG, uE3) MoM'лари
+
+    Аналит йўқ бўлса None (батч функцияларда NaN - "маълумот йўқ"; қоидалар
+    моделида бу 1.0 MoM билан бир хил, LR моделида маркер ҳисобга олинмайди).
+    """
+    parameters = record.get('parameters', {})
+    if record['screening_type'] == 'first':
+        first_week, second = record.get('gestational_age'), (None, None, None)
+    else:
+        first_week = parameters.get('first_gestational_age')
+        second = tuple(
+            _recompute_mom(record, key, parameter, record.get('gestational_age'), 'second', median_set)
+            for key, parameter in SECOND_PARAMETERS
+        )
+    first = tuple(
+        _recompute_mom(record, key, parameter, first_week, 'first', median_set) or None
+        for key, parameter in FIRST_PARAMETERS
+    )
+    return (record['age'],) + first + second
+
+def rescore_record(record, median_set, engine=DEFAULT_RISK_ENGINE):
+    """Битта сақланган скринингни қайта ҳисоблаш, янги risks луғатини қайтаради"""
+    return calculate_syndrome_risks(*record_moms(record, median_set), engine=engine)
+
+def _categories(risks):
+    return {syndrome: get_risk_category(risks.get(syndrome, 0.0))[0] for syndrome in SYNDROMES}
+
+def _rescore_chunk(rows, label, engine=DEFAULT_RISK_ENGINE):
+    """Процесс пулидаги иш: бўлакдаги ёзувларни битта векторли чақириқда қайта ҳисоблаш"""
+    median_set = median_sets.find_median_set(label)
+    records = [json.loads(record_json) for _, record_json in rows]
+    # None (иккиламчи аналит йўқ) -> NaN: батч функцияда "маълумот йўқ"
+    columns = np.array([record_moms(record, median_set) for record in records], dtype=float)
+    batch = get_risk_engine(engine)[0](*columns.T)
+
+    results = []
+    for i, ((seq, _), record) in enumerate(zip(rows, records)):
+        risks = {syndrome: float(batch[syndrome][i]) for syndrome in SYNDROMES}
+        risks['age_risk'] = {syndrome: float(values[i]) for syndrome, values in batch['age_risk'].items()}
+        changed = _categories(record.get('risks', {})) != _categories(risks)
+        results.append((seq, json.dumps(risks), patient_db.max_risk(risks), int(changed)))
+    return results
+
+def _start_run(conn, version, label, model_version, restart):
+    if restart:
+        with conn:
+            conn.execute("DELETE FROM risk_versions WHERE version = ?", (version,))
+            conn.execute("DELETE FROM rescore_runs WHERE version = ?", (version,))
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO rescore_runs (version, median_set, model_version, started) VALUES (?, ?, ?, ?)",
+            (version, label, model_version, datetime.now().isoformat())
+        )
+    return get_run(conn, version)
+
+def get_run(conn, version):
+    """Қайта ҳисоблаш иши ҳолати (текширув нуқтаси билан)"""
+    row = conn.execute(
+        "SELECT version, median_set, model_version, last_seq, processed, changed, started, finished "
+        "FROM rescore_runs WHERE version = ?", (version,)
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(zip(('version', 'median_set', 'model_version', 'last_seq', 'processed',
+                     'changed', 'started', 'finished'), row))
+
+def run_rescore(db_path=patient_db.DEFAULT_DB_PATH, median_set=None, version=None,
+                chunk_size=DEFAULT_CHUNK_SIZE, processes=None, restart=False, progress=None,
+                engine=DEFAULT_RISK_ENGINE, source_median_set=None):
+    """Барча скринингларни қайта ҳисоблаш (тўхтаган жойдан давом эттирилади)
+
+    source_median_set - фақат шу тўплам (ЛОТ/ВЕРСИЯ) билан ҳисобланган ёзувлар.
+    version - натижалар версияси номи, кўрсатилмаса "<модель>+<лот/версия>"
+    (манба тўплам бўлса "... <- <манба>").
+    engine - хавф модели ('rules' ёки 'lr'); сақланган хавфлар билан солиштирилади.
+    progress(run) - ҳар бир бўлак сақлангандан кейин чақирилади.
+    Тугаган иш ҳолатини қайтаради.
+    """
+    median_set = median_set or median_sets.get_active_median_set()
+    label = median_set_label(median_set)
+    model_version = get_risk_engine(engine)[1]
+    if version is None:
+        version = f"{model_version}+{label}"
+        if source_median_set is not None:
+            version += f" <- {source_median_set}"
+    processes = processes or os.cpu_count() or 1
+
+    with patient_db.database(db_path) as conn:
+        run = _start_run(conn, version, label, model_version, restart)
+        if run['finished']:
+            return run
+
+        with Pool(processes) as pool:
+            pending = deque()
+            chunks = patient_db.iter_screening_chunks(conn, run['last_seq'], chunk_size, source_median_set)
+            exhausted = False
+            while pending or not exhausted:
+                # Хотира чегараланган: бир вақтда кўпи билан 2 x процесс бўлак
+                while not exhausted and len(pending) < processes * 2:
+                    rows = next(chunks, None)
+                    if rows is None:
+                        exhausted = True
+                        break
+                    pending.append((rows[-1][0], pool.apply_async(_rescore_chunk, (rows, label, engine))))
+                if not pending:
+                    break
+
+                # Натижалар тартиб билан ёзилади, шунинг учун last_seq доим тўғри
+                last_seq, result = pending.popleft()
+                results = result.get()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO risk_versions (version, seq, risks, max_risk, changed) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(version,) + row for row in results]
+                    )
+                    conn.execute(
+                        "UPDATE rescore_runs SET last_seq = ?, processed = processed + ?, changed = changed + ? "
+                        "WHERE version = ?",
+                        (last_seq, len(results), sum(row[3] for row in results), version)
+                    )
+                if progress:
+                    progress(get_run(conn, version))
+
+        with conn:
+            conn.execute("UPDATE rescore_runs SET finished = ? WHERE version = ?",
+                         (datetime.now().isoformat(), version))
+        return get_run(conn, version)
+
+def write_diff_report(conn, version, path):
+    """get_risk_category ўзгарган беморлар ҳисоботи (ҳар бир ўзгарган синдром - битта қатор)"""
+    rows = conn.execute(
+        "SELECT s.seq, s.id, s.name, s.timestamp, s.record, v.risks "
+        "FROM risk_versions v JOIN screenings s ON s.seq = v.seq "
+        "WHERE v.version = ? AND v.changed = 1 ORDER BY v.seq",
+        (version,)
+    )
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['seq', 'id', 'name', 'timestamp', 'syndrome',
+                         'old_risk', 'new_risk', 'old_category', 'new_category'])
+        for seq, patient_id, name, timestamp, record_json, risks_json in rows:
+            old_risks = json.loads(record_json).get('risks', {})
+            new_risks = json.loads(risks_json)
+            old_categories, new_categories = _categories(old_risks), _categories(new_risks)
+            for syndrome in SYNDROMES:
+                if old_categories[syndrome] != new_categories[syndrome]:
+                    writer.writerow([seq, patient_id, name, timestamp, syndrome,
+                                     old_risks.get(syndrome), new_risks.get(syndrome),
+                                     old_categories[syndrome], new_categories[syndrome]])
+                    written += 1
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сақланган скринингларни қайта ҳисоблаш")
+    parser.add_argument('--db', default=patient_db.DEFAULT_DB_PATH)
+    parser.add_argument('--median-set', help="Медиана тўплами ЛОТ/ВЕРСИЯ (кўрсатилмаса фаол тўплам)")
+    parser.add_argument('--from-median-set', help="Фақат шу тўплам (ЛОТ/ВЕРСИЯ) билан ҳисобланган ёзувлар")
+    parser.add_argument('--engine', choices=RISK_ENGINES, default=DEFAULT_RISK_ENGINE, help="Хавф модели")
+    parser.add_argument('--version', help="Натижалар версияси номи")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--processes', type=int, help="Процесслар сони (кўрсатилмаса CPU сони)")
+    parser.add_argument('--restart', action='store_true', help="Текширув нуқтасини ўчириб, бошидан бошлаш")
+    parser.add_argument('--report', help="Категорияси ўзгарганлар ҳисоботи (CSV)")
+    args = parser.parse_args(argv)
+
+    try:
+        median_set = median_sets.find_median_set(args.median_set) if args.median_set else None
+    except KeyError:
+        parser.error(f"Медиана тўплами топилмади: {args.median_set}")
+
+    started = time.perf_counter()
+    run = run_rescore(
+        args.db, median_set, args.version, args.chunk_size, args.processes, args.restart,
+        progress=lambda run: print(f"\r{run['processed']} ёзув, {run['changed']} ўзгарган...", end='', flush=True),
+        engine=args.engine, source_median_set=args.from_median_set
+    )
+    seconds = time.perf_counter() - started
+    print(f"\n{run['version']}: {run['processed']} ёзув, категорияси ўзгарган: {run['changed']} "
+          f"({seconds:.1f} сония)")
+
+    if args.report:
+        with patient_db.database(args.db) as conn:
+            written = write_diff_report(conn, run['version'], args.report)
+        print(f"Ҳисобот: {written} қатор -> {args.report}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# result_cache.py - Бир хил ҳисоблар учун жараён бўйлаб умумий LRU кеш
+# Streamlit ҳар бир виджет ўзгаришида app.py ни бошидан бажаради; бир хил кирувчи
+# қийматлар, медиана тўплами ва хавф модели учун MoM ва хавфлар қайта ҳисобланмайди.
+# Калит - (ҳисоб тури, кирувчи қийматлар, тўплам изи, модел версияси) SHA-256 хеши.
+# Ҳолат модул даражасида - сервер жараёнидаги барча сессиялар учун битта кеш
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import uncertainty
+from scoring import (
+    DEFAULT_MEDIAN_SET,
+    DEFAULT_RISK_ENGINE,
+    calculate_mom_delfia,
+    calculate_syndrome_risks,
+    get_risk_engine,
+)
+
+# Кешдаги энг кўп натижалар сони (эскилари LRU тартибида чиқарилади)
+MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_SIZE', '10000'))
+
+_lock = threading.Lock()
+_entries = OrderedDict()   # калит -> натижа
+_limits = {'max_entries': MAX_ENTRIES}
+_counters = {}             # ҳисоб тури -> {'hits', 'misses'}
+_evictions = {'count': 0}
+
+def cache_key(kind, inputs, median_set=None, model_version=None):
+    """Ҳисоб калити: кирувчи қийматлар, медиана тўплами изи ва модел версиясининг SHA-256 хеши"""
+    payload = json.dumps(
+        [kind, inputs, median_set['fingerprint'] if median_set else None, model_version],
+        sort_keys=True, default=float
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _cached(kind, key, compute):
+    with _lock:
+        counters = _counters.setdefault(kind, {'hits': 0, 'misses': 0})
+        if key in _entries:
+            _entries.move_to_end(key)
+            counters['hits'] += 1
+            return copy.deepcopy(_entries[key])
+        counters['misses'] += 1
+
+    # Ҳисоб қулфдан ташқарида: бошқа сессиялар кутмайди (бир хил калит икки марта ҳисобланиши мумкин)
+    value = compute()
+    with _lock:
+        _entries[key] = value
+        _entries.move_to_end(key)
+        _evict()
+    return copy.deepcopy(value)
+
+def _evict():
+    while len(_entries) > _limits['max_entries']:
+        _entries.popitem(last=False)
+        _evictions['count'] += 1
+
+# ==================== КЕШЛАНГАН ҲИСОБЛАР ====================
+
+def cached_mom(value, parameter, gestational_week, maternal_weight=None, trimester="first", median_set=None):
+    """calculate_mom_delfia натижаси кешдан"""
+    median_set = median_set or DEFAULT_MEDIAN_SET
+    key = cache_key('mom', [value, parameter, gestational_week, maternal_weight, trimester], median_set)
+    return _cached('mom', key, lambda: calculate_mom_delfia(
+        value, parameter, gestational_week, maternal_weight, trimester, median_set
+    ))
+
+def cached_syndrome_risks(risk_inputs, engine=DEFAULT_RISK_ENGINE):
+    """calculate_syndrome_risks(*risk_inputs, engine=engine) натижаси кешдан"""
+    key = cache_key('risks', list(risk_inputs), model_version=get_risk_engine(engine)[1])
+    return _cached('risks', key, lambda: calculate_syndrome_risks(*risk_inputs, engine=engine))
+
+def cached_risk_intervals(risk_inputs, engine=DEFAULT_RISK_ENGINE, cvs=None):
+    """Монте-Карло хавф оралиқлари (uncertainty.risk_intervals) кешдан"""
+    key = cache_key('intervals', [list(risk_inputs), cvs or {}], model_version=get_risk_engine(engine)[1])
+    return _cached('intervals', key, lambda: uncertainty.risk_intervals(risk_inputs, engine, cvs))
+
+# ==================== БОШҚАРУВ ====================
+
+def stats():
+    """Кеш ҳолати: ёзувлар сони, чегара, чиқарилганлар ва ҳисоб турлари бўйича hit/miss"""
+    with _lock:
+        by_kind = {kind: dict(counters) for kind, counters in _counters.items()}
+        return {
+            'entries': len(_entries),
+            'max_entries': _limits['max_entries'],
+            'evictions': _evictions['count'],
+            'hits': sum(counters['hits'] for counters in by_kind.values()),
+            'misses': sum(counters['misses'] for counters in by_kind.values()),
+            'by_kind': by_kind,
+        }
+
+def set_max_entries(max_entries):
+    """Кеш чегарасини ўзгартириш (кичрайса эски натижалар дарҳол чиқарилади)"""
+    if max_entries < 1:
+        raise ValueError("Кеш чегараси камида 1 бўлиши керак")
+    with _lock:
+        _limits['max_entries'] = int(max_entries)
+        _evict()
+
+def clear(reset_counters=False):
+    """Кешни тозалаш; reset_counters=True - ҳисоблагичлар ҳам нолланади"""
+    with _lock:
+        _entries.clear()
+        if reset_counters:
+            _counters.clear()
+            _evictions['count'] = 0
@@ -0,0 +1,463 @@
+# scoring.py - Генетик синдромлар хавфини ҳисоблаш ядроси (Streamlit'сиз)
+# DELFIA Revvity реагентлари асосида
+# app.py, плашка импорти ва бошқа фон вазифалари шу модулдан фойдаланади
+# Фақат NumPy импорт қилинади (pandas - керак бўлганда), шунинг учун иш
+# жараёнлари ва CLI воситалари тез ишга тушади
+
+import bisect
+import math
+
+import numpy as np
+
+from reference_tables import lookup_median, lookup_nearest_week, make_median_set, week_to_day
+
+# ==================== ЎЗГАРМАСЛАР ====================
+
+# Генетик синдромлар учун асосий хавфлар
+BASE_RISKS = {
+    'downs': 1/800,      # Даун синдроми
+    'edwards': 1/3000,   # Эдвардс синдроми
+    'patau': 1/5000,     # Патау синдроми
+    'turner': 1/2500,    # Тернер синдроми
+    'ntd': 1/1000        # Нейротубуляр дефект
+}
+
+SYNDROMES = tuple(BASE_RISKS.keys())
+
+# Хавф модели версияси (қоидалар ёки коэффициентлар ўзгарса оширилади)
+RISK_MODEL_VERSION = "rules-1"
+
+# Ёш бўйича хавф кўпайтирувчилари
+AGE_MULTIPLIERS = {
+    20: {'downs': 0.5, 'edwards': 0.3, 'patau': 0.3, 'turner': 0.4},
+    25: {'downs': 0.7, 'edwards': 0.5, 'patau': 0.5, 'turner': 0.6},
+    30: {'downs': 1.0, 'edwards': 1.0, 'patau': 1.0, 'turner': 1.0},
+    35: {'downs': 2.5, 'edwards': 3.0, 'patau': 3.5, 'turner': 2.0},
+    40: {'downs': 5.0, 'edwards': 8.0, 'patau': 10.0, 'turner': 4.0},
+    45: {'downs': 10.0, 'edwards': 15.0, 'patau': 20.0, 'turner': 8.0}
+}
+
+# DELFIA Revvity нормалари (хақиқий референс қийматлари)
+DELFIA_FIRST_TRIMESTER = {
+    'PAPP_A': {
+        'unit': 'U/L',
+        'ranges_by_week': {
+            10: {'min': 0.4, 'max': 3.0, 'median': 1.0},
+            11: {'min': 0.5, 'max': 3.5, 'median': 1.2},
+            12: {'min': 0.6, 'max': 4.0, 'median': 1.4},
+            13: {'min': 0.7, 'max': 4.5, 'median': 1.6},
+            14: {'min': 0.8, 'max': 5.0, 'median': 1.8}
+        },
+        'MoM_range': {'low': 0.4, 'high': 2.5}
+    },
+    
+    'FREE_BETA_HCG': {
+        'unit': 'ng/ml',
+        'ranges_by_week': {
+            10: {'min': 15.0, 'max': 120.0, 'median': 40.0},
+            11: {'min': 20.0, 'max': 150.0, 'median': 60.0},
+            12: {'min': 25.0, 'max': 180.0, 'median': 80.0},
+            13: {'min': 30.0, 'max': 200.0, 'median': 100.0},
+            14: {'min': 35.0, 'max': 220.0, 'median': 120.0}
+        },
+        'MoM_range': {'low': 0.5, 'high': 2.0}
+    },
+    
+    'NT': {
+        'unit': 'мм',
+        'ranges_by_week': {
+            10: {'min': 0.8, 'max': 2.2, 'median': 1.2},
+            11: {'min': 0.8, 'max': 2.5, 'median': 1.3},
+            12: {'min': 0.8, 'max': 2.8, 'median': 1.4},
+            13: {'min': 0.8, 'max': 3.0, 'median': 1.5},
+            14: {'min': 0.8, 'max': 3.0, 'median': 1.5}
+        },
+        'normal_max': 2.5
+    }
+}
+
+DELFIA_SECOND_TRIMESTER = {
+    'AFP': {
+        'unit': 'ng/ml',
+        'ranges_by_week': {
+            15: {'min': 15.0, 'max': 60.0, 'median': 30.0},
+            16: {'min': 17.0, 'max': 65.0, 'median': 35.0},
+            17: {'min': 20.0, 'max': 70.0, 'median': 40.0},
+            18: {'min': 22.0, 'max': 75.0, 'median': 45.0},
+            19: {'min': 25.0, 'max': 80.0, 'median': 50.0},
+            20: {'min': 27.0, 'max': 85.0, 'median': 55.0},
+            21: {'min': 30.0, 'max': 90.0, 'median': 60.0},
+            22: {'min': 32.0, 'max': 95.0, 'median': 65.0}
+        },
+        'MoM_range': {'low': 0.5, 'high': 2.0}
+    },
+    
+    'TOTAL_HCG': {
+        'unit': 'IU/L',
+        'ranges_by_week': {
+            15: {'min': 10000, 'max': 60000, 'median': 30000},
+            16: {'min': 8000, 'max': 55000, 'median': 28000},
+            17: {'min': 7000, 'max': 50000, 'median': 25000},
+            18: {'min': 6000, 'max': 45000, 'median': 22000},
+            19: {'min': 5000, 'max': 40000, 'median': 20000},
+            20: {'min': 4000, 'max': 35000, 'median': 18000},
+            21: {'min': 3500, 'max': 30000, 'median': 16000},
+            22: {'min': 3000, 'max': 25000, 'median': 14000}
+        },
+        'MoM_range': {'low': 0.5, 'high': 2.0}
+    },
+    
+    'UE3': {
+        'unit': 'nmol/L',
+        'ranges_by_week': {
+            15: {'min': 1.0, 'max': 5.0, 'median': 2.5},
+            16: {'min': 1.5, 'max': 6.0, 'median': 3.0},
+            17: {'min': 2.0, 'max': 7.0, 'median': 3.5},
+            18: {'min': 2.5, 'max': 8.0, 'median': 4.0},
+            19: {'min': 3.0, 'max': 9.0, 'median': 4.5},
+            20: {'min': 3.5, 'max': 10.0, 'median': 5.0},
+            21: {'min': 4.0, 'max': 11.0, 'median': 5.5},
+            22: {'min': 4.5, 'max': 12.0, 'median': 6.0}
+        },
+        'MoM_range': {'low': 0.5, 'high': 2.0}
+    }
+}
+
+# ==================== РЕФЕРЕНС ЖАДВАЛЛАР ====================
+
+# Кунлик медиана жадваллари модул юкланганда бир марта қурилади ва барча
+# сессиялар учун умумий. Дискдан юкланадиган лот тўпламлари - median_sets.py
+DEFAULT_MEDIAN_SET = make_median_set('DELFIA', 'builtin', {
+    'first': DELFIA_FIRST_TRIMESTER,
+    'second': DELFIA_SECOND_TRIMESTER,
+})
+MEDIAN_TABLES = DEFAULT_MEDIAN_SET['tables']
+
+# ==================== ФУНКЦИЯЛАР ====================
+
+def calculate_bmi(weight, height):
+    """BMI ҳисоблаш"""
+    if height > 0:
+        return round(weight / ((height/100) ** 2), 1)
+    return 22.0
+
+def _trimester_key(trimester):
+    return 'first' if trimester == "first" else 'second'
+
+def get_delfia_norm(parameter, gestational_week, trimester="first", median_set=None):
+    """DELFIA Revvity нормаларини олиш (энг яқин ҳафта)"""
+    median_set = median_set or DEFAULT_MEDIAN_SET
+    norms = median_set['norms'][_trimester_key(trimester)]
+
+    table = median_set['tables'][_trimester_key(trimester)][parameter]
+    return norms[parameter]['ranges_by_week'][lookup_nearest_week(table, week_to_day(gestational_week))]
+
+def get_delfia_median(parameter, gestational_week, trimester="first", median_set=None):
+    """Гестация ҳафтаси (каср - кунлар билан) учун интерполяция қилинган медиана"""
+    table = (median_set or DEFAULT_MEDIAN_SET)['tables'][_trimester_key(trimester)][parameter]
+    return float(lookup_median(table, week_to_day(gestational_week)))
+
+# Она вазни бўйича коррекция қилинадиган параметрлар
+WEIGHT_CORRECTED_PARAMETERS = ('PAPP_A', 'FREE_BETA_HCG', 'AFP', 'TOTAL_HCG')
+
+def calculate_mom_delfia(value, parameter, gestational_week, maternal_weight=None, trimester="first",
+                         median_set=None):
+    """DELFIA Revvity учун MoM ҳисоблаш"""
+    median = get_delfia_median(parameter, gestational_week, trimester, median_set)
+    
+    if median > 0:
+        mom = value / median
+        
+        if maternal_weight and parameter in WEIGHT_CORRECTED_PARAMETERS:
+            weight_correction = np.sqrt(maternal_weight / 60)
+            mom = mom / weight_correction
+        
+        return round(mom, 2)
+    return 1.0
+
+def calculate_mom_delfia_batch(values, parameter, gestational_week, maternal_weight=None, trimester="first",
+                               median_set=None):
+    """DELFIA Revvity учун MoM ҳисоблаш (массив учун, calculate_mom_delfia билан бир хил)
+
+    Медиана кунлик референс жадвалидан олинади (каср ҳафталар ҳам).
+    Вазн NaN ёки 0 бўлса, вазн коррекцияси қилинмайди.
+    """
+    table = (median_set or DEFAULT_MEDIAN_SET)['tables'][_trimester_key(trimester)][parameter]
+    mom = np.asarray(values, dtype=float) / lookup_median(table, week_to_day(gestational_week))
+
+    has_weight = np.zeros(mom.shape, dtype=bool)
+    if maternal_weight is not None and parameter in WEIGHT_CORRECTED_PARAMETERS:
+        maternal_weight = np.asarray(maternal_weight, dtype=float)
+        has_weight = np.broadcast_to(~np.isnan(maternal_weight) & (maternal_weight != 0), mom.shape)
+        weight_correction = np.sqrt(np.where(has_weight, maternal_weight, 60.0) / 60)
+        mom = np.where(has_weight, mom / weight_correction, mom)
+
+    return _round_mom(mom, python_round=~has_weight)
+
+def _round_mom(mom, python_round):
+    """MoM'ни 2 хонагача яхлитлаш, скаляр calculate_mom_delfia билан бир хил
+
+    Скаляр функцияда вазн коррекцияси бўлмаса Python round() (аниқ ўнли
+    яхлитлаш), бўлса np.float64 учун np.round ишлайди. Улар фақат "...5"
+    чегарасида фарқ қилади, шунинг учун фақат шу қийматлар алоҳида яхлитланади.
+    """
+    rounded = np.round(mom, 2)
+    fraction = np.abs(np.modf(mom * 100)[0])
+    tie = python_round & (np.abs(fraction - 0.5) < 1e-6)
+    if tie.any():
+        rounded = np.array(rounded, copy=True)
+        rounded[tie] = [round(float(x), 2) for x in mom[tie]]
+    return rounded
+
+# ==================== ЁШ ХАВФИ ЖАДВАЛИ ====================
+
+AGE_SYNDROMES = ('downs', 'edwards', 'patau', 'turner')
+
+# Таянч ёшлар ва уларнинг кўпайтирувчилари (қатор - ёш, устун - AGE_SYNDROMES)
+_AGE_KEYS = sorted(AGE_MULTIPLIERS.keys())
+AGE_BREAKPOINTS = np.array(_AGE_KEYS, dtype=float)
+AGE_BREAKPOINT_MULTIPLIERS = np.array([[AGE_MULTIPLIERS[a][s] for s in AGE_SYNDROMES] for a in _AGE_KEYS])
+
+# Юқорига яхлитланган бутун ёш -> интерполяция оралиғи рақами i:
+# ёш (keys[i], keys[i+1]] оралиғида (скаляр циклдаги биринчи мос оралиқ)
+_AGE_SEGMENTS = [bisect.bisect_left(_AGE_KEYS, year) - 1 for year in range(_AGE_KEYS[0], _AGE_KEYS[-1] + 1)]
+_AGE_SEGMENT_ARRAY = np.array(_AGE_SEGMENTS, dtype=np.intp)
+
+def get_age_multiplier(age, syndrome):
+    """Ёшга кўра хавф кўпайтирувчисини олиш"""
+    ages = _AGE_KEYS
+    
+    if age <= ages[0]:
+        return AGE_MULTIPLIERS[ages[0]][syndrome]
+    elif age >= ages[-1]:
+        return AGE_MULTIPLIERS[ages[-1]][syndrome]
+    elif age == age:  # NaN эмас
+        i = _AGE_SEGMENTS[math.ceil(age) - ages[0]]
+        low_age, high_age = ages[i], ages[i+1]
+        low_mult = AGE_MULTIPLIERS[low_age][syndrome]
+        high_mult = AGE_MULTIPLIERS[high_age][syndrome]
+        
+        # Линей интерполяция
+        fraction = (age - low_age) / (high_age - low_age)
+        return low_mult + fraction * (high_mult - low_mult)
+    
+    return 1.0
+
+def get_age_multiplier_batch(age, syndrome):
+    """Ёшга кўра хавф кўпайтирувчиси (массив учун, get_age_multiplier билан бир хил)"""
+    age = np.asarray(age, dtype=float)
+    ages = AGE_BREAKPOINTS
+    mults = AGE_BREAKPOINT_MULTIPLIERS[:, AGE_SYNDROMES.index(syndrome)]
+
+    year = np.clip(np.ceil(np.nan_to_num(age, nan=ages[0])), ages[0] + 1, ages[-1])
+    i = _AGE_SEGMENT_ARRAY[year.astype(np.intp) - _AGE_KEYS[0]]
+    low_age, high_age = ages[i], ages[i + 1]
+    low_mult, high_mult = mults[i], mults[i + 1]
+
+    # Линей интерполяция
+    fraction = (age - low_age) / (high_age - low_age)
+    result = low_mult + fraction * (high_mult - low_mult)
+
+    result = np.where(age <= ages[0], mults[0], result)
+    result = np.where(age >= ages[-1], mults[-1], result)
+    return np.where(np.isnan(age), 1.0, result)
+
+def _step_factor(conditions, factors):
+    """if/elif занжирини np.select орқали кўпайтирувчига айлантириш"""
+    return np.select(conditions, factors, default=1.0)
+
+def _optional_mom(value, shape):
+    """Ихтиёрий MoM: None -> NaN массив"""
+    if value is None:
+        return np.full(shape, np.nan)
+    return np.broadcast_to(np.asarray(value, dtype=float), shape)
+
+def calculate_syndrome_risks_batch(age, nt_mom, papp_mom, hcg_mom, afp_mom=None, total_hcg_mom=None, ue3_mom=None):
+    """Барча генетик синдромлар хавфини массивлар учун ҳисоблаш (бутун плашка бир вақтда)
+
+    Ҳар бир аргумент скаляр ёки NumPy массиви бўлиши мумкин. Ихтиёрий
+    MoM'ларда NaN ёки 0 - "маълумот йўқ" деган маънони англатади.
+    Натижа calculate_syndrome_risks билан бир хил, фақат қийматлар массив.
+    """
+    age, nt_mom, papp_mom, hcg_mom = (np.asarray(v, dtype=float) for v in (age, nt_mom, papp_mom, hcg_mom))
+    shape = np.broadcast_shapes(
+        age.shape, nt_mom.shape, papp_mom.shape, hcg_mom.shape,
+        *(np.shape(v) for v in (afp_mom, total_hcg_mom, ue3_mom) if v is not None)
+    )
+    age, nt_mom, papp_mom, hcg_mom = (np.broadcast_to(v, shape) for v in (age, nt_mom, papp_mom, hcg_mom))
+    afp_mom = _optional_mom(afp_mom, shape)
+    total_hcg_mom = _optional_mom(total_hcg_mom, shape)
+    ue3_mom = _optional_mom(ue3_mom, shape)
+
+    risks = {}
+
+    # Ёш хавфи
+    age_risk_down = get_age_multiplier_batch(age, 'downs')
+    age_risk_edwards = get_age_multiplier_batch(age, 'edwards')
+    age_risk_patau = get_age_multiplier_batch(age, 'patau')
+    age_risk_turner = get_age_multiplier_batch(age, 'turner')
+
+    # Биринчи скрининг омиллари
+    # Даун синдроми учун
+    downs_risk = BASE_RISKS['downs'] * age_risk_down
+
+    # PAPP-A омили
+    downs_risk = downs_risk * _step_factor(
+        [papp_mom < 0.3, papp_mom < 0.4, papp_mom < 0.5, papp_mom > 2.5],
+        [3.0, 2.0, 1.5, 1.2]
+    )
+
+    # Free β-hCG омили
+    downs_risk = downs_risk * _step_factor(
+        [hcg_mom < 0.2, hcg_mom < 0.3, hcg_mom > 2.5, hcg_mom > 3.5],
+        [2.5, 1.8, 2.0, 2.5]
+    )
+
+    # NT омили
+    downs_risk = downs_risk * _step_factor(
+        [nt_mom < 0.6, nt_mom < 0.8, nt_mom > 2.0, nt_mom > 3.0, nt_mom > 4.0],
+        [0.7, 0.8, 3.0, 5.0, 8.0]
+    )
+
+    risks['downs'] = np.minimum(downs_risk, 0.5)
+
+    # Эдвардс синдроми учун
+    edwards_risk = BASE_RISKS['edwards'] * age_risk_edwards
+    edwards_risk = edwards_risk * _step_factor([papp_mom < 0.2, papp_mom < 0.3], [4.0, 2.5])
+    edwards_risk = edwards_risk * _step_factor([hcg_mom < 0.1, hcg_mom < 0.2], [3.0, 2.0])
+    edwards_risk = edwards_risk * _step_factor([nt_mom > 2.5, nt_mom > 3.0], [4.0, 6.0])
+
+    risks['edwards'] = np.minimum(edwards_risk, 0.5)
+
+    # Патау синдроми учун
+    patau_risk = BASE_RISKS['patau'] * age_risk_patau
+    patau_risk = patau_risk * _step_factor([papp_mom < 0.2, papp_mom < 0.3], [5.0, 3.0])
+    patau_risk = patau_risk * _step_factor([hcg_mom < 0.15, hcg_mom < 0.25], [3.5, 2.5])
+    patau_risk = patau_risk * _step_factor([nt_mom > 2.8, nt_mom > 3.5], [5.0, 8.0])
+
+    risks['patau'] = np.minimum(patau_risk, 0.5)
+
+    # Тернер синдроми учун
+    turner_risk = BASE_RISKS['turner'] * age_risk_turner
+    turner_risk = turner_risk * _step_factor([hcg_mom > 2.0, hcg_mom > 3.0], [2.0, 3.0])
+    turner_risk = turner_risk * _step_factor([nt_mom > 3.0, nt_mom > 4.0], [4.0, 6.0])
+
+    risks['turner'] = np.minimum(turner_risk, 0.5)
+
+    # Нейротубуляр дефект (НТД) учун
+    ntd_risk = np.select(
+        [afp_mom > 2.5, afp_mom > 2.0],
+        [0.01, 0.02],  # 1:100, 1:50
+        default=BASE_RISKS['ntd']
+    )
+
+    risks['ntd'] = np.minimum(ntd_risk, 0.5)
+
+    # Ёш хавфи (алоҳида)
+    risks['age_risk'] = {
+        'downs': age_risk_down,
+        'edwards': age_risk_edwards,
+        'patau': age_risk_patau,
+        'turner': age_risk_turner
+    }
+
+    # Иккиламчи скрининг омиллари (агар мавжуд бўлса)
+    has_quad = np.ones(shape, dtype=bool)
+    for mom in (afp_mom, total_hcg_mom, ue3_mom):
+        has_quad &= ~np.isnan(mom) & (mom != 0)
+
+    # Квад тест коррекцияси
+    quad_correction = (
+        _step_factor([afp_mom < 0.5, afp_mom > 2.0], [0.8, 1.3])
+        * _step_factor([total_hcg_mom < 0.5, total_hcg_mom > 2.0], [0.9, 1.8])
+        * _step_factor([ue3_mom < 0.5], [1.5])
+    )
+
+    risks['downs'] = np.where(has_quad, risks['downs'] * quad_correction, risks['downs'])
+    risks['edwards'] = np.where(has_quad, risks['edwards'] * (quad_correction * 1.2), risks['edwards'])
+    risks['patau'] = np.where(has_quad, risks['patau'] * (quad_correction * 1.3), risks['patau'])
+
+    return risks
+
+# ==================== ХАВФ МОДЕЛЛАРИ ====================
+
+# 'rules' - юқоридаги кўпайтирувчилар, 'lr' - ўхшашлик нисбати (lr_model.py)
+RISK_ENGINES = ('rules', 'lr')
+DEFAULT_RISK_ENGINE = 'rules'
+
+def get_risk_engine(engine=DEFAULT_RISK_ENGINE):
+    """Хавф модели: (батч функция, модел версияси)"""
+    if engine == 'rules':
+        return calculate_syndrome_risks_batch, RISK_MODEL_VERSION
+    if engine == 'lr':
+        import lr_model  # lr_model шу модулдан фойдаланади - айланма импорт бўлмаслиги учун шу ерда
+
+        return lr_model.calculate_syndrome_risks_lr_batch, lr_model.LR_MODEL_VERSION
+    raise ValueError(f"Номаълум хавф модели: {engine}")
+
+def calculate_syndrome_risks_frame(df, engine=DEFAULT_RISK_ENGINE):
+    """DataFrame (плашка) учун хавфлар: ҳар бир бемор учун битта қатор
+
+    Устунлар: age, nt_mom, papp_a_mom, free_beta_hcg_mom ва ихтиёрий
+    afp_mom, total_hcg_mom, ue3_mom.
+    """
+    import pandas as pd  # фақат шу функция учун: фон жараёнлари pandas'сиз тез юкланади
+
+    risks = get_risk_engine(engine)[0](
+        df['age'].to_numpy(dtype=float),
+        df['nt_mom'].to_numpy(dtype=float),
+        df['papp_a_mom'].to_numpy(dtype=float),
+        df['free_beta_hcg_mom'].to_numpy(dtype=float),
+        *(df[col].to_numpy(dtype=float) if col in df else None
+          for col in ('afp_mom', 'total_hcg_mom', 'ue3_mom'))
+    )
+    columns = {syndrome: risks[syndrome] for syndrome in SYNDROMES}
+    columns.update({f'age_risk_{syndrome}': value for syndrome, value in risks['age_risk'].items()})
+    return pd.DataFrame(columns, index=df.index)
+
+def calculate_syndrome_risks(age, nt_mom, papp_mom, hcg_mom, afp_mom=None, total_hcg_mom=None, ue3_mom=None,
+                             engine=DEFAULT_RISK_ENGINE):
+    """Барча генетик синдромлар учун хавфларни ҳисоблаш (битта бемор)"""
+    batch = get_risk_engine(engine)[0](age, nt_mom, papp_mom, hcg_mom, afp_mom, total_hcg_mom, ue3_mom)
+
+    risks = {syndrome: float(batch[syndrome]) for syndrome in SYNDROMES}
+    risks['age_risk'] = {syndrome: float(value) for syndrome, value in batch['age_risk'].items()}
+    return risks
+
+def get_risk_category(risk_score):
+    """Хавф категориясини аниқлаш"""
+    if risk_score > 0.1:      # 1:10
+        return "КРИТИК", "risk-critical", "#b71c1c"
+    elif risk_score > 0.05:   # 1:20
+        return "ЖУДА ЮҚОРИ", "risk-high", "#e65100"
+    elif risk_score > 0.02:   # 1:50
+        return "ЮҚОРИ", "risk-high", "#f57c00"
+    elif risk_score > 0.01:   # 1:100
+        return "ЎРТАЧА-ЮҚОРИ", "risk-medium", "#f57f17"
+    elif risk_score > 0.005:  # 1:200
+        return "ЎРТАЧА", "risk-medium", "#f9a825"
+    elif risk_score > 0.001:  # 1:1000
+        return "ПАСТ-ЎРТАЧА", "risk-low", "#388e3c"
+    else:                     # 1:1000 дан кам
+        return "ПАСТ", "risk-low", "#1b5e20"
+
+def get_risk_category_batch(risk_scores):
+    """Хавф категориялари номларини массив учун аниқлаш (get_risk_category билан бир хил)"""
+    risk_scores = np.asarray(risk_scores, dtype=float)
+    return np.select(
+        [risk_scores > 0.1, risk_scores > 0.05, risk_scores > 0.02,
+         risk_scores > 0.01, risk_scores > 0.005, risk_scores > 0.001],
+        ["КРИТИК", "ЖУДА ЮҚОРИ", "ЮҚОРИ", "ЎРТАЧА-ЮҚОРИ", "ЎРТАЧА", "ПАСТ-ЎРТАЧА"],
+        default="ПАСТ"
+    )
+
+# Хавф категориялари чегаралари: (пастки чегара, юқори чегара], None - чегарасиз
+RISK_CATEGORY_BOUNDS = {
+    "КРИТИК": (0.1, None),
+    "ЖУДА ЮҚОРИ": (0.05, 0.1),
+    "ЮҚОРИ": (0.02, 0.05),
+    "ЎРТАЧА-ЮҚОРИ": (0.01, 0.02),
+    "ЎРТАЧА": (0.005, 0.01),
+    "ПАСТ-ЎРТАЧА": (0.001, 0.005),
+    "ПАСТ": (None, 0.001),
+}
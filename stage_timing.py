@@ -0,0 +1,188 @@
+# stage_timing.py - Streamlit скрипт ишга тушиши босқичлари бўйича кечикиш ўлчовлари
+# Босқичлар (CSS, база ўқиш/ёзиш, хавф ҳисоби, Plotly графиклари, бутун скрипт) вақти
+# жараён бўйлаб умумий ҳалқа буферларда йиғилади: p50/p95 "Тизим" саҳифасида ва
+# Prometheus матн файлида (node_exporter textfile collector учун) кўринади.
+# Ихтиёрий профиллаш: ?profile=cprofile ёки ?profile=pyinstrument (app.py)
+#
+# Фойдаланиш:
+#   stage_timing.begin_run(profile_kind)   # скрипт бошида
+#   with stage_timing.stage('risk'):
+#       ...
+#   profile = stage_timing.end_run()       # скрипт охирида ва ҳар бир st.rerun() дан олдин
+
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler  # ихтиёрий: pip install pyinstrument
+except ImportError:
+    PyinstrumentProfiler = None
+
+# Ҳар бир босқич учун сақланадиган охирги ўлчовлар сони (перцентиллар шулар бўйича)
+SAMPLE_SIZE = int(os.environ.get('STAGE_SAMPLE_SIZE', '1000'))
+METRICS_FILE = os.environ.get('STAGE_METRICS_FILE', 'stage_metrics.prom')
+# Prometheus файли кўпи билан шунча сонияда бир марта қайта ёзилади
+WRITE_INTERVAL_SECONDS = 10.0
+
+# Prometheus quantile ёрлиғи -> snapshot() калити
+QUANTILES = {'0.5': 'p50', '0.95': 'p95'}
+
+_lock = threading.Lock()
+_samples = {}   # босқич -> deque (охирги SAMPLE_SIZE ўлчов, сония)
+_totals = {}    # босқич -> {'count', 'sum'} (ишга тушгандан бери)
+_written = {'at': 0.0}
+_runs = {}      # оқим -> (бошланиш вақти, профиль ёки None) - тугалланмаган скрипт ишга тушишлари
+
+def observe(name, seconds):
+    """Босқичнинг битта ўлчовини қўшиш"""
+    with _lock:
+        _samples.setdefault(name, deque(maxlen=SAMPLE_SIZE)).append(seconds)
+        totals = _totals.setdefault(name, {'count': 0, 'sum': 0.0})
+        totals['count'] += 1
+        totals['sum'] += seconds
+
+@contextmanager
+def stage(name):
+    """Блок вақтини босқич ўлчови сифатида ёзиш (истисно бўлса ҳам)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+def _quantile(ordered, q):
+    # Энг яқин ранг усули
+    return ordered[max(0, min(len(ordered) - 1, int(q * len(ordered) + 0.5) - 1))]
+
+def snapshot():
+    """Босқичлар статистикаси: {босқич: {'count', 'sum', 'window', 'p50', 'p95', 'max'}}"""
+    with _lock:
+        data = {name: (sorted(samples), dict(_totals[name])) for name, samples in _samples.items()}
+    result = {}
+    for name, (ordered, totals) in sorted(data.items()):
+        if not ordered:
+            continue
+        result[name] = {
+            **totals,
+            'window': len(ordered),
+            'p50': _quantile(ordered, 0.5),
+            'p95': _quantile(ordered, 0.95),
+            'max': ordered[-1],
+        }
+    return result
+
+def reset():
+    """Барча ўлчовларни тозалаш"""
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+
+def metrics_text():
+    """Босқичлар кечикиши Prometheus матн форматида (summary)"""
+    lines = [
+        "# HELP screening_app_stage_seconds Streamlit script run latency by stage",
+        "# TYPE screening_app_stage_seconds summary",
+    ]
+    for name, stats in snapshot().items():
+        for quantile, key in QUANTILES.items():
+            lines.append(f'screening_app_stage_seconds{{stage="{name}",quantile="{quantile}"}} {stats[key]:.6f}')
+        lines.append(f'screening_app_stage_seconds_sum{{stage="{name}"}} {stats["sum"]:.6f}')
+        lines.append(f'screening_app_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+    return "\n".join(lines) + "\n"
+
+def write_metrics(path=None):
+    """Prometheus файлини атомар ёзиш (.tmp + os.replace); йўлни қайтаради"""
+    path = path or METRICS_FILE
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(metrics_text())
+    os.replace(tmp_path, path)
+    _written['at'] = time.monotonic()
+    return path
+
+def maybe_write_metrics(path=None):
+    """Охирги ёзувдан WRITE_INTERVAL_SECONDS ўтган бўлса файлни янгилаш (ҳар rerun'да эмас)"""
+    if time.monotonic() - _written['at'] < WRITE_INTERVAL_SECONDS:
+        return None
+    return write_metrics(path)
+
+# ==================== ПРОФИЛЛАШ ====================
+
+def profilers():
+    """Мавжуд профиллагичлар (pyinstrument - ўрнатилган бўлса)"""
+    return ('cprofile', 'pyinstrument') if PyinstrumentProfiler is not None else ('cprofile',)
+
+def start_profile(kind):
+    """Профиллашни бошлаш; kind мавжуд бўлмаса None"""
+    if kind not in profilers():
+        return None
+    try:
+        if kind == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = PyinstrumentProfiler()
+            profiler.start()
+    except (RuntimeError, ValueError):
+        # Бошқа сессия аллақачон профиллаяпти (Python 3.12+ да профиллагич жараёнда битта)
+        return None
+    return kind, profiler
+
+def stop_profile(handle, limit=40):
+    """Профиллашни тўхтатиш: {'kind', 'text', 'filename', 'data', 'mime'}"""
+    kind, profiler = handle
+    if kind == 'cprofile':
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+        profiler.create_stats()
+        # dump_stats() билан бир хил формат - snakeviz / pstats да очилади
+        return {'kind': kind, 'text': stream.getvalue(), 'filename': 'app.prof',
+                'data': marshal.dumps(profiler.stats), 'mime': 'application/octet-stream'}
+    profiler.stop()
+    return {'kind': kind, 'text': profiler.output_text(unicode=True), 'filename': 'app_profile.html',
+            'data': profiler.output_html().encode('utf-8'), 'mime': 'text/html'}
+
+# ==================== СКРИПТ ИШГА ТУШИШИ ====================
+
+def _abandon_stale_runs():
+    """Истисно билан тугаган ишга тушишлар: шу оқимдаги ёки тугаган оқимлардаги профиллагичларни тўхтатиш
+
+    Бундай ишга тушиш 'script' ўлчови сифатида ёзилмайди (тугаш вақти номаълум).
+    """
+    alive = {thread.ident for thread in threading.enumerate()}
+    current = threading.get_ident()
+    with _lock:
+        stale = [ident for ident in _runs if ident == current or ident not in alive]
+        handles = [_runs.pop(ident)[1] for ident in stale]
+    for handle in handles:
+        if handle is not None:
+            stop_profile(handle)
+
+def begin_run(profile_kind=None):
+    """Скрипт ишга тушишини бошлаш (profile_kind берилса - профиллаш ҳам)"""
+    _abandon_stale_runs()
+    handle = start_profile(profile_kind) if profile_kind else None
+    with _lock:
+        _runs[threading.get_ident()] = (time.perf_counter(), handle)
+
+def end_run():
+    """Скрипт ишга тушишини якунлаш: 'script' ўлчови, Prometheus файли, профиль (бўлмаса None)
+
+    st.rerun() истисно орқали скриптни тўхтатади - ундан олдин ҳам чақирилади.
+    """
+    with _lock:
+        run = _runs.pop(threading.get_ident(), None)
+    if run is None:
+        return None
+    started, handle = run
+    observe('script', time.perf_counter() - started)
+    maybe_write_metrics()
+    return stop_profile(handle) if handle is not None else None
@@ -0,0 +1,93 @@
+# ui_common.py - Streamlit саҳифалари учун умумий ёрдамчи функциялар
+
+import os
+import time
+
+import streamlit as st
+
+import jobs
+import patient_db
+from labels import ANALYTE_LABELS, format_risk  # саҳифалар шу ердан импорт қилади
+
+@st.cache_resource
+def init_database():
+    """Базани тайёрлаш ва эски JSON тарихни кўчириш (жараёнда бир марта)"""
+    with patient_db.database() as conn:
+        patient_db.migrate_json(conn, patient_db.LEGACY_JSON_PATH)
+    return patient_db.DEFAULT_DB_PATH
+
+# Хавф моделлари (scoring.RISK_ENGINES)
+RISK_ENGINE_LABELS = {
+    'rules': "📏 Қоидалар (кўпайтирувчилар)",
+    'lr': "📐 Ўхшашлик нисбати (Гаусс LR)",
+}
+
+# ==================== ФОН ВАЗИФАЛАРИ ====================
+
+JOB_KIND_LABELS = {
+    'import': "📥 Плашка импорти",
+    'rescore': "🔁 Қайта ҳисоблаш",
+    'export': "📤 CSV экспорт",
+    'archive': "🗃️ Устунли архив",
+    'reports': "🧾 Беморлар ҳисоботлари",
+}
+JOB_STATUS_LABELS = {
+    'queued': "⏳ Навбатда",
+    'running': "⚙️ Бажарилмоқда",
+    'done': "✅ Тайёр",
+    'failed': "❌ Хатолик",
+    'cancelled': "⛔ Бекор қилинди",
+}
+
+@st.cache_resource(validate=lambda worker: worker.poll() is None)
+def start_job_worker():
+    """Фон вазифалари worker жараёнини ишга тушириш (тўхтаб қолса - қайта)"""
+    return jobs.start_worker(init_database())
+
+def submit_job(kind, params):
+    """Вазифани навбатга қўйиш ва worker ишлаётганини таъминлаш"""
+    start_job_worker()
+    with patient_db.database(init_database()) as conn:
+        return jobs.submit(conn, kind, params)
+
+def _job_summary(job):
+    result = job['result'] or {}
+    if job['kind'] == 'import':
+        return f"{result.get('rows', 0)} қатор {result.get('seconds', 0):.1f} сонияда ҳисобланди"
+    if job['kind'] == 'rescore':
+        return f"{result.get('processed', 0)} ёзув, категорияси ўзгарган: {result.get('changed', 0)}"
+    if job['kind'] == 'reports':
+        return f"{result.get('reports', 0)} ҳисобот {result.get('seconds', 0):.1f} сонияда тайёрланди"
+    if job['kind'] == 'archive':
+        return (f"{result.get('rows', 0)} ёзув, {len(result.get('months', []))} ой ёзилди "
+                f"({len(result.get('skipped', []))} ой ўзгармаган) -> {result.get('directory')}")
+    return f"{result.get('rows', 0)} ёзув"
+
+def show_job(job):
+    """Вазифа ҳолати: прогресс ва бекор қилиш тугмаси ёки натижани юклаб олиш"""
+    st.markdown(f"**#{job['id']} {JOB_KIND_LABELS[job['kind']]}** - {JOB_STATUS_LABELS[job['status']]}")
+    if job['status'] in jobs.ACTIVE_STATUSES:
+        st.progress(job['progress'], text=job['message'] or "")
+        if st.button("⛔ Бекор қилиш", key=f"cancel_job_{job['id']}"):
+            with patient_db.database(init_database()) as conn:
+                jobs.cancel(conn, job['id'])
+            st.rerun()
+    elif job['status'] == 'done':
+        st.success(_job_summary(job))
+        output = (job['result'] or {}).get('output')
+        if output and os.path.exists(output):
+            is_zip = output.endswith('.zip')
+            with open(output, 'rb') as f:
+                st.download_button(f"⬇️ Натижани юклаб олиш ({'ZIP' if is_zip else 'CSV'})", f,
+                                   file_name=os.path.basename(output),
+                                   mime='application/zip' if is_zip else 'text/csv', key=f"download_job_{job['id']}")
+    elif job['status'] == 'failed':
+        st.error(job['message'])
+    else:
+        st.warning(job['message'] or JOB_STATUS_LABELS['cancelled'])
+
+def refresh_while_active(job_list, interval=1.0):
+    """Фаол вазифа бўлса, бир оздан кейин саҳифани қайта чизиш (ҳолатни сўраб туриш)"""
+    if any(job['status'] in jobs.ACTIVE_STATUSES for job in job_list):
+        time.sleep(interval)
+        st.rerun()
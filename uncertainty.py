@@ -0,0 +1,79 @@
+# uncertainty.py - Хавф ноаниқлиги: MoM'ларни аналит CV'си бўйича тебратиб Монте-Карло оралиқлари
+# Ҳар бир тортим (draw) - лог-нормал кўпайтирувчи: MoM x exp(N(0, σ)), σ = sqrt(ln(1 + CV²)).
+# Барча тортимлар битта массив сифатида хавф моделига берилади (тортим бўйича
+# Python цикли йўқ); вақт бюджети тугаса - шу пайтгача ҳисобланган тортимлар ишлатилади
+
+import time
+
+import numpy as np
+
+from lr_model import MARKERS
+from scoring import DEFAULT_RISK_ENGINE, SYNDROMES, get_risk_engine
+
+# Аналитик CV (ўлчов хатолиги), улушда; NT учун - УТТ ўлчови хатолиги
+DEFAULT_CVS = {
+    'nt': 0.10,
+    'papp_a': 0.06,
+    'free_beta_hcg': 0.05,
+    'afp': 0.05,
+    'total_hcg': 0.05,
+    'ue3': 0.08,
+}
+
+DEFAULT_DRAWS = 20000
+DEFAULT_INTERVAL = 0.9
+
+# Битта сўров учун вақт бюджети (сония) - UI интерактив қолиши учун
+TIME_BUDGET = 0.3
+
+# Биринчи блок ҳажми (тезликни ўлчаш учун) ва энг кичик кейинги блок
+FIRST_BLOCK = 500
+MIN_BLOCK = 100
+
+def simulate_risks(risk_inputs, engine=DEFAULT_RISK_ENGINE, cvs=None, draws=DEFAULT_DRAWS,
+                   time_budget=TIME_BUDGET, seed=0):
+    """Тебратилган MoM'лар бўйича хавфлар намуналари: ({синдром: массив}, тортимлар сони)
+
+    risk_inputs - calculate_syndrome_risks аргументлари: (ёш, nt, papp_a, free_beta_hcg
+    [, afp, total_hcg, ue3]); None ёки NaN - маълумот йўқ, тебратилмайди
+    (0 эса ҳақиқий MoM сифатида хавф моделига ўтади ва кўпайтмада 0 бўлиб қолади).
+    Тортимлар блоклар билан ҳисобланади: биринчи блок тезлигидан бюджетга
+    сиғадиган қолган тортимлар сони баҳоланади (time_budget=None - чекловсиз).
+    """
+    score = get_risk_engine(engine)[0]
+    cvs = dict(DEFAULT_CVS, **(cvs or {}))
+    age, *moms = risk_inputs
+    moms = np.array([np.nan if v is None else float(v) for v in moms + [None] * (len(MARKERS) - len(moms))])
+    sigmas = np.sqrt(np.log1p(np.array([cvs[marker] for marker in MARKERS]) ** 2))
+    rng = np.random.default_rng(seed)
+
+    blocks = {syndrome: [] for syndrome in SYNDROMES}
+    done, block = 0, min(draws, FIRST_BLOCK)
+    started = time.perf_counter()
+    while block > 0:
+        perturbed = moms * np.exp(rng.standard_normal((block, len(MARKERS))) * sigmas)
+        risks = score(age, *perturbed.T)
+        for syndrome in SYNDROMES:
+            blocks[syndrome].append(risks[syndrome])
+        done += block
+
+        block = draws - done
+        if time_budget is not None:
+            elapsed = time.perf_counter() - started
+            affordable = int(done / max(elapsed, 1e-9) * (time_budget - elapsed)) if elapsed < time_budget else 0
+            if affordable < min(MIN_BLOCK, block):
+                break
+            block = min(block, affordable)
+    return {syndrome: np.concatenate(values) for syndrome, values in blocks.items()}, done
+
+def risk_intervals(risk_inputs, engine=DEFAULT_RISK_ENGINE, cvs=None, draws=DEFAULT_DRAWS,
+                   interval=DEFAULT_INTERVAL, time_budget=TIME_BUDGET, seed=0):
+    """Синдромлар хавфи оралиқлари: {'intervals': {синдром: (пастки, медиана, юқори)}, 'draws', 'seconds'}"""
+    started = time.perf_counter()
+    samples, done = simulate_risks(risk_inputs, engine, cvs, draws, time_budget, seed)
+    tail = (1 - interval) / 2
+    intervals = {}
+    for syndrome, values in samples.items():
+        low, median, high = np.quantile(values, [tail, 0.5, 1 - tail])
+        intervals[syndrome] = (float(low), float(median), float(high))
+    return {'intervals': intervals, 'draws': done, 'seconds': time.perf_counter() - started}